@@ -2,24 +2,43 @@ import os
 
 from flask import Flask
 from flask_cors import CORS
+from werkzeug.middleware.proxy_fix import ProxyFix
 from flasgger import Swagger
 
 from sentry import init_sentry
+from structure import structure
 from blueprints import general_blueprint
 from blueprints.v1 import (
     auth_blueprint,
     users_blueprint,
-    enquires_blueprint
+    enquires_blueprint,
+    stats_blueprint
 )
 # from prometheus_flask_exporter import PrometheusMetrics
 
 app = Flask(__name__)
+trusted_proxy_count = int(structure.dependencies.environment_wrapper().get_var('TRUSTED_PROXY_COUNT', '1'))
+if trusted_proxy_count:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=trusted_proxy_count)
 
 cors = CORS(app, resources={r'/*': {'origins': '*'}})
 app.register_blueprint(general_blueprint)
 app.register_blueprint(auth_blueprint, url_prefix='/v1')
 app.register_blueprint(users_blueprint, url_prefix='/v1')
 app.register_blueprint(enquires_blueprint, url_prefix='/v1')
+app.register_blueprint(stats_blueprint, url_prefix='/v1')
+
+
+@app.before_request
+def begin_identity_map():
+    structure.instantiate('identity_map').begin()
+
+
+@app.teardown_request
+def clear_identity_map(exception=None):
+    structure.instantiate('identity_map').clear()
+
+
 swagger = Swagger(
     app,
     template_file=os.path.join(
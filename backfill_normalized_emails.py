@@ -0,0 +1,49 @@
+import time
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from structure import structure
+from models import normalize_email
+
+
+repositories = [
+    structure.instantiate('users_repository'),
+    structure.instantiate('user_applications_repository')
+]
+batch_size = 500
+throttle_seconds = 0.1
+
+
+def write_batch(collection, operations) -> tuple:
+    try:
+        result = collection.bulk_write(operations, ordered=False)
+        return result.modified_count, []
+    except BulkWriteError as e:
+        conflicts = [error['op']['q']['_id'] for error in e.details['writeErrors']]
+        return e.details['nModified'], conflicts
+
+
+for repository in repositories:
+    collection = repository.collection
+    updated_count = 0
+    conflicts = []
+    operations = []
+    cursor = collection.find({'normalized_email': {'$exists': False}}, {'email': 1})
+    for document in cursor:
+        operations.append(UpdateOne(
+            {'_id': document['_id']},
+            {'$set': {'normalized_email': normalize_email(document.get('email'))}}
+        ))
+        if len(operations) >= batch_size:
+            modified, failed = write_batch(collection, operations)
+            updated_count += modified
+            conflicts += failed
+            operations = []
+            time.sleep(throttle_seconds)
+    if operations:
+        modified, failed = write_batch(collection, operations)
+        updated_count += modified
+        conflicts += failed
+
+    print(f'{collection.name} - normalized {updated_count} emails')
+    for conflict_id in conflicts:
+        print(f'{collection.name} - duplicate email for {conflict_id}, resolve manually')
@@ -1,3 +1,9 @@
 from structure import deps
 
 app = deps.celery()
+app.conf.beat_schedule = {
+    'compact_users': {
+        'task': 'background_jobs.compact_users',
+        'schedule': float(deps.environment_wrapper().get_var('USER_COMPACTION_INTERVAL_SECONDS', '3600'))
+    }
+}
@@ -1,6 +1,6 @@
 from background_app import app
 from structure import structure
-from datetime import datetime
+from datetime import datetime, timedelta
 
 
 @app.task(bind=True, default_retry_delay=10)
@@ -13,3 +13,18 @@ def send_email(self, template_name, message):
 def update_last_visit(self, user_id, timestamp):
     users_repository = structure.instantiate('users_repository')
     users_repository.update_last_visit(user_id, datetime.fromtimestamp(timestamp))
+
+
+@app.task(bind=True, default_retry_delay=10)
+def update_last_visits(self, visits, resolution_seconds):
+    users_repository = structure.instantiate('users_repository')
+    users_repository.update_last_visits(
+        [(user_id, datetime.fromtimestamp(timestamp)) for user_id, timestamp in visits],
+        timedelta(seconds=resolution_seconds)
+    )
+
+
+@app.task(bind=True, default_retry_delay=10)
+def compact_users(self):
+    user_compaction_service = structure.instantiate('user_compaction_service')
+    return user_compaction_service.compact()
@@ -0,0 +1,40 @@
+import sys
+import statistics
+from handlers.base_handler import Paging
+from services import PageService
+from structure import structure
+
+
+iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+query = sys.argv[2] if len(sys.argv) > 2 else 'a'
+role = 'user'
+
+users_repository = structure.instantiate('users_repository')
+users_service = structure.instantiate('users_service')
+page_service = structure.instantiate('page_service')
+sequential_service = PageService(
+    page_service.count_cache_service, None, page_service.max_page_size, page_service.max_offset)
+
+
+def measure(run) -> list:
+    paging = Paging()
+    paging.page = 1
+    paging.page_size = 10
+    return [run(paging).timings['total_ms'] for _ in range(iterations)]
+
+
+def report(name, timings) -> None:
+    p95 = sorted(timings)[int(len(timings) * 0.95) - 1]
+    print(f'{name} - median {statistics.median(timings):.2f} ms, p95 {p95:.2f} ms')
+
+
+users_page = measure(lambda paging: users_service.get_page(paging, role))
+sequential_users_page = measure(lambda paging: sequential_service.get_page(
+    paging, users_repository.get_page, users_repository.count, role,
+    after_func=users_repository.get_page_after))
+users_search = measure(lambda paging: users_service.search(paging, query, role))
+
+print(f'{users_repository.count(role)} {role} users, search for "{query}", {iterations} iterations')
+report('Users page (page + count, as configured)', users_page)
+report('Users page (page + count, sequential)', sequential_users_page)
+report('Users search (single $facet query)', users_search)
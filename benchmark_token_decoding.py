@@ -0,0 +1,28 @@
+import sys
+import time
+from bson import ObjectId
+from services import TokensService
+
+
+iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+distinct_tokens = 100
+
+
+def measure(service, tokens) -> float:
+    started_at = time.perf_counter()
+    for i in range(iterations):
+        service.decode(tokens[i % len(tokens)])
+    return iterations / (time.perf_counter() - started_at)
+
+
+cold_service = TokensService('benchmark_secret', 15, 24, 0)
+warm_service = TokensService('benchmark_secret', 15, 24, 10000)
+tokens = [
+    cold_service.encode('access', {'id': str(ObjectId()), 'user_id': str(ObjectId()), 'role': 'user'})
+    for _ in range(distinct_tokens)
+]
+
+cold = measure(cold_service, tokens)
+warm = measure(warm_service, tokens)
+print(f'Cold decode - {cold:.0f} tokens/s')
+print(f'Warm decode - {warm:.0f} tokens/s ({warm / cold:.1f}x)')
@@ -1,6 +1,7 @@
 from .v1 import (
     auth_blueprint,
     users_blueprint,
-    enquires_blueprint
+    enquires_blueprint,
+    stats_blueprint
 )
 from .general_blueprint import general_blueprint
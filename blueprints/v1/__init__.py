@@ -1,3 +1,4 @@
 from .auth_blueprint import auth_blueprint
 from .users_blueprint import users_blueprint
 from .enquires_blueprint import enquires_blueprint
+from .stats_blueprint import stats_blueprint
@@ -0,0 +1,15 @@
+from flask import Blueprint, request
+from flasgger import swag_from
+
+from structure import structure
+
+stats_blueprint = Blueprint('stats_v1', __name__)
+
+base_swagger_path = './../../documentation/stats'
+
+
+@stats_blueprint.route('/stats', methods=['GET'])
+@swag_from(f'{base_swagger_path}/get.yml')
+def get_stats():
+    handler = structure.instantiate('get_stats_auth_handler')
+    return handler.handle(request)
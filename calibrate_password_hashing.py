@@ -0,0 +1,31 @@
+import sys
+import time
+from wrappers import BcryptWrapper, ScryptWrapper
+
+
+target_ms = float(sys.argv[1]) if len(sys.argv) > 1 else 250.0
+samples = 3
+
+
+def measure(hasher) -> float:
+    timings = []
+    for _ in range(samples):
+        started_at = time.perf_counter()
+        hasher.gen_hash('calibration_password')
+        timings.append((time.perf_counter() - started_at) * 1000)
+    return sorted(timings)[len(timings) // 2]
+
+
+def calibrate(name, variable, build, costs) -> None:
+    recommended = costs[0]
+    for cost in costs:
+        elapsed = measure(build(cost))
+        print(f'{name} {variable}={cost}: {elapsed:.1f}ms')
+        if elapsed > target_ms:
+            break
+        recommended = cost
+    print(f'Recommended for {target_ms:.0f}ms - {variable}={recommended}')
+
+
+calibrate('bcrypt', 'BCRYPT_ROUNDS', BcryptWrapper, list(range(10, 17)))
+calibrate('scrypt', 'SCRYPT_LOG_N', ScryptWrapper, list(range(12, 20)))
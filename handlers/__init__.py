@@ -22,3 +22,6 @@ from .users import (
 from .enquires import (
     SendEnquiryHandler
 )
+from .stats import (
+    GetStatsHandler
+)
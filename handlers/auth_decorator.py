@@ -17,20 +17,20 @@ class AuthFactory:
 
 
 class AuthDecoratorFactory:
-    def __init__(self, auth_service, response_builder, celery):
+    def __init__(self, auth_service, response_builder, last_visit_service):
         self.auth_service = auth_service
         self.response_builder = response_builder
-        self.celery = celery
+        self.last_visit_service = last_visit_service
 
     def decorate(self, handler, policy):
-        return AuthDecorator(self.auth_service, self.response_builder, self.celery, policy, handler)
+        return AuthDecorator(self.auth_service, self.response_builder, self.last_visit_service, policy, handler)
 
 
 class AuthDecorator:
-    def __init__(self, auth_service, response_builder, celery, policy, decoratee):
+    def __init__(self, auth_service, response_builder, last_visit_service, policy, decoratee):
         self.auth_service = auth_service
         self.response_builder = response_builder
-        self.celery = celery
+        self.last_visit_service = last_visit_service
         self.policy = policy
         self.decoratee = decoratee
 
@@ -53,8 +53,5 @@ class AuthDecorator:
             }
             return self.response_builder.build(response)
         if user:
-            self.celery.send_task(
-                'background_jobs.update_last_visit',
-                [str(user.id), datetime.utcnow().timestamp()]
-            )
+            self.last_visit_service.track(user.id, datetime.utcnow())
         return self.decoratee.handle(request, *args, principal=user)
@@ -2,7 +2,9 @@ from infrastructure.exceptions import (
     InvalidRequestException,
     NotFoundException,
     UnauthorizedException,
-    UnauthenticatedException
+    UnauthenticatedException,
+    ServiceUnavailableException,
+    TooManyRequestsException
 )
 
 
@@ -32,8 +34,21 @@ class BaseHandler:
             response = {"status": 404, "body": {}}
         except UnauthenticatedException:
             response = {"status": 401, "body": {}}
+        except ServiceUnavailableException:
+            response = {
+                "status": 503,
+                "body": {"message": "service_unavailable"},
+            }
+        except TooManyRequestsException:
+            response = {
+                "status": 429,
+                "body": {"message": "too_many_requests"},
+            }
         return self.response_builder.build(response)
 
+    def client_ip(self, request) -> str or None:
+        return request.remote_addr
+
 
 class Sorting:
     def __init__(self):
@@ -76,6 +91,8 @@ class Paging:
     def __init__(self):
         self.page = None
         self.page_size = None
+        self.cursor = None
+        self.with_count = True
 
     @staticmethod
     def from_request(request):
@@ -90,4 +107,6 @@ class Paging:
         result = Paging()
         result.page = to_int(request.args.get('page'), 1)
         result.page_size = to_int(request.args.get('page_size'), 10)
+        result.cursor = request.args.get('cursor') or None
+        result.with_count = request.args.get('with_count', 'true').lower() not in ('false', '0')
         return result
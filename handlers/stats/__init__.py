@@ -0,0 +1 @@
+from .get_stats_handler import GetStatsHandler
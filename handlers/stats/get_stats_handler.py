@@ -0,0 +1,10 @@
+from ..base_handler import BaseHandler
+
+
+class GetStatsHandler(BaseHandler):
+    def __init__(self, stats_service, response_builder, presenter):
+        super().__init__(response_builder, presenter)
+        self.stats_service = stats_service
+
+    def handle(self, request, principal=None):
+        return self.execute(principal, self.stats_service.get)
@@ -9,4 +9,4 @@ class LoginHandler(BaseHandler):
     def handle(self, request):
         email = request.json.get('email')
         password = request.json.get('password')
-        return self.execute(None, self.auth_service.login, email, password)
+        return self.execute(None, self.auth_service.login, email, password, self.client_ip(request))
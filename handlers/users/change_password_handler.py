@@ -7,5 +7,6 @@ class ChangePasswordHandler(BaseHandler):
         self.auth_service = auth_service
 
     def handle(self, request, user_id, principal=None):
-        auth_header = request.headers.get('Authorization')
-        return self.execute(principal, self.auth_service.change_password, user_id, auth_header, request.json)
+        return self.execute(
+            principal, self.auth_service.change_password, user_id, request.json, self.client_ip(request)
+        )
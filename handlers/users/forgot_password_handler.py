@@ -8,4 +8,4 @@ class ForgotPasswordHandler(BaseHandler):
 
     def handle(self, request, principal=None):
         email = request.json.get('email')
-        return self.execute(principal, self.auth_service.request_password_reset, email)
+        return self.execute(principal, self.auth_service.request_password_reset, email, self.client_ip(request))
@@ -7,4 +7,4 @@ class GetMeHandler(BaseHandler):
         self.users_service = users_service
 
     def handle(self, request, principal=None):
-        return self.execute(principal, self.users_service.get_principal)
+        return self.execute(principal, self.users_service.find_own)
@@ -0,0 +1,38 @@
+from models import MongoIndexFactory, MongoColumnFactory
+
+
+index_factory = MongoIndexFactory()
+column_factory = MongoColumnFactory()
+string_normalized_email = {'normalized_email': {'$type': 'string'}}
+
+
+def declare_indexes(environment_wrapper) -> dict:
+    invalidation_retention_seconds = int(environment_wrapper.get_var(
+        'PRINCIPAL_INVALIDATION_RETENTION_SECONDS', '3600'))
+    return {
+        'users': (
+            index_factory.create_unique(
+                [column_factory.ascending('normalized_email')], string_normalized_email) +
+            index_factory.create_compound(
+                [column_factory.ascending('role'), column_factory.descending('_id')]) +
+            index_factory.create([column_factory.ascending('created_at')])
+        ),
+        'user_applications': (
+            index_factory.create_unique(
+                [column_factory.ascending('normalized_email')], string_normalized_email)
+        ),
+        'sessions': (
+            index_factory.create_compound(
+                [column_factory.ascending('user_id'), column_factory.descending('refreshed_at')]) +
+            index_factory.create_ttl([column_factory.ascending('expires_at')], 0)
+        ),
+        'password_resets': (
+            index_factory.create_unique([column_factory.ascending('code')]) +
+            index_factory.create([column_factory.ascending('user_id')]) +
+            index_factory.create_ttl([column_factory.ascending('created_at')], 24 * 3600)
+        ),
+        'principal_invalidations': (
+            index_factory.create_ttl(
+                [column_factory.ascending('created_at')], invalidation_retention_seconds)
+        )
+    }
@@ -5,4 +5,6 @@ from .exceptions import (
     UnauthorizedException,
     ConflictRequestException,
     VariableNotFoundException,
+    ServiceUnavailableException,
+    TooManyRequestsException,
 )
@@ -25,3 +25,11 @@ class UnauthorizedException(BaseAppException):
 
 class ConflictRequestException(BaseAppException):
     pass
+
+
+class ServiceUnavailableException(BaseAppException):
+    pass
+
+
+class TooManyRequestsException(BaseAppException):
+    pass
@@ -0,0 +1,40 @@
+from datetime import datetime, timedelta
+from structure import structure
+from models import PasswordResetRequest
+
+
+users_repository = structure.instantiate('users_repository')
+password_resets_repository = structure.instantiate('password_resets_repository')
+expired_before = datetime.utcnow() - timedelta(hours=24)
+batch_size = 500
+
+
+def unset_password_reset_requests(user_ids) -> None:
+    if user_ids:
+        users_repository.collection.update_many(
+            {'_id': {'$in': user_ids}}, {'$unset': {'password_reset_requests': ''}})
+
+
+migrated_count = 0
+migrated_user_ids = []
+cursor = users_repository.collection.find(
+    {'password_reset_requests': {'$exists': True}}, {'password_reset_requests': 1})
+for user_document in cursor:
+    documents = [
+        document for document in user_document.get('password_reset_requests') or []
+        if document.get('created_at') and document['created_at'] >= expired_before
+    ]
+    if documents:
+        latest = max(documents, key=lambda document: document['created_at'])
+        reset_request = PasswordResetRequest(user_document['_id'])
+        reset_request.code = latest.get('code')
+        reset_request.created_at = latest['created_at']
+        password_resets_repository.replace_for_user(reset_request)
+        migrated_count += 1
+    migrated_user_ids.append(user_document['_id'])
+    if len(migrated_user_ids) >= batch_size:
+        unset_password_reset_requests(migrated_user_ids)
+        migrated_user_ids = []
+unset_password_reset_requests(migrated_user_ids)
+
+print(f'Migrated {migrated_count} password reset codes')
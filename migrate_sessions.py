@@ -0,0 +1,83 @@
+from bson import ObjectId
+from datetime import datetime
+from pymongo import UpdateOne
+from pymongo.errors import DuplicateKeyError
+from structure import structure
+from models import TokenPair
+
+
+users_repository = structure.instantiate('users_repository')
+sessions_repository = structure.instantiate('sessions_repository')
+tokens_service = structure.instantiate('tokens_service')
+batch_size = 500
+
+
+def migrate_pair(user_id, document) -> bool:
+    payload = tokens_service.decode(document.get('refresh_token'))
+    if not payload:
+        return False
+    pair = TokenPair(
+        ObjectId(str(document.get('id'))),
+        document.get('access_token'),
+        document.get('refresh_token'),
+        user_id,
+        datetime.utcfromtimestamp(payload['exp'])
+    )
+    pair.created_at = datetime.utcfromtimestamp(payload['iat'])
+    pair.refreshed_at = pair.created_at
+    try:
+        sessions_repository.create(pair)
+    except DuplicateKeyError:
+        return False
+    return True
+
+
+def unset_token_pairs(user_ids) -> None:
+    if user_ids:
+        users_repository.collection.update_many(
+            {'_id': {'$in': user_ids}}, {'$unset': {'token_pairs': ''}})
+
+
+migrated_count = 0
+migrated_user_ids = []
+cursor = users_repository.collection.find(
+    {'token_pairs': {'$exists': True}}, {'token_pairs': 1})
+for user_document in cursor:
+    for pair_document in user_document.get('token_pairs') or []:
+        if migrate_pair(user_document['_id'], pair_document):
+            migrated_count += 1
+    migrated_user_ids.append(user_document['_id'])
+    if len(migrated_user_ids) >= batch_size:
+        unset_token_pairs(migrated_user_ids)
+        migrated_user_ids = []
+unset_token_pairs(migrated_user_ids)
+
+print(f'Migrated {migrated_count} sessions')
+
+
+def digest_operation(document) -> UpdateOne:
+    return UpdateOne(
+        {'_id': document['_id']},
+        {
+            '$set': {
+                'access_digest': TokenPair.digest(document.get('access_token')),
+                'refresh_digest': TokenPair.digest(document.get('refresh_token'))
+            },
+            '$unset': {'access_token': '', 'refresh_token': ''}
+        }
+    )
+
+
+digested_count = 0
+operations = []
+cursor = sessions_repository.collection.find(
+    {'refresh_token': {'$exists': True}}, {'access_token': 1, 'refresh_token': 1})
+for session_document in cursor:
+    operations.append(digest_operation(session_document))
+    if len(operations) >= batch_size:
+        digested_count += sessions_repository.collection.bulk_write(operations, ordered=False).modified_count
+        operations = []
+if operations:
+    digested_count += sessions_repository.collection.bulk_write(operations, ordered=False).modified_count
+
+print(f'Replaced tokens with digests in {digested_count} sessions')
@@ -2,11 +2,13 @@ from .user import (
     User,
     TokenPair,
     PasswordResetRequest,
-    UserApplication
+    UserApplication,
+    normalize_email
 )
 from .uploaded_file import UploadedFile
 from .password_generator import PasswordGenerator, PasswordPartGenerator
 from .page import Page
 from .profile import Profile
+from .principal import Principal, PrincipalInvalidation
 from .enquiry import Enquiry
 from .factories import MongoIndexFactory, MongoColumnFactory
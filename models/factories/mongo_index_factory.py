@@ -8,6 +8,48 @@ class MongoIndexFactory:
             for column in columns
         ]
 
+    def create_unique(self, columns, partial_filter=None) -> list:
+        options = {}
+        if partial_filter:
+            options['partialFilterExpression'] = partial_filter
+        return [
+            IndexModel(
+                [(column.name, column.sorting_order)],
+                background=True,
+                name=column.name,
+                unique=True,
+                **options
+            )
+            for column in columns
+        ]
+
+    def create_ttl(self, columns, expire_after_seconds) -> list:
+        return [
+            IndexModel(
+                [(column.name, column.sorting_order)],
+                background=True,
+                name=column.name,
+                expireAfterSeconds=expire_after_seconds
+            )
+            for column in columns
+        ]
+
+    def create_compound(self, columns, unique=False, partial_filter=None) -> list:
+        options = {}
+        if unique:
+            options['unique'] = True
+        if partial_filter:
+            options['partialFilterExpression'] = partial_filter
+        name = '_'.join(f'{column.name}_{column.sorting_order}' for column in columns)
+        return [
+            IndexModel(
+                [(column.name, column.sorting_order) for column in columns],
+                background=True,
+                name=name,
+                **options
+            )
+        ]
+
 
 class MongoColumnFactory:
     def ascending(self, column_name):
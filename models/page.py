@@ -1,5 +1,7 @@
 class Page:
-    def __init__(self, items, page, page_count):
+    def __init__(self, items, page, page_count, next_cursor=None, timings=None):
         self.items = items
         self.page = page
         self.page_count = page_count
+        self.next_cursor = next_cursor
+        self.timings = timings
@@ -0,0 +1,52 @@
+from datetime import datetime
+from bson import ObjectId
+
+
+class Principal:
+    def __init__(self) -> None:
+        self.id = None
+        self.role = None
+        self.email = None
+        self.session_epoch = None
+        self.token_pair_id = None
+        self.password_hash = None
+
+    @staticmethod
+    def from_claims(claims: dict):
+        principal = Principal()
+        principal.id = ObjectId(claims['user_id'])
+        principal.role = claims.get('role')
+        principal.session_epoch = claims.get('epoch')
+        principal.token_pair_id = claims.get('id')
+        return principal
+
+    @staticmethod
+    def from_user(user):
+        principal = Principal()
+        principal.id = user.id
+        principal.role = user.role
+        principal.email = user.email
+        principal.session_epoch = user.session_epoch
+        return principal
+
+
+class PrincipalInvalidation:
+    def __init__(self) -> None:
+        self.id = None
+        self.user_id = None
+        self.token_pair_id = None
+        self.created_at = None
+
+    @staticmethod
+    def for_user(user_id):
+        invalidation = PrincipalInvalidation()
+        invalidation.user_id = str(user_id)
+        invalidation.created_at = datetime.utcnow()
+        return invalidation
+
+    @staticmethod
+    def for_token_pair(token_pair_id):
+        invalidation = PrincipalInvalidation()
+        invalidation.token_pair_id = str(token_pair_id)
+        invalidation.created_at = datetime.utcnow()
+        return invalidation
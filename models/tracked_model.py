@@ -0,0 +1,17 @@
+import copy
+
+
+class TrackedModel:
+    persisted_document = None
+    loaded_document = None
+
+    def mark_loaded(self, document: dict) -> None:
+        self.loaded_document = document
+        self.persisted_document = None
+
+    def mark_persisted(self, document: dict) -> None:
+        self.persisted_document = copy.deepcopy(document)
+        self.loaded_document = None
+
+    def is_persisted(self) -> bool:
+        return self.persisted_document is not None or self.loaded_document is not None
@@ -6,3 +6,5 @@ from .user_mongo_translator import (
 )
 from .profile_mongo_translator import ProfileMongoTranslator
 from .uploaded_file_mongo_translator import UploadedFileMongoTranslator
+from .principal_invalidation_mongo_translator import PrincipalInvalidationMongoTranslator
+from .principal_mongo_translator import PrincipalMongoTranslator
@@ -0,0 +1,19 @@
+from models import PrincipalInvalidation
+
+
+class PrincipalInvalidationMongoTranslator:
+    def to_document(self, invalidation) -> dict:
+        return {
+            '_id': invalidation.id,
+            'user_id': invalidation.user_id,
+            'token_pair_id': invalidation.token_pair_id,
+            'created_at': invalidation.created_at
+        }
+
+    def from_document(self, document) -> PrincipalInvalidation:
+        invalidation = PrincipalInvalidation()
+        invalidation.id = document['_id']
+        invalidation.user_id = document.get('user_id')
+        invalidation.token_pair_id = document.get('token_pair_id')
+        invalidation.created_at = document.get('created_at')
+        return invalidation
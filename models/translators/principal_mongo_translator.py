@@ -0,0 +1,18 @@
+from models import Principal
+
+
+class PrincipalMongoTranslator:
+    def projection(self, with_password_hash=False) -> dict:
+        projection = {'role': 1, 'email': 1, 'session_epoch': 1}
+        if with_password_hash:
+            projection['password_hash'] = 1
+        return projection
+
+    def from_document(self, document) -> Principal:
+        principal = Principal()
+        principal.id = document['_id']
+        principal.role = document.get('role')
+        principal.email = document.get('email')
+        principal.session_epoch = document.get('session_epoch', 0)
+        principal.password_hash = document.get('password_hash')
+        return principal
@@ -2,37 +2,22 @@ from models import (
     User,
     TokenPair,
     PasswordResetRequest,
-    UserApplication
+    UserApplication,
+    normalize_email
 )
 
 
 class UserMongoTranslator:
-    def __init__(
-            self,
-            tokens_pair_translator,
-            password_reset_request_translator,
-            profile_translator
-    ):
-        self.tokens_pair_translator = tokens_pair_translator
-        self.password_reset_request_translator = password_reset_request_translator
+    def __init__(self, profile_translator):
         self.profile_translator = profile_translator
 
     def to_document(self, user) -> dict:
-        token_pairs = [
-            self.tokens_pair_translator.to_document(pair)
-            for pair in user.token_pairs
-        ]
-        password_reset_requests = [
-            self.password_reset_request_translator.to_document(prr)
-            for prr in user.password_reset_requests
-        ]
         return {
             '_id': user.id,
             'email': user.email,
+            'normalized_email': normalize_email(user.email),
             'role': user.role,
             'password_hash': user.password_hash,
-            'token_pairs': token_pairs,
-            'password_reset_requests': password_reset_requests,
             'profile': self.profile_translator.to_document(user.profile),
             'created_at': user.created_at,
             'last_visit_at': user.last_visit_at
@@ -44,46 +29,53 @@ class UserMongoTranslator:
         user.email = document['email']
         user.role = document['role']
         user.password_hash = document['password_hash']
-        user.token_pairs = [
-            self.tokens_pair_translator.from_document(p)
-            for p in document['token_pairs']
-        ]
-        user.password_reset_requests = [
-            self.password_reset_request_translator.from_document(prr)
-            for prr in document.get('password_reset_requests', [])
-        ]
         user.profile = self.profile_translator.from_document(document.get('profile'))
-        user.favorite_retailer_ids = document.get('favorite_retailer_ids', [])
+        user.favorite_retailer_ids = list(document.get('favorite_retailer_ids', []))
         user.created_at = document.get('created_at')
         user.last_visit_at = document.get('last_visit_at')
+        user.session_epoch = document.get('session_epoch', 0)
         return user
 
 
 class TokenPairMongoTranslator:
     def from_document(self, document) -> TokenPair:
-        return TokenPair(
-            document.get('id'),
-            document.get('access_token'),
-            document.get('refresh_token')
+        tokens_pair = TokenPair(
+            document['_id'],
+            None,
+            None,
+            document.get('user_id'),
+            document.get('expires_at')
         )
+        tokens_pair.access_digest = document.get('access_digest')
+        tokens_pair.refresh_digest = document.get('refresh_digest')
+        tokens_pair.created_at = document.get('created_at')
+        tokens_pair.refreshed_at = document.get('refreshed_at')
+        return tokens_pair
 
     def to_document(self, tokens_pair) -> dict:
         return {
-            'id': tokens_pair.id,
-            'access_token': tokens_pair.access,
-            'refresh_token': tokens_pair.refresh
+            '_id': tokens_pair.id,
+            'user_id': tokens_pair.user_id,
+            'access_digest': tokens_pair.access_digest,
+            'refresh_digest': tokens_pair.refresh_digest,
+            'created_at': tokens_pair.created_at,
+            'refreshed_at': tokens_pair.refreshed_at,
+            'expires_at': tokens_pair.expires_at
         }
 
 
 class PasswordResetRequestMongoTranslator:
     def from_document(self, document) -> PasswordResetRequest:
-        result = PasswordResetRequest()
+        result = PasswordResetRequest(document.get('user_id'))
+        result.id = document['_id']
         result.code = document.get('code')
         result.created_at = document.get('created_at')
         return result
 
     def to_document(self, password_reset_request):
         return {
+            '_id': password_reset_request.id,
+            'user_id': password_reset_request.user_id,
             'code': password_reset_request.code,
             'created_at': password_reset_request.created_at
         }
@@ -108,6 +100,7 @@ class UserApplicationMongoTranslator:
         return {
             '_id': user_application.id,
             'email': user_application.email,
+            'normalized_email': normalize_email(user_application.email),
             'role': user_application.role,
             'password_hash': user_application.password_hash,
             'profile': self.profile_translator.to_document(user_application.profile),
@@ -1,21 +1,28 @@
+import hashlib
 from datetime import datetime
 from random import choice, randint
 from string import ascii_uppercase
 from .profile import Profile
+from .tracked_model import TrackedModel
 
 
-class User:
+def normalize_email(email) -> str or None:
+    if not email:
+        return None
+    return email.strip().lower()
+
+
+class User(TrackedModel):
     def __init__(self) -> None:
         self.id = None
         self.email = None
         self.role = None
         self.password_hash = None
-        self.token_pairs = None
-        self.password_reset_requests = None
         self.profile = None
         self.favorite_retailer_ids = None
         self.created_at = None
         self.last_visit_at = None
+        self.session_epoch = None
 
     @staticmethod
     def from_request(attributes: dict):
@@ -23,11 +30,10 @@ class User:
         user.email = attributes['email']
         user.role = attributes.get('role', 'user')
         user.password_hash = attributes['password_hash']
-        user.token_pairs = []
-        user.password_reset_requests = []
         user.profile = Profile.from_request(attributes.get('profile', {}))
         user.favorite_retailer_ids = []
         user.created_at = datetime.utcnow()
+        user.session_epoch = 0
         return user
 
     @staticmethod
@@ -38,10 +44,9 @@ class User:
         user.role = application.role
         user.password_hash = application.password_hash
         user.profile = application.profile
-        user.token_pairs = []
-        user.password_reset_requests = []
         user.favorite_retailer_ids = []
         user.created_at = datetime.utcnow()
+        user.session_epoch = 0
         return user
 
     def assign_request(self, attributes: dict) -> None:
@@ -50,19 +55,36 @@ class User:
 
 
 class TokenPair:
-    def __init__(self, token_pair_id, access, refresh):
+    def __init__(self, token_pair_id, access, refresh, user_id=None, expires_at=None):
         self.id = token_pair_id
         self.access = access
         self.refresh = refresh
+        self.access_digest = TokenPair.digest(access)
+        self.refresh_digest = TokenPair.digest(refresh)
+        self.user_id = user_id
+        self.created_at = datetime.utcnow()
+        self.refreshed_at = self.created_at
+        self.expires_at = expires_at
+
+    @staticmethod
+    def digest(token) -> bytes or None:
+        if not token:
+            return None
+        return hashlib.sha256(token.encode()).digest()
 
 
 class PasswordResetRequest:
-    def __init__(self) -> None:
-        self.code = ''.join(choice(ascii_uppercase) for i in range(6))
+    def __init__(self, user_id=None) -> None:
+        self.id = None
+        self.user_id = user_id
         self.created_at = datetime.utcnow()
+        self.generate_code()
+
+    def generate_code(self) -> None:
+        self.code = ''.join(choice(ascii_uppercase) for i in range(6))
 
 
-class UserApplication:
+class UserApplication(TrackedModel):
     def __init__(self):
         self.id = None
         self.email = None
@@ -6,4 +6,5 @@ from .user_presenter import (
 )
 from .profile_presenter import ProfilePresenter
 from .page_presenter import PagePresenter
+from .stats_presenter import StatsPresenter
 from .uploaded_file_presenter import UploadedFilePresenter
@@ -10,4 +10,5 @@ class PagePresenter(BasePresenter):
             'items': [self.item_presenter.present(principal, item) for item in page.items],
             'page': page.page,
             'page_count': page.page_count,
+            'next_cursor': page.next_cursor,
         }
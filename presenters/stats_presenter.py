@@ -0,0 +1,6 @@
+from .base_presenter import BasePresenter
+
+
+class StatsPresenter(BasePresenter):
+    def present(self, principal, item):
+        return item
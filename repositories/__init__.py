@@ -1,2 +1,7 @@
 from .users_repository import UsersRepository
 from .user_applications_repository import UserApplicationsRepository
+from .principal_invalidations_repository import PrincipalInvalidationsRepository
+from .sessions_repository import SessionsRepository
+from .password_resets_repository import PasswordResetsRepository
+from .identity_map import IdentityMap
+from .repository_loader import RepositoryLoader
@@ -1,23 +1,36 @@
 from bson import ObjectId
+from models.tracked_model import TrackedModel
+from .query_planner import QueryPlanner
+from .update_builder import UpdateBuilder
 
 
 class BaseRepository:
-    def __init__(self, collection, model_translator, default_scope, indexes):
-        self.indexes = indexes
+    def __init__(self, collection, model_translator, default_scope):
         self.default_scope = default_scope
         self.collection = collection
         self.model_translator = model_translator
-        self.__configure_indexes()
+        self.query_planner = QueryPlanner()
+        self.update_builder = UpdateBuilder()
 
     def create(self, model) -> str:
         document = self.model_translator.to_document(model)
         document.pop('_id')
-        return self.collection.insert_one(document).inserted_id
+        inserted_id = self.collection.insert_one(document).inserted_id
+        self._mark_persisted(model, document)
+        return inserted_id
 
     def update(self, model) -> None:
         document = self.model_translator.to_document(model)
-        self.collection.update_one(
-            {'_id': ObjectId(model.id)}, {'$set': document})
+        if not isinstance(model, TrackedModel) or not model.is_persisted():
+            self.collection.update_one(
+                {'_id': ObjectId(model.id)}, {'$set': document})
+            self._mark_persisted(model, document)
+            return
+
+        update = self.update_builder.build(self.__persisted_document(model), document)
+        if update:
+            self.collection.update_one({'_id': ObjectId(model.id)}, update)
+        self._mark_persisted(model, document)
 
     def delete(self, model) -> None:
         self.collection.delete_one({'_id': ObjectId(model.id)})
@@ -30,15 +43,15 @@ class BaseRepository:
         pipeline = [
             {'$match': {'_id': object_id}}
         ]
-        return self._find_one_by_aggregation(pipeline + self.default_scope)
+        return self._find_one_by_pipeline(pipeline + self.default_scope)
 
     def find_by_ids_list(self, ids_list) -> list:
         ids = [self._parse_object_id(arg_id) for arg_id in ids_list]
         pipeline = [{'$match': {'_id': {'$in': ids}}}]
-        return self._find_by_aggregation(pipeline + self.default_scope)
+        return self._find_by_pipeline(pipeline + self.default_scope)
 
     def get_page(self, skip, limit) -> list:
-        return self._find_by_aggregation(self.default_scope + [
+        return self._find_by_pipeline(self.default_scope + [
             {'$skip': skip},
             {'$limit': limit}
         ])
@@ -49,18 +62,68 @@ class BaseRepository:
                 "$match": {}
             }
         ]
-        return self._find_by_aggregation(pipeline + self.default_scope)
+        return self._find_by_pipeline(pipeline + self.default_scope)
+
+    def _find_by_pipeline(self, pipeline) -> list:
+        plan = self.query_planner.plan(pipeline)
+        if plan is None:
+            cursor = self.collection.aggregate(pipeline)
+        else:
+            cursor = self.collection.find(
+                plan['filter'],
+                plan['projection'],
+                sort=plan['sort'],
+                skip=plan['skip'],
+                limit=plan['limit']
+            )
+        return [self._from_document(d) for d in cursor]
+
+    def _find_one_by_pipeline(self, pipeline):
+        plan = self.query_planner.plan(pipeline)
+        if plan is None:
+            result = self._find_by_pipeline(pipeline + [{'$limit': 1}])
+            return result[0] if result else None
+
+        document = self.collection.find_one(
+            plan['filter'],
+            plan['projection'],
+            sort=plan['sort'],
+            skip=plan['skip']
+        )
+        if not document:
+            return None
+        return self._from_document(document)
 
-    def _find_by_aggregation(self, pipeline) -> list:
-        cursor = self.collection.aggregate(pipeline)
-        result = [self.model_translator.from_document(d) for d in cursor]
-        return result
+    def _find_page_by_facet(self, pipeline, page_pipeline, with_count=True) -> tuple:
+        if not with_count:
+            return self._find_by_pipeline(pipeline + page_pipeline), None
 
-    def _find_one_by_aggregation(self, pipeline):
-        result = self._find_by_aggregation(pipeline)
-        if not result:
-            return None
-        return result[0]
+        facet_step = {
+            '$facet': {
+                'items': page_pipeline,
+                'total': [{'$count': 'count'}]
+            }
+        }
+        result = next(self.collection.aggregate(pipeline + [facet_step]), None) or {}
+        items = [self._from_document(d) for d in result.get('items', [])]
+        total = result.get('total') or [{}]
+        return items, total[0].get('count', 0)
+
+    def _from_document(self, document):
+        model = self.model_translator.from_document(document)
+        if isinstance(model, TrackedModel):
+            model.mark_loaded(document)
+        return model
+
+    def _mark_persisted(self, model, document) -> None:
+        if isinstance(model, TrackedModel):
+            model.mark_persisted({key: value for key, value in document.items() if key != '_id'})
+
+    def __persisted_document(self, model) -> dict:
+        if model.persisted_document is None:
+            loaded_model = self.model_translator.from_document(model.loaded_document)
+            self._mark_persisted(model, self.model_translator.to_document(loaded_model))
+        return model.persisted_document
 
     def _count_by_aggregation(self, pipeline) -> int:
         group_step = {'$group': {'_id': None, 'count': {'$sum': 1}}}
@@ -78,13 +141,3 @@ class BaseRepository:
         if ObjectId.is_valid(model_id):
             return ObjectId(model_id)
         return None
-
-    def __configure_indexes(self) -> None:
-        if type(self.indexes) != list:
-            return None
-        existing_indexes = self.collection.index_information()
-        new_indexes = [
-            index for index in self.indexes if index not in existing_indexes.keys()
-        ]
-        if new_indexes:
-            self.collection.create_indexes(new_indexes)
@@ -0,0 +1,33 @@
+from contextvars import ContextVar
+
+
+class IdentityMap:
+    def __init__(self) -> None:
+        self.scope = ContextVar(f'identity_map_{id(self)}', default=None)
+
+    def begin(self) -> None:
+        self.scope.set({})
+
+    def clear(self) -> None:
+        self.scope.set(None)
+
+    def is_active(self) -> bool:
+        return self.scope.get() is not None
+
+    def get(self, namespace, key):
+        entries = self.scope.get()
+        if entries is None:
+            return None
+        return entries.get((namespace, str(key)))
+
+    def put(self, namespace, key, model) -> None:
+        entries = self.scope.get()
+        if entries is None:
+            return
+        entries[(namespace, str(key))] = model
+
+    def evict(self, namespace, key) -> None:
+        entries = self.scope.get()
+        if entries is None:
+            return
+        entries.pop((namespace, str(key)), None)
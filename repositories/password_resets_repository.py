@@ -0,0 +1,42 @@
+from pymongo.errors import DuplicateKeyError
+from models import PasswordResetRequest
+from .base_repository import BaseRepository
+
+
+class PasswordResetsRepository(BaseRepository):
+    def __init__(self, collection, password_reset_translator, max_code_attempts=5) -> None:
+        super().__init__(collection, password_reset_translator, [])
+        self.max_code_attempts = max_code_attempts
+
+    def replace_for_user(self, reset_request) -> str:
+        user_id = self._parse_object_id(reset_request.user_id)
+        self.collection.delete_many({'user_id': user_id})
+        for attempt in range(self.max_code_attempts):
+            document = self.model_translator.to_document(reset_request)
+            document.pop('_id')
+            document['user_id'] = user_id
+            try:
+                reset_request.id = self.collection.insert_one(document).inserted_id
+                return reset_request.id
+            except DuplicateKeyError:
+                if attempt == self.max_code_attempts - 1:
+                    raise
+                reset_request.generate_code()
+
+    def find_by_code(self, code) -> PasswordResetRequest or None:
+        if not isinstance(code, str):
+            return None
+        document = self.collection.find_one({'code': code})
+        if not document:
+            return None
+        return self.model_translator.from_document(document)
+
+    def consume(self, reset_request) -> bool:
+        result = self.collection.delete_one({
+            '_id': reset_request.id,
+            'user_id': self._parse_object_id(reset_request.user_id)
+        })
+        return result.deleted_count == 1
+
+    def delete_for_user(self, user_id) -> None:
+        self.collection.delete_many({'user_id': self._parse_object_id(user_id)})
@@ -0,0 +1,13 @@
+from .base_repository import BaseRepository
+
+
+class PrincipalInvalidationsRepository(BaseRepository):
+    def __init__(self, collection, invalidation_translator) -> None:
+        super().__init__(collection, invalidation_translator, [])
+
+    def find_created_since(self, created_at) -> list:
+        pipeline = [
+            {'$match': {'created_at': {'$gte': created_at}}},
+            {'$sort': {'created_at': 1}}
+        ]
+        return self._find_by_pipeline(self.default_scope + pipeline)
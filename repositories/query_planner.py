@@ -0,0 +1,52 @@
+class QueryPlanner:
+    def plan(self, pipeline) -> dict or None:
+        matches = []
+        sort = None
+        skip = 0
+        limit = 0
+        projection = None
+
+        for index, stage in enumerate(pipeline):
+            if len(stage) != 1:
+                return None
+            name, value = next(iter(stage.items()))
+
+            if name == '$match':
+                if skip or limit:
+                    return None
+                if value:
+                    matches.append(value)
+            elif name == '$sort':
+                if sort is not None or skip or limit:
+                    return None
+                sort = list(value.items())
+            elif name == '$skip':
+                if limit:
+                    return None
+                skip += value
+            elif name == '$limit':
+                limit = value if not limit else min(limit, value)
+            elif name == '$project':
+                if index != len(pipeline) - 1 or not self.__is_simple_projection(value):
+                    return None
+                projection = value
+            else:
+                return None
+
+        return {
+            'filter': self.__merge_matches(matches),
+            'sort': sort,
+            'skip': skip,
+            'limit': limit,
+            'projection': projection
+        }
+
+    def __merge_matches(self, matches) -> dict:
+        if not matches:
+            return {}
+        if len(matches) == 1:
+            return matches[0]
+        return {'$and': matches}
+
+    def __is_simple_projection(self, projection) -> bool:
+        return all(value in (0, 1, True, False) for value in projection.values())
@@ -0,0 +1,24 @@
+from bson import ObjectId
+
+
+class RepositoryLoader:
+    def __init__(self, repository, identity_map, namespace) -> None:
+        self.repository = repository
+        self.identity_map = identity_map
+        self.namespace = namespace
+
+    def load(self, model_id):
+        if not self.identity_map.is_active():
+            return self.repository.find_by_id(model_id)
+        if not ObjectId.is_valid(model_id):
+            return None
+
+        model = self.identity_map.get(self.namespace, model_id)
+        if model is None:
+            model = self.repository.find_by_id(model_id)
+            if model is not None:
+                self.identity_map.put(self.namespace, model.id, model)
+        return model
+
+    def evict(self, model_id) -> None:
+        self.identity_map.evict(self.namespace, model_id)
@@ -0,0 +1,62 @@
+from datetime import datetime
+from pymongo import ReturnDocument
+
+from models import TokenPair
+from .base_repository import BaseRepository
+
+
+class SessionsRepository(BaseRepository):
+    def __init__(self, collection, tokens_pair_translator) -> None:
+        super().__init__(collection, tokens_pair_translator, [])
+
+    def create(self, tokens_pair) -> str:
+        document = self.model_translator.to_document(tokens_pair)
+        document['_id'] = self._parse_object_id(tokens_pair.id)
+        document['user_id'] = self._parse_object_id(tokens_pair.user_id)
+        return self.collection.insert_one(document).inserted_id
+
+    def find_for_user(self, tokens_pair_id, user_id) -> TokenPair or None:
+        pipeline = [
+            {'$match': self.__pair_filter(tokens_pair_id, user_id)}
+        ]
+        return self._find_one_by_pipeline(self.default_scope + pipeline)
+
+    def rotate_access(self, tokens_pair_id, user_id, refresh_token, access_token) -> TokenPair or None:
+        find_filter = self.__pair_filter(tokens_pair_id, user_id)
+        find_filter['refresh_digest'] = TokenPair.digest(refresh_token)
+        document = self.collection.find_one_and_update(
+            find_filter,
+            {'$set': {
+                'access_digest': TokenPair.digest(access_token),
+                'refreshed_at': datetime.utcnow()
+            }},
+            return_document=ReturnDocument.AFTER
+        )
+        if not document:
+            return None
+        tokens_pair = self.model_translator.from_document(document)
+        tokens_pair.access = access_token
+        tokens_pair.refresh = refresh_token
+        return tokens_pair
+
+    def evict_oldest_for_user(self, user_id, keep) -> list:
+        cursor = self.collection.find(
+            {'user_id': self._parse_object_id(user_id)},
+            {'_id': 1}
+        ).sort([('refreshed_at', -1), ('created_at', -1)]).skip(keep)
+        evicted_ids = [document['_id'] for document in cursor]
+        if evicted_ids:
+            self.collection.delete_many({'_id': {'$in': evicted_ids}})
+        return evicted_ids
+
+    def delete_for_user(self, tokens_pair_id, user_id) -> None:
+        self.collection.delete_one(self.__pair_filter(tokens_pair_id, user_id))
+
+    def delete_all_for_user(self, user_id) -> None:
+        self.collection.delete_many({'user_id': self._parse_object_id(user_id)})
+
+    def __pair_filter(self, tokens_pair_id, user_id) -> dict:
+        return {
+            '_id': self._parse_object_id(tokens_pair_id),
+            'user_id': self._parse_object_id(user_id)
+        }
@@ -0,0 +1,44 @@
+class UpdateBuilder:
+    def build(self, persisted_document: dict, document: dict) -> dict:
+        sets, unsets, pushes, pulls = {}, {}, {}, {}
+        self.__diff(persisted_document, document, '', sets, unsets, pushes, pulls)
+
+        update = {}
+        for operator, values in (('$set', sets), ('$unset', unsets), ('$push', pushes), ('$pull', pulls)):
+            if values:
+                update[operator] = values
+        return update
+
+    def __diff(self, old, new, prefix, sets, unsets, pushes, pulls) -> None:
+        for key, value in new.items():
+            if key == '_id' and not prefix:
+                continue
+            path = f'{prefix}{key}'
+            if key not in old:
+                sets[path] = value
+                continue
+
+            old_value = old[key]
+            if isinstance(value, dict) and isinstance(old_value, dict):
+                self.__diff(old_value, value, f'{path}.', sets, unsets, pushes, pulls)
+            elif isinstance(value, list) and isinstance(old_value, list):
+                self.__diff_list(path, old_value, value, sets, pushes, pulls)
+            elif old_value != value:
+                sets[path] = value
+
+        for key in old:
+            if key not in new and not (key == '_id' and not prefix):
+                unsets[f'{prefix}{key}'] = ''
+
+    def __diff_list(self, path, old, new, sets, pushes, pulls) -> None:
+        if old == new:
+            return
+        if len(new) > len(old) and new[:len(old)] == old:
+            pushes[path] = {'$each': new[len(old):]}
+            return
+
+        removed = [item for item in old if item not in new]
+        if removed and [item for item in old if item not in removed] == new:
+            pulls[path] = {'$in': removed}
+            return
+        sets[path] = new
@@ -1,11 +1,16 @@
-from models import User
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import OperationFailure
+from models import Principal, normalize_email
 from .base_repository import BaseRepository
 import re
 
 
 class UsersRepository(BaseRepository):
-    def __init__(self, collection, user_translator, indexes) -> None:
-        super().__init__(collection, user_translator, [], indexes)
+    ROLE_INDEX = 'role_1__id_-1'
+
+    def __init__(self, collection, user_translator, principal_translator) -> None:
+        super().__init__(collection, user_translator, [])
+        self.principal_translator = principal_translator
 
     def get_page(self, skip, limit, role=None) -> list:
         sort = {"$sort": {"_id": -1}}
@@ -16,47 +21,48 @@ class UsersRepository(BaseRepository):
             match_step['$match'] = {'role': role}
 
         pipeline = [sort, match_step, skip_step, limit_step]
-        return self._find_by_aggregation(self.default_scope + pipeline)
+        return self._find_by_pipeline(self.default_scope + pipeline)
 
-    def count(self, role) -> int:
-        find_filter = {}
+    def get_page_after(self, after_id, limit, role=None) -> list:
+        find_filter = {'_id': {'$lt': after_id}}
         if role:
             find_filter['role'] = role
-        pipeline = [
-            {'$match': find_filter}
-        ]
-        return self._count_by_aggregation(self.default_scope + pipeline)
+
+        pipeline = [{'$match': find_filter}, {"$sort": {"_id": -1}}, {'$limit': limit}]
+        return self._find_by_pipeline(self.default_scope + pipeline)
+
+    def count(self, role) -> int:
+        if not role:
+            return self.collection.estimated_document_count()
+        try:
+            return self.collection.count_documents({'role': role}, hint=self.ROLE_INDEX)
+        except OperationFailure:
+            return self.collection.count_documents({'role': role})
 
     def find_by_email(self, email: str) -> list or None:
-        escaped_email = re.escape(email)
-        find_attrs = {
-            'email': {
-                '$regex': f'^{escaped_email}$',
-                '$options': 'i'
-            }
-        }
+        find_attrs = {'normalized_email': normalize_email(email)}
         pipeline = [
             {'$match': find_attrs}
         ]
-        return self._find_one_by_aggregation(self.default_scope + pipeline)
+        return self._find_one_by_pipeline(self.default_scope + pipeline)
 
-    def find_password_reset(self, code) -> User or None:
-        find_attrs = {
-            'password_reset_requests': {
-                '$elemMatch': {'code': code}
-            }
-        }
-        pipeline = [
-            {'$match': find_attrs}
-        ]
-        return self._find_one_by_aggregation(self.default_scope + pipeline)
+    def find_principal_by_id(self, user_id_str, with_password_hash=False) -> Principal or None:
+        user_id = self._parse_object_id(user_id_str)
+        if not user_id:
+            return None
+        return self.__find_principal({'_id': user_id}, with_password_hash)
 
-    def search(self, skip: int, limit: int, query: str, role: str) -> list:
-        skip_step = {'$skip': skip}
-        limit_step = {'$limit': limit}
+    def find_principal_by_email(self, email: str, with_password_hash=False) -> Principal or None:
+        find_filter = {'normalized_email': normalize_email(email)}
+        return self.__find_principal(find_filter, with_password_hash)
+
+    def search_page(self, skip: int, limit: int, after_id, query: str, role: str, with_count=True) -> tuple:
+        page_pipeline = [{'$sort': {'_id': -1}}, {'$skip': skip}, {'$limit': limit}]
+        if after_id:
+            page_pipeline.insert(0, {'$match': {'_id': {'$lt': after_id}}})
 
-        search_pipeline = self.__search_pipeline(query, role) + [skip_step, limit_step]
-        return self._find_by_aggregation(self.default_scope + search_pipeline)
+        search_pipeline = self.__search_pipeline(query, role)
+        return self._find_page_by_facet(self.default_scope + search_pipeline, page_pipeline, with_count)
 
     def update_last_visit(self, user_id_str, datetime) -> None:
         user_id = self._parse_object_id(user_id_str)
@@ -64,9 +70,93 @@ class UsersRepository(BaseRepository):
             return
         self.collection.update_one({'_id': user_id}, {'$set': {'last_visit_at': datetime}})
 
-    def count_for_search(self, query, role) -> int:
-        pipeline = self.__search_pipeline(query, role)
-        return self._count_by_aggregation(self.default_scope + pipeline)
+    def update_last_visits(self, visits, resolution) -> None:
+        operations = []
+        for user_id_str, visited_at in visits:
+            user_id = self._parse_object_id(user_id_str)
+            if not user_id:
+                continue
+            find_filter = {
+                '_id': user_id,
+                '$or': [
+                    {'last_visit_at': None},
+                    {'last_visit_at': {'$lte': visited_at - resolution}}
+                ]
+            }
+            operations.append(UpdateOne(find_filter, {'$set': {'last_visit_at': visited_at}}))
+        if operations:
+            self.collection.bulk_write(operations, ordered=False)
+
+    def update_password_hash(self, user_id_str, old_password_hash, new_password_hash) -> None:
+        user_id = self._parse_object_id(user_id_str)
+        if not user_id:
+            return
+        self.collection.update_one(
+            {'_id': user_id, 'password_hash': old_password_hash},
+            {'$set': {'password_hash': new_password_hash}}
+        )
+
+    def replace_password_hash(self, user_id_str, new_password_hash, old_password_hash=None) -> int or None:
+        user_id = self._parse_object_id(user_id_str)
+        if not user_id:
+            return None
+        find_filter = {'_id': user_id}
+        if old_password_hash is not None:
+            find_filter['password_hash'] = old_password_hash
+        document = self.collection.find_one_and_update(
+            find_filter,
+            {
+                '$set': {'password_hash': new_password_hash},
+                '$inc': {'session_epoch': 1}
+            },
+            projection={'session_epoch': 1},
+            return_document=ReturnDocument.AFTER
+        )
+        if not document:
+            return None
+        return document['session_epoch']
+
+    def find_session_epoch(self, user_id_str) -> int or None:
+        user_id = self._parse_object_id(user_id_str)
+        if not user_id:
+            return None
+        document = self.collection.find_one({'_id': user_id}, {'session_epoch': 1})
+        if not document:
+            return None
+        return document.get('session_epoch', 0)
+
+    def increment_session_epoch(self, user_id_str) -> int or None:
+        user_id = self._parse_object_id(user_id_str)
+        if not user_id:
+            return None
+        document = self.collection.find_one_and_update(
+            {'_id': user_id},
+            {'$inc': {'session_epoch': 1}},
+            projection={'session_epoch': 1},
+            return_document=ReturnDocument.AFTER
+        )
+        if not document:
+            return None
+        return document['session_epoch']
+
+    def find_compaction_batch(self, after_id, limit) -> list:
+        find_filter = {'token_pairs': {'$exists': True}}
+        if after_id:
+            find_filter['_id'] = {'$gt': after_id}
+        cursor = self.collection.find(
+            find_filter,
+            {'token_pairs': 1}
+        ).sort('_id', 1).limit(limit)
+        return [(document['_id'], document.get('token_pairs') or []) for document in cursor]
+
+    def pull_token_pairs(self, user_ids, pair_ids) -> int:
+        if not user_ids or not pair_ids:
+            return 0
+        result = self.collection.update_many(
+            {'_id': {'$in': user_ids}},
+            {'$pull': {'token_pairs': {'id': {'$in': pair_ids}}}}
+        )
+        return result.modified_count
 
     def delete_all(self) -> None:
         super().delete_all()
@@ -110,3 +200,10 @@ class UsersRepository(BaseRepository):
                 'role': role
             }
         }]
+
+    def __find_principal(self, find_filter, with_password_hash) -> Principal or None:
+        document = self.collection.find_one(
+            find_filter, self.principal_translator.projection(with_password_hash))
+        if not document:
+            return None
+        return self.principal_translator.from_document(document)
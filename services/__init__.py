@@ -2,8 +2,16 @@ from .password_service import PasswordService
 from .users_service import UsersService
 from .validator_service import ValidatorService
 from .tokens_service import TokensService
+from .session_epoch_service import SessionEpochService
+from .principal_cache_service import PrincipalCacheService
+from .last_visit_service import LastVisitService
+from .login_throttle_service import LoginThrottleService
+from .user_compaction_service import UserCompactionService
+from .index_sync_service import IndexSyncService
 from .auth_service import AuthService
+from .count_cache_service import CountCacheService
 from .page_service import PageService
+from .stats_service import StatsService
 from .email_service import (
     UserEmailService,
     EmailListService,
@@ -1,63 +1,77 @@
+import hmac
 from bson import ObjectId
 from infrastructure.exceptions import UnauthenticatedException, UnauthorizedException, InvalidRequestException
-from models import TokenPair, PasswordResetRequest, User
+from models import TokenPair, PasswordResetRequest, Principal
 from datetime import datetime, timedelta
 
 
 class AuthService:
-    def __init__(self, users_repository, password_service, tokens_service, user_email_service,
-                 password_reset_validation_service, password_change_validation_service) -> None:
+    def __init__(self, users_repository, sessions_repository, password_resets_repository,
+                 password_service, tokens_service,
+                 user_email_service, password_reset_validation_service,
+                 password_change_validation_service, session_epoch_service,
+                 principal_cache_service, login_throttle_service, users_loader, stateless_authentication,
+                 max_sessions_per_user=0) -> None:
         self.users_repository = users_repository
+        self.sessions_repository = sessions_repository
+        self.password_resets_repository = password_resets_repository
         self.password_service = password_service
         self.tokens_service = tokens_service
         self.user_email_service = user_email_service
         self.password_reset_validation_service = password_reset_validation_service
         self.password_change_validation_service = password_change_validation_service
-
-    def login(self, email, password, principal=None) -> TokenPair:
-        user = self.users_repository.find_by_email(email)
-        if not user:
+        self.session_epoch_service = session_epoch_service
+        self.principal_cache_service = principal_cache_service
+        self.login_throttle_service = login_throttle_service
+        self.users_loader = users_loader
+        self.stateless_authentication = stateless_authentication
+        self.max_sessions_per_user = max_sessions_per_user
+
+    def login(self, email, password, client_ip=None, principal=None) -> TokenPair:
+        throttle_keys = self.login_throttle_service.keys('login', email, client_ip)
+        self.login_throttle_service.check(throttle_keys)
+        user = self.users_repository.find_principal_by_email(email, with_password_hash=True)
+        if not user or not self.password_service.check(password, user.password_hash):
+            self.login_throttle_service.register_failure(throttle_keys)
             raise UnauthenticatedException()
+        self.login_throttle_service.reset(throttle_keys)
 
-        if not self.password_service.check(password, user.password_hash):
-            raise UnauthenticatedException()
+        if self.password_service.needs_rehash(user.password_hash):
+            new_password_hash = self.password_service.create_hash(password)
+            self.users_repository.update_password_hash(user.id, user.password_hash, new_password_hash)
+            user.password_hash = new_password_hash
 
         new_pair = self.__create_pair(user)
-
-        user.token_pairs.append(new_pair)
-        self.users_repository.update(user)
+        self.sessions_repository.create(new_pair)
+        self.__evict_sessions(user.id)
         return new_pair
 
     def refresh(self, refresh_token, principal=None) -> TokenPair:
         refresh_payload = self.__get_payload(refresh_token)
-        user = self.__get_user_by_token(refresh_payload)
+        user = self.users_repository.find_principal_by_id(refresh_payload.get('user_id'))
+        if not user:
+            raise UnauthenticatedException()
 
         pair_id = refresh_payload.get('id')
-        refreshed_pairs = [p for p in user.token_pairs if str(p.id) == pair_id]
-        if not refreshed_pairs or len(refreshed_pairs) == 0:
+        access = self.__create_pair(user, refresh_token, pair_id).access
+        pair = self.sessions_repository.rotate_access(pair_id, user.id, refresh_token, access)
+        if not pair:
             raise UnauthenticatedException()
 
-        pair = refreshed_pairs[0]
-        if self.tokens_service.decode(pair.access):
-            return pair
-
-        new_pair = self.__create_pair(user, refresh_token, pair_id)
-        user.token_pairs = self.__remove_token_pairs(user, pair_id)
-        user.token_pairs.append(new_pair)
-        self.users_repository.update(user)
-        return new_pair
+        self.principal_cache_service.invalidate_token_pair(pair_id)
+        return pair
 
     def logout(self, auth_header, principal=None) -> None:
         token = self.__get_token_from_header(auth_header)
         payload = self.__get_payload(token)
-        user = self.__get_user_by_token(payload)
-
+        user_id = payload.get('user_id')
         pair_id = payload.get('id')
-        user.token_pairs = self.__remove_token_pairs(user, pair_id)
 
-        self.users_repository.update(user)
+        self.sessions_repository.delete_for_user(pair_id, user_id)
+        self.session_epoch_service.bump(user_id)
+        self.principal_cache_service.invalidate_token_pair(pair_id)
 
-    def authenticate(self, auth_header, allow_anonymous) -> User or None:
+    def authenticate(self, auth_header, allow_anonymous) -> Principal or None:
         jwt = self.__get_token_from_header(auth_header, allow_anonymous)
         if not jwt:
             if allow_anonymous:
@@ -65,16 +79,26 @@ class AuthService:
             else:
                 raise UnauthenticatedException()
         payload = self.__get_payload(jwt)
-        user = self.__get_user_by_token(payload, allow_anonymous)
+        if self.stateless_authentication:
+            return self.__get_principal_by_claims(payload, allow_anonymous)
+
+        pair_id = payload.get('id')
+        user = self.principal_cache_service.get(pair_id, jwt)
+        if user:
+            return user
 
-        access_tokens = list(
-            map(lambda pair: pair.access, user.token_pairs))
+        user = self.__get_user_by_token(payload, allow_anonymous)
+        if not user:
+            return None
 
-        if jwt not in access_tokens:
+        pair = self.sessions_repository.find_for_user(pair_id, user.id)
+        if not pair or not hmac.compare_digest(pair.access_digest or b'', TokenPair.digest(jwt)):
             if allow_anonymous:
                 return None
             else:
                 raise UnauthenticatedException()
+        user.token_pair_id = pair_id
+        self.principal_cache_service.put(pair_id, jwt, user, payload.get('exp'))
         return user
 
     def authorize(self, user, roles) -> None:
@@ -84,61 +108,91 @@ class AuthService:
         if roles != '*' and role not in roles:
             raise UnauthorizedException()
 
-    def request_password_reset(self, email, principal=None) -> None:
+    def request_password_reset(self, email, client_ip=None, principal=None) -> None:
+        throttle_keys = self.login_throttle_service.keys('password_reset', email, client_ip)
+        self.login_throttle_service.check(throttle_keys)
         user = self.users_repository.find_by_email(email)
         if not user:
+            self.login_throttle_service.register_failure(throttle_keys)
             return
 
-        reset_request = PasswordResetRequest()
-        user.password_reset_requests = [reset_request]
-        self.users_repository.update(user)
+        reset_request = PasswordResetRequest(user.id)
+        self.password_resets_repository.replace_for_user(reset_request)
         self.user_email_service.recover_password(user, reset_request.code)
 
     def reset_password(self, params, principal=None) -> None:
-        user = self.users_repository.find_password_reset(params.get('code'))
+        reset_request = self.password_resets_repository.find_by_code(params.get('code'))
+        if not reset_request or datetime.utcnow() > reset_request.created_at + timedelta(hours=24):
+            self.__raise_invalid_code()
+        user = self.users_repository.find_principal_by_id(reset_request.user_id)
         if not user or params.get('email') != user.email:
-            error = {
-                'code': [
-                    {'message': 'Invalid code', 'key': 'error_invalid_code'}
-                ]
-            }
-            raise InvalidRequestException(error)
-        password_reset_request = [
-            prr for prr in user.password_reset_requests if prr.code == params.get('code')
-        ][0]
-        expires_at = password_reset_request.created_at + timedelta(hours=24)
-        if datetime.utcnow() > expires_at:
-            error = {
-                'code': [
-                    {'message': 'Invalid code', 'key': 'error_invalid_code'}
-                ]
-            }
-            raise InvalidRequestException(error)
+            self.__raise_invalid_code()
 
         self.password_reset_validation_service.validate(params)
-        user.password_hash = self.password_service.create_hash(params['new_password'])
-        user.token_pairs = []
-        user.password_reset_requests = []
-        self.users_repository.update(user)
-
-    def change_password(self, user_id, auth_header, params, principal=None) -> TokenPair:
+        password_hash = self.password_service.create_hash(params['new_password'])
+        if not self.password_resets_repository.consume(reset_request):
+            self.__raise_invalid_code()
+        epoch = self.users_repository.replace_password_hash(user.id, password_hash)
+        if epoch is None:
+            self.__raise_invalid_code()
+        self.__revoke_sessions(user.id, epoch)
+
+    def change_password(self, user_id, params, client_ip=None, principal=None) -> TokenPair:
         if str(principal.id) != user_id:
             raise UnauthorizedException()
-        principal = self.authenticate(auth_header, False)
+        throttle_keys = self.login_throttle_service.keys('change_password', user_id, client_ip)
+        self.login_throttle_service.check(throttle_keys)
         self.password_change_validation_service.validate(params)
+        user = self.users_repository.find_principal_by_id(principal.id, with_password_hash=True)
+        if not user:
+            raise UnauthenticatedException()
         old_password = params.get('old_password')
-        if not self.password_service.check(old_password, principal.password_hash):
-            error = {
-                'old_password': [
-                    {'message': 'Invalid password', 'key': 'error_invalid_password'}
-                ]
-            }
-            raise InvalidRequestException(error)
-        principal.password_hash = self.password_service.create_hash(params['new_password'])
-        principal.token_pairs = []
-        principal.password_reset_requests = []
-        self.users_repository.update(principal)
-        return self.login(principal.email, params['new_password'])
+        if not self.password_service.check(old_password, user.password_hash):
+            self.login_throttle_service.register_failure(throttle_keys)
+            self.__raise_invalid_password()
+        self.login_throttle_service.reset(throttle_keys)
+        password_hash = self.password_service.create_hash(params['new_password'])
+        epoch = self.users_repository.replace_password_hash(
+            user.id, password_hash, old_password_hash=user.password_hash
+        )
+        if epoch is None:
+            self.__raise_invalid_password()
+        self.__revoke_sessions(user.id, epoch)
+
+        user.password_hash = password_hash
+        user.session_epoch = epoch
+        new_pair = self.__create_pair(user)
+        self.sessions_repository.create(new_pair)
+        return new_pair
+
+    def __evict_sessions(self, user_id) -> None:
+        if self.max_sessions_per_user <= 0:
+            return
+        evicted_ids = self.sessions_repository.evict_oldest_for_user(user_id, self.max_sessions_per_user)
+        for evicted_id in evicted_ids:
+            self.principal_cache_service.invalidate_token_pair(str(evicted_id))
+
+    def __revoke_sessions(self, user_id, epoch) -> None:
+        self.sessions_repository.delete_all_for_user(user_id)
+        self.password_resets_repository.delete_for_user(user_id)
+        self.session_epoch_service.store(user_id, epoch)
+        self.principal_cache_service.invalidate_user(user_id)
+
+    def __raise_invalid_code(self) -> None:
+        error = {
+            'code': [
+                {'message': 'Invalid code', 'key': 'error_invalid_code'}
+            ]
+        }
+        raise InvalidRequestException(error)
+
+    def __raise_invalid_password(self) -> None:
+        error = {
+            'old_password': [
+                {'message': 'Invalid password', 'key': 'error_invalid_password'}
+            ]
+        }
+        raise InvalidRequestException(error)
 
     def __create_pair(self, user, refresh_token=None, token_id=None) -> TokenPair:
         if not token_id:
@@ -146,16 +200,18 @@ class AuthService:
         claims = {
             'id': str(token_id),
             'user_id': str(user.id),
-            'role': user.role
+            'role': user.role,
+            'epoch': user.session_epoch
         }
         access = self.tokens_service.encode('access', claims)
+        expires_at = None
         if not refresh_token:
             refresh_token = self.tokens_service.encode('refresh', claims)
-        return TokenPair(token_id, access, refresh_token)
+            expires_at = datetime.utcnow() + timedelta(hours=self.tokens_service.refresh_token_ttl)
+        return TokenPair(token_id, access, refresh_token, user.id, expires_at)
 
-    def __get_user_by_token(self, payload, allow_anonymous=None) -> User or None:
-        user_id = payload.get('user_id')
-        user = self.users_repository.find_by_id(user_id)
+    def __get_user_by_token(self, payload, allow_anonymous=None) -> Principal or None:
+        user = self.users_loader.load(payload.get('user_id'))
 
         if not user:
             if allow_anonymous:
@@ -163,7 +219,21 @@ class AuthService:
             else:
                 raise UnauthenticatedException()
 
-        return user
+        return Principal.from_user(user)
+
+    def __get_principal_by_claims(self, payload, allow_anonymous=None) -> Principal or None:
+        if payload.get('purpose') != 'access':
+            if allow_anonymous:
+                return None
+            raise UnauthenticatedException()
+
+        epoch = self.session_epoch_service.get(payload.get('user_id'))
+        if epoch is None or payload.get('epoch') != epoch:
+            if allow_anonymous:
+                return None
+            raise UnauthenticatedException()
+
+        return Principal.from_claims(payload)
 
     def __get_token_from_header(self, auth_header, allow_anonymous=None) -> None or str:
         if not auth_header:
@@ -185,9 +255,3 @@ class AuthService:
             raise UnauthenticatedException()
 
         return payload
-
-    def __remove_token_pairs(self, user, pair_id) -> list:
-        user.token_pairs = [
-            p for p in user.token_pairs if str(p.id) != str(pair_id)]
-
-        return user.token_pairs
@@ -0,0 +1,55 @@
+import time
+from collections import OrderedDict
+from threading import Lock
+
+
+class CountCacheService:
+    def __init__(self, ttl_seconds, max_size) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.key_locks = {}
+        self.lock = Lock()
+
+    def get_or_count(self, key, count_func, *args, **kwargs) -> int:
+        if self.ttl_seconds <= 0:
+            return count_func(*args, **kwargs)
+
+        count = self.__get(key)
+        if count is not None:
+            return count
+
+        with self.__key_lock(key):
+            count = self.__get(key)
+            if count is not None:
+                return count
+            count = count_func(*args, **kwargs)
+            self.__put(key, count)
+            return count
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+
+    def __get(self, key) -> int or None:
+        with self.lock:
+            entry = self.entries.get(key)
+            if not entry:
+                return None
+            count, expires_at = entry
+            if expires_at <= time.monotonic():
+                self.entries.pop(key)
+                return None
+            return count
+
+    def __put(self, key, count) -> None:
+        with self.lock:
+            self.entries[key] = (count, time.monotonic() + self.ttl_seconds)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+            self.key_locks.pop(key, None)
+
+    def __key_lock(self, key) -> Lock:
+        with self.lock:
+            return self.key_locks.setdefault(key, Lock())
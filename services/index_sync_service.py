@@ -0,0 +1,56 @@
+class IndexSyncService:
+    def __init__(self, database, declared_indexes) -> None:
+        self.database = database
+        self.declared_indexes = declared_indexes
+
+    def plan(self, prune=False) -> list:
+        actions = []
+        for collection_name, indexes in self.declared_indexes.items():
+            existing = self.database[collection_name].index_information()
+            declared_names = set()
+            for index in indexes:
+                document = index.document
+                name = document['name']
+                declared_names.add(name)
+                current = existing.get(name)
+                if current is None:
+                    actions.append(('create', collection_name, name, index))
+                elif self.__spec(current) != self.__spec(document):
+                    actions.append(('recreate', collection_name, name, index))
+                elif current.get('expireAfterSeconds') != document.get('expireAfterSeconds'):
+                    actions.append(('update_ttl', collection_name, name, index))
+            for name in existing:
+                if name == '_id_' or name in declared_names:
+                    continue
+                actions.append(('drop' if prune else 'unmanaged', collection_name, name, None))
+        return actions
+
+    def apply(self, actions) -> None:
+        for action, collection_name, name, index in actions:
+            collection = self.database[collection_name]
+            if action == 'create':
+                collection.create_indexes([index])
+            elif action == 'recreate':
+                collection.drop_index(name)
+                collection.create_indexes([index])
+            elif action == 'update_ttl':
+                self.database.command(
+                    'collMod',
+                    collection_name,
+                    index={'name': name, 'expireAfterSeconds': index.document['expireAfterSeconds']}
+                )
+            elif action == 'drop':
+                collection.drop_index(name)
+
+    def __spec(self, document) -> tuple:
+        key = [
+            (field, int(direction) if isinstance(direction, (int, float)) else direction)
+            for field, direction in dict(document['key']).items()
+        ]
+        partial_filter = document.get('partialFilterExpression')
+        return (
+            key,
+            bool(document.get('unique', False)),
+            'expireAfterSeconds' in document,
+            dict(partial_filter) if partial_filter else None
+        )
@@ -0,0 +1,49 @@
+import atexit
+import time
+from collections import OrderedDict
+from threading import Lock
+
+
+class LastVisitService:
+    def __init__(self, celery, resolution_minutes, flush_interval_seconds, max_buffer_size,
+                 max_tracked_users=100000) -> None:
+        self.celery = celery
+        self.resolution_seconds = resolution_minutes * 60
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_buffer_size = max_buffer_size
+        self.max_tracked_users = max_tracked_users
+        self.buffer = {}
+        self.recorded = OrderedDict()
+        self.flushed_at = time.monotonic()
+        self.lock = Lock()
+        atexit.register(self.flush)
+
+    def track(self, user_id, visited_at) -> None:
+        key = str(user_id)
+        timestamp = visited_at.timestamp()
+        with self.lock:
+            recorded = self.recorded.get(key)
+            if recorded is None or timestamp - recorded >= self.resolution_seconds:
+                self.buffer[key] = timestamp
+                self.recorded[key] = timestamp
+                self.recorded.move_to_end(key)
+                while len(self.recorded) > self.max_tracked_users:
+                    self.recorded.popitem(last=False)
+            flush_due = len(self.buffer) >= self.max_buffer_size or \
+                time.monotonic() - self.flushed_at >= self.flush_interval_seconds
+
+        if flush_due:
+            self.flush()
+
+    def flush(self) -> None:
+        with self.lock:
+            visits = [[user_id, timestamp] for user_id, timestamp in self.buffer.items()]
+            self.buffer = {}
+            self.flushed_at = time.monotonic()
+
+        if not visits:
+            return
+        self.celery.send_task(
+            'background_jobs.update_last_visits',
+            [visits, self.resolution_seconds]
+        )
@@ -0,0 +1,43 @@
+import time
+from infrastructure.exceptions import TooManyRequestsException
+
+
+class LoginThrottleService:
+    def __init__(self, throttle_store_wrapper, max_failures, max_ip_failures, window_seconds) -> None:
+        self.throttle_store_wrapper = throttle_store_wrapper
+        self.max_failures = max_failures
+        self.max_ip_failures = max_ip_failures
+        self.window_seconds = window_seconds
+
+    def keys(self, scope, subject, client_ip) -> list:
+        keys = []
+        if subject:
+            keys.append(f'{scope}:subject:{str(subject).strip().lower()}')
+        if client_ip:
+            keys.append(f'{scope}:ip:{client_ip}')
+        return keys
+
+    def check(self, keys) -> None:
+        if self.max_failures <= 0:
+            return
+        since = time.time() - self.window_seconds
+        for key in keys:
+            limit = self.__limit(key)
+            if limit > 0 and self.throttle_store_wrapper.count(key, since) >= limit:
+                raise TooManyRequestsException()
+
+    def register_failure(self, keys) -> None:
+        if self.max_failures <= 0:
+            return
+        now = time.time()
+        for key in keys:
+            self.throttle_store_wrapper.add(key, now)
+
+    def reset(self, keys) -> None:
+        for key in keys:
+            self.throttle_store_wrapper.clear(key)
+
+    def __limit(self, key) -> int:
+        if ':ip:' in key:
+            return self.max_ip_failures
+        return self.max_failures
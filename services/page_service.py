@@ -1,27 +1,130 @@
+import base64
+import binascii
 import math
+import time
+from bson import ObjectId
+from bson.errors import InvalidId
 from models import Page
 from infrastructure.exceptions import InvalidRequestException
 
 
 class PageService:
-    def get_page(self, paging, page_func, count_func, *args, **kwargs) -> Page:
-        paging_errors = self.__validate_paging(paging)
+    def __init__(self, count_cache_service=None, thread_pool_wrapper=None,
+                 max_page_size=100, max_offset=10000) -> None:
+        self.count_cache_service = count_cache_service
+        self.thread_pool_wrapper = thread_pool_wrapper
+        self.max_page_size = max_page_size
+        self.max_offset = max_offset
+
+    def get_page(self, paging, page_func, count_func, *args, after_func=None, **kwargs) -> Page:
+        paging_errors = self.__validate_paging(paging, after_func is not None)
         if paging_errors:
             raise InvalidRequestException(paging_errors)
 
-        skip = (paging.page - 1) * paging.page_size
+        after_id = self.__decode_cursor(paging.cursor) if paging.cursor else None
+
+        started_at = time.perf_counter()
+        count_future = None
+        if paging.with_count and self.thread_pool_wrapper is not None:
+            count_future = self.thread_pool_wrapper.submit(self.__timed, self.__count, count_func, *args, **kwargs)
+
+        if after_id is not None:
+            models, page_ms = self.__timed(after_func, after_id, paging.page_size + 1, *args, **kwargs)
+        else:
+            skip = (paging.page - 1) * paging.page_size
+            models, page_ms = self.__timed(page_func, skip, paging.page_size, *args, **kwargs)
+
+        models_count, count_ms = None, None
+        if count_future is not None:
+            models_count, count_ms = count_future.result()
+        elif paging.with_count:
+            models_count, count_ms = self.__timed(self.__count, count_func, *args, **kwargs)
+
+        page = self.__build_page(paging, models, models_count, after_func is not None)
+        page.timings = self.__timings(started_at, page_ms, count_ms)
+        return page
+
+    def get_counted_page(self, paging, counted_page_func, *args, **kwargs) -> Page:
+        paging_errors = self.__validate_paging(paging, True)
+        if paging_errors:
+            raise InvalidRequestException(paging_errors)
+
+        started_at = time.perf_counter()
+        kwargs['with_count'] = paging.with_count
+        if paging.cursor:
+            after_id = self.__decode_cursor(paging.cursor)
+            result, page_ms = self.__timed(counted_page_func, 0, paging.page_size + 1, after_id, *args, **kwargs)
+        else:
+            skip = (paging.page - 1) * paging.page_size
+            result, page_ms = self.__timed(counted_page_func, skip, paging.page_size, None, *args, **kwargs)
+
+        models, models_count = result
+        page = self.__build_page(paging, models, models_count, True)
+        page.timings = self.__timings(started_at, page_ms, None)
+        return page
+
+    def encode_cursor(self, model_id) -> str:
+        raw = ObjectId(model_id).binary
+        return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+    def __timed(self, function, *args, **kwargs) -> tuple:
+        started_at = time.perf_counter()
+        result = function(*args, **kwargs)
+        return result, (time.perf_counter() - started_at) * 1000
+
+    def __timings(self, started_at, page_ms, count_ms) -> dict:
+        return {
+            'page_ms': round(page_ms, 3),
+            'count_ms': round(count_ms, 3) if count_ms is not None else None,
+            'total_ms': round((time.perf_counter() - started_at) * 1000, 3)
+        }
+
+    def __count(self, count_func, *args, **kwargs) -> int:
+        if self.count_cache_service is None:
+            return count_func(*args, **kwargs)
+        key = f'{count_func.__qualname__}:{args!r}:{sorted(kwargs.items())!r}'
+        return self.count_cache_service.get_or_count(key, count_func, *args, **kwargs)
+
+    def __build_page(self, paging, models, models_count, cursor_supported) -> Page:
         limit = paging.page_size
-        models = page_func(skip, limit, *args, **kwargs)
-        models_count = count_func(*args, **kwargs)
-        page_count = math.ceil(models_count / paging.page_size)
-        if page_count == 0:
-            page_count = 1
-        return Page(items=models, page=paging.page, page_count=page_count)
-
-    def __validate_paging(self, paging) -> dict:
+        page_count = None
+        if models_count is not None:
+            page_count = max(math.ceil(models_count / limit), 1)
+
+        if paging.cursor:
+            has_more = len(models) > limit
+            models = models[:limit]
+            page = None
+        else:
+            has_more = len(models) == limit and (page_count is None or paging.page < page_count)
+            page = paging.page
+
+        next_cursor = None
+        if has_more and cursor_supported:
+            next_cursor = self.encode_cursor(models[-1].id)
+        return Page(items=models, page=page, page_count=page_count, next_cursor=next_cursor)
+
+    def __decode_cursor(self, cursor) -> ObjectId:
+        try:
+            raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+            return ObjectId(raw)
+        except (binascii.Error, InvalidId, ValueError, TypeError):
+            raise InvalidRequestException({'cursor': ['is invalid']})
+
+    def __validate_paging(self, paging, cursor_supported) -> dict:
         errors = {}
-        if paging.page < 1:
-            errors["page"] = ["should be greater than zero"]
         if paging.page_size < 1:
             errors["page_size"] = ["should be greater than zero"]
+        elif paging.page_size > self.max_page_size:
+            errors["page_size"] = [f"should not be greater than {self.max_page_size}"]
+
+        if paging.cursor:
+            if not cursor_supported:
+                errors["cursor"] = ["is not supported"]
+            return errors
+
+        if paging.page < 1:
+            errors["page"] = ["should be greater than zero"]
+        elif "page_size" not in errors and (paging.page - 1) * paging.page_size > self.max_offset:
+            errors["page"] = ["is too deep, use cursor"]
         return errors
@@ -1,13 +1,33 @@
 class PasswordService:
-    def __init__(self, bcrypt_wrapper, password_generator) -> None:
-        self.bcrypt_wrapper = bcrypt_wrapper
+    def __init__(self, hashers, hasher_name, password_generator, process_pool_wrapper) -> None:
+        self.hashers = hashers
+        self.hasher = next(hasher for hasher in hashers if hasher.name == hasher_name)
         self.password_generator = password_generator
+        self.process_pool_wrapper = process_pool_wrapper
 
     def create_hash(self, password: str) -> bytes:
-        return self.bcrypt_wrapper.gen_hash(password)
+        return self.process_pool_wrapper.run(self.hasher.gen_hash, password)
 
     def check(self, password, password_hash) -> bool:
-        return self.bcrypt_wrapper.check(password, password_hash)
+        hasher = self.__find_hasher(password_hash)
+        if not hasher:
+            return False
+        return self.process_pool_wrapper.run(hasher.check, password, password_hash)
+
+    def needs_rehash(self, password_hash) -> bool:
+        hasher = self.__find_hasher(password_hash)
+        return hasher is not self.hasher or hasher.needs_rehash(password_hash)
 
     def generate_password(self, length) -> str:
         return self.password_generator.generate_password(length)
+
+    def stats(self) -> dict:
+        return self.process_pool_wrapper.stats()
+
+    def __find_hasher(self, password_hash):
+        if not password_hash:
+            return None
+        for hasher in self.hashers:
+            if hasher.identifies(password_hash):
+                return hasher
+        return None
@@ -0,0 +1,127 @@
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from threading import Lock
+
+from models import PrincipalInvalidation
+
+
+class PrincipalCacheService:
+    SYNC_OVERLAP_SECONDS = 5
+
+    def __init__(self, principal_invalidations_repository, ttl_seconds, max_size,
+                 sync_interval_seconds, invalidation_retention_seconds) -> None:
+        self.principal_invalidations_repository = principal_invalidations_repository
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self.sync_interval_seconds = sync_interval_seconds
+        self.invalidation_retention_seconds = invalidation_retention_seconds
+        self.entries = OrderedDict()
+        self.user_pairs = {}
+        self.applied_invalidations = {}
+        self.synced_at = datetime.utcnow()
+        self.lock = Lock()
+        self.sync_lock = Lock()
+
+    def get(self, token_pair_id, token):
+        self.__sync()
+        key = str(token_pair_id)
+        with self.lock:
+            entry = self.entries.get(key)
+            if not entry:
+                return None
+            cached_token, principal, expires_at = entry
+            if cached_token != token or expires_at <= time.time():
+                self.__evict(key)
+                return None
+            self.entries.move_to_end(key)
+            return principal
+
+    def put(self, token_pair_id, token, principal, token_expires_at=None) -> None:
+        key = str(token_pair_id)
+        expires_at = time.time() + self.ttl_seconds
+        if token_expires_at:
+            expires_at = min(expires_at, token_expires_at)
+        with self.lock:
+            self.__evict(key)
+            self.entries[key] = (token, principal, expires_at)
+            self.user_pairs.setdefault(str(principal.id), set()).add(key)
+            while len(self.entries) > self.max_size:
+                self.__evict(next(iter(self.entries)))
+
+    def invalidate_token_pair(self, token_pair_id) -> None:
+        invalidation = PrincipalInvalidation.for_token_pair(token_pair_id)
+        self.__apply(invalidation)
+        self.principal_invalidations_repository.create(invalidation)
+
+    def invalidate_user(self, user_id) -> None:
+        invalidation = PrincipalInvalidation.for_user(user_id)
+        self.__apply(invalidation)
+        self.principal_invalidations_repository.create(invalidation)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+            self.user_pairs.clear()
+
+    def __sync(self) -> None:
+        if not self.__is_sync_due(datetime.utcnow()):
+            return
+        if not self.sync_lock.acquire(blocking=False):
+            return
+        try:
+            self.__sync_invalidations()
+        finally:
+            self.sync_lock.release()
+
+    def __is_sync_due(self, now) -> bool:
+        return now - self.synced_at >= timedelta(seconds=self.sync_interval_seconds)
+
+    def __sync_invalidations(self) -> None:
+        now = datetime.utcnow()
+        with self.lock:
+            if not self.__is_sync_due(now):
+                return
+            if now - self.synced_at > timedelta(seconds=self.invalidation_retention_seconds):
+                self.entries.clear()
+                self.user_pairs.clear()
+                applied_invalidations = {}
+                since = now - timedelta(seconds=self.SYNC_OVERLAP_SECONDS)
+            else:
+                applied_invalidations = dict(self.applied_invalidations)
+                since = self.synced_at - timedelta(seconds=self.SYNC_OVERLAP_SECONDS)
+            self.synced_at = now
+
+        invalidations = self.principal_invalidations_repository.find_created_since(since)
+        for invalidation in invalidations:
+            if invalidation.id in applied_invalidations:
+                continue
+            self.__apply(invalidation)
+            applied_invalidations[invalidation.id] = invalidation.created_at
+
+        applied_invalidations = {
+            invalidation_id: created_at
+            for invalidation_id, created_at in applied_invalidations.items()
+            if created_at >= since
+        }
+        with self.lock:
+            self.applied_invalidations = applied_invalidations
+
+    def __apply(self, invalidation) -> None:
+        with self.lock:
+            if invalidation.token_pair_id:
+                self.__evict(invalidation.token_pair_id)
+            if invalidation.user_id:
+                for key in list(self.user_pairs.get(invalidation.user_id, [])):
+                    self.__evict(key)
+
+    def __evict(self, key) -> None:
+        entry = self.entries.pop(key, None)
+        if not entry:
+            return
+        user_id = str(entry[1].id)
+        pairs = self.user_pairs.get(user_id)
+        if pairs is not None:
+            pairs.discard(key)
+            if not pairs:
+                self.user_pairs.pop(user_id)
@@ -0,0 +1,46 @@
+import time
+from collections import OrderedDict
+from threading import Lock
+
+
+class SessionEpochService:
+    def __init__(self, users_repository, ttl_seconds, max_size) -> None:
+        self.users_repository = users_repository
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self.epochs = OrderedDict()
+        self.lock = Lock()
+
+    def get(self, user_id) -> int or None:
+        key = str(user_id)
+        with self.lock:
+            cached = self.epochs.get(key)
+            if cached and cached[1] > time.monotonic():
+                self.epochs.move_to_end(key)
+                return cached[0]
+
+        epoch = self.users_repository.find_session_epoch(key)
+        if epoch is not None:
+            self.store(key, epoch)
+        return epoch
+
+    def bump(self, user_id) -> int or None:
+        key = str(user_id)
+        epoch = self.users_repository.increment_session_epoch(key)
+        if epoch is None:
+            self.forget(key)
+        else:
+            self.store(key, epoch)
+        return epoch
+
+    def forget(self, user_id) -> None:
+        with self.lock:
+            self.epochs.pop(str(user_id), None)
+
+    def store(self, user_id, epoch) -> None:
+        key = str(user_id)
+        with self.lock:
+            self.epochs[key] = (epoch, time.monotonic() + self.ttl_seconds)
+            self.epochs.move_to_end(key)
+            while len(self.epochs) > self.max_size:
+                self.epochs.popitem(last=False)
@@ -0,0 +1,10 @@
+class StatsService:
+    def __init__(self, password_service, pymongo_wrapper) -> None:
+        self.password_service = password_service
+        self.pymongo_wrapper = pymongo_wrapper
+
+    def get(self, principal=None) -> dict:
+        return {
+            'password_hashing': self.password_service.stats(),
+            'mongo_pool': self.pymongo_wrapper.pool_stats()
+        }
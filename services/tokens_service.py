@@ -1,5 +1,8 @@
+import hashlib
 import jwt
 import time
+from collections import OrderedDict
+from threading import Lock
 from jwt.exceptions import (
     InvalidTokenError,
     DecodeError,
@@ -11,10 +14,13 @@ from jwt.exceptions import (
 
 
 class TokensService:
-    def __init__(self, jwt_secret, access_token_ttl, refresh_token_ttl) -> None:
+    def __init__(self, jwt_secret, access_token_ttl, refresh_token_ttl, cache_size=0) -> None:
         self.jwt_secret = jwt_secret
         self.access_token_ttl = access_token_ttl
         self.refresh_token_ttl = refresh_token_ttl
+        self.cache_size = cache_size
+        self.verified = OrderedDict()
+        self.lock = Lock()
 
     def encode(self, token_type, data) -> str:
         iat = time.time()
@@ -32,6 +38,27 @@ class TokensService:
         return token.decode('utf-8')
 
     def decode(self, token) -> dict:
+        if self.cache_size <= 0 or not isinstance(token, str):
+            return self.__verify(token)
+
+        key = hashlib.sha256(token.encode()).digest()
+        now = time.time()
+        with self.lock:
+            cached = self.verified.get(key)
+            if cached and cached['exp'] > now:
+                self.verified.move_to_end(key)
+                return dict(cached)
+            self.verified.pop(key, None)
+
+        payload = self.__verify(token)
+        if payload:
+            with self.lock:
+                self.verified[key] = dict(payload)
+                while len(self.verified) > self.cache_size:
+                    self.verified.popitem(last=False)
+        return payload
+
+    def __verify(self, token) -> dict:
         try:
             payload = jwt.decode(token, self.jwt_secret, algorithms=['HS256'], options={
                 'require_exp': True,
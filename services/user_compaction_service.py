@@ -0,0 +1,34 @@
+import time
+from bson import BSON
+
+
+class UserCompactionService:
+    def __init__(self, users_repository, tokens_service, batch_size, throttle_seconds) -> None:
+        self.users_repository = users_repository
+        self.tokens_service = tokens_service
+        self.batch_size = batch_size
+        self.throttle_seconds = throttle_seconds
+
+    def compact(self) -> dict:
+        report = {'documents': 0, 'bytes': 0}
+        after_id = None
+        while True:
+            batch = self.users_repository.find_compaction_batch(after_id, self.batch_size)
+            if not batch:
+                break
+            user_ids, pair_ids = [], []
+            for user_id, token_pairs in batch:
+                expired_pairs = [pair for pair in token_pairs if self.__is_expired(pair)]
+                if expired_pairs:
+                    user_ids.append(user_id)
+                    pair_ids += [pair.get('id') for pair in expired_pairs]
+                    report['bytes'] += sum(len(BSON.encode(pair)) for pair in expired_pairs)
+            report['documents'] += self.users_repository.pull_token_pairs(user_ids, pair_ids)
+            after_id = batch[-1][0]
+            if len(batch) < self.batch_size:
+                break
+            time.sleep(self.throttle_seconds)
+        return report
+
+    def __is_expired(self, pair) -> bool:
+        return not self.tokens_service.decode(pair.get('refresh_token'))
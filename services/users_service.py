@@ -1,4 +1,5 @@
-from models import User, Page, UserApplication
+import logging
+from models import User, Page, UserApplication, normalize_email
 
 from infrastructure.exceptions import (
     NotFoundException,
@@ -6,12 +7,15 @@ from infrastructure.exceptions import (
     UnauthorizedException
 )
 
+logger = logging.getLogger(__name__)
+
 
 class UsersService:
     def __init__(
             self, users_repository, user_applications_repository, password_service,
             create_user_validator_service, create_admin_validator_service, update_user_validator_service,
-            page_service, email_list_service, user_email_service, user_files_migration_service
+            page_service, email_list_service, user_email_service, user_files_migration_service,
+            principal_cache_service, users_loader
     ) -> None:
         self.users_repository = users_repository
         self.user_applications_repository = user_applications_repository
@@ -26,6 +30,8 @@ class UsersService:
         self.email_list_service = email_list_service
         self.user_email_service = user_email_service
         self.user_files_migration_service = user_files_migration_service
+        self.principal_cache_service = principal_cache_service
+        self.users_loader = users_loader
 
     def create(self, attributes: dict, password_length=8, principal=None) -> UserApplication:
         self.create_user_validator_service.validate(attributes)
@@ -80,26 +86,23 @@ class UsersService:
     def delete(self, user_id: str, principal=None) -> None:
         user = self.__find_user(user_id)
         self.users_repository.delete(user)
+        self.users_loader.evict(user.id)
+        self.principal_cache_service.invalidate_user(user.id)
 
     def update(self, user_id: str, attributes: dict, principal=None) -> User:
         self.update_user_validator_service.validate(attributes)
         user = self.__find_user(user_id)
         self.__check_user_authorization(user_id, principal)
 
-        email_collision = self.users_repository.find_by_email(attributes.get('email'))
-        if email_collision and str(email_collision.id) != user_id:
-            error = {
-                'code': [
-                    {'message': 'Already taken', 'key': 'error_already_taken'}
-                ]
-            }
-            raise InvalidRequestException(error)
+        if normalize_email(attributes.get('email')) != normalize_email(user.email):
+            self.__check_email_collision(attributes.get('email'), user_id)
 
         user.assign_request(attributes)
 
         files = user.profile.get_files()
         self.user_files_migration_service.migrate(files)
         self.users_repository.update(user)
+        self.principal_cache_service.invalidate_user(user.id)
         return user
 
     def find(self, user_id: str, principal=None) -> User:
@@ -107,30 +110,31 @@ class UsersService:
         return user
 
     def get_page(self, paging, role, principal=None) -> Page:
-        return self.page_service.get_page(
+        page = self.page_service.get_page(
             paging,
             self.users_repository.get_page,
             self.users_repository.count,
-            role
+            role,
+            after_func=self.users_repository.get_page_after
         )
+        logger.debug('Users page timings: %s', page.timings)
+        return page
 
     def get_list(self, principal=None) -> list:
         return self.users_repository.get_list()
 
     def find_own(self, principal=None) -> User:
-        return self.users_repository.find_by_id(principal.id)
-
-    def get_principal(self, principal=None) -> User:
-        return principal
+        return self.__find_user(principal.id)
 
     def search(self, paging, query, role, principal=None) -> Page:
-        return self.page_service.get_page(
+        page = self.page_service.get_counted_page(
             paging,
-            self.users_repository.search,
-            self.users_repository.count_for_search,
+            self.users_repository.search_page,
             query,
             role
         )
+        logger.debug('Users search timings: %s', page.timings)
+        return page
 
     def resend_user_confirmation(self, attributes, principal=None) -> None:
         email = attributes.get('email')
@@ -146,11 +150,23 @@ class UsersService:
         self.user_email_service.send_account_details(user, password)
 
     def __find_user(self, user_id) -> User:
-        user = self.users_repository.find_by_id(user_id)
+        user = self.users_loader.load(user_id)
         if not user:
             raise NotFoundException()
         return user
 
+    def __check_email_collision(self, email, user_id) -> None:
+        email_collision = self.users_repository.find_by_email(email)
+        if not email_collision:
+            return
+        if str(email_collision.id) != user_id:
+            error = {
+                'code': [
+                    {'message': 'Already taken', 'key': 'error_already_taken'}
+                ]
+            }
+            raise InvalidRequestException(error)
+
     def __check_user_authorization(self, user_id, principal) -> None:
         if principal.role == 'user' and str(principal.id) != user_id:
             raise UnauthorizedException()
@@ -1,15 +1,29 @@
 from types import LambdaType
+from threading import RLock
+import os
 import string
 from mock import Mock
 from builders import ResponseBuilder
 
 from dependencies import Dependencies
 
-from wrappers import BcryptWrapper, S3Wrapper
+from wrappers import (
+    BcryptWrapper,
+    ScryptWrapper,
+    S3Wrapper,
+    ProcessPoolWrapper,
+    ThreadPoolWrapper,
+    MemoryThrottleStoreWrapper
+)
 
 from repositories import (
     UsersRepository,
-    UserApplicationsRepository
+    UserApplicationsRepository,
+    PrincipalInvalidationsRepository,
+    SessionsRepository,
+    PasswordResetsRepository,
+    IdentityMap,
+    RepositoryLoader
 )
 
 from models import PasswordGenerator, PasswordPartGenerator
@@ -33,6 +47,7 @@ from handlers import (
     ResendUserConfirmationHandler,
     UploadFileToUserHandler,
     SendEnquiryHandler,
+    GetStatsHandler,
 )
 
 from services import (
@@ -40,8 +55,16 @@ from services import (
     PasswordService,
     ValidatorService,
     TokensService,
+    SessionEpochService,
+    PrincipalCacheService,
+    LastVisitService,
+    LoginThrottleService,
+    UserCompactionService,
+    IndexSyncService,
     AuthService,
+    CountCacheService,
     PageService,
+    StatsService,
     EmailListService,
     UserEmailService,
     EmailSendingService,
@@ -56,6 +79,8 @@ from models.translators import (
     ProfileMongoTranslator,
     UploadedFileMongoTranslator,
     UserApplicationMongoTranslator,
+    PrincipalInvalidationMongoTranslator,
+    PrincipalMongoTranslator,
 )
 
 from validators import (
@@ -85,19 +110,19 @@ from presenters import (
     PagePresenter,
     UploadedFilePresenter,
     UserApplicationPresenter,
+    StatsPresenter,
 )
 
 from handlers.auth_decorator import AuthFactory, AuthDecoratorFactory
-from models.factories.mongo_index_factory import MongoIndexFactory, MongoColumnFactory
+from indexes import declare_indexes
 
 auth_factory = AuthFactory()
-index_factory = MongoIndexFactory()
-column_factory = MongoColumnFactory()
 
 
 class Structure:
     def __init__(self, dependencies: Dependencies):
         self.dependencies = dependencies
+        self.lock = RLock()
         self.structure = {
             'response_builder': {
                 'class': ResponseBuilder,
@@ -105,14 +130,52 @@ class Structure:
             },
             'bcrypt_wrapper': {
                 'class': BcryptWrapper,
-                'args': []
+                'args': [
+                    lambda: int(deps.environment_wrapper().get_var('BCRYPT_ROUNDS', '14'))
+                ]
+            },
+            'scrypt_wrapper': {
+                'class': ScryptWrapper,
+                'args': [
+                    lambda: int(deps.environment_wrapper().get_var('SCRYPT_LOG_N', '15'))
+                ]
             },
             'auth_decorator_factory': {
                 'class': AuthDecoratorFactory,
                 'args': [
                     'auth_service',
                     'response_builder',
+                    'last_visit_service',
+                ]
+            },
+            'last_visit_service': {
+                'class': LastVisitService,
+                'args': [
                     lambda: deps.celery(),
+                    lambda: int(deps.environment_wrapper().get_var(
+                        'LAST_VISIT_RESOLUTION_MINUTES', '5')),
+                    lambda: int(deps.environment_wrapper().get_var(
+                        'LAST_VISIT_FLUSH_SECONDS', '10')),
+                    lambda: int(deps.environment_wrapper().get_var(
+                        'LAST_VISIT_BUFFER_SIZE', '500'))
+                ]
+            },
+            'user_compaction_service': {
+                'class': UserCompactionService,
+                'args': [
+                    'users_repository',
+                    'tokens_service',
+                    lambda: int(deps.environment_wrapper().get_var(
+                        'USER_COMPACTION_BATCH_SIZE', '500')),
+                    lambda: float(deps.environment_wrapper().get_var(
+                        'USER_COMPACTION_THROTTLE_SECONDS', '0.1'))
+                ]
+            },
+            'index_sync_service': {
+                'class': IndexSyncService,
+                'args': [
+                    lambda: deps.pymongo_wrapper().get_database(deps.mongo()),
+                    lambda: declare_indexes(deps.environment_wrapper())
                 ]
             },
             'users_repository': {
@@ -121,7 +184,7 @@ class Structure:
                     lambda: self.dependencies.pymongo_wrapper().get_collection(
                         self.dependencies.mongo(), 'users'),
                     'user_mongo_translator',
-                    lambda: []
+                    'principal_mongo_translator'
                 ]
             },
             'user_applications_repository': {
@@ -129,10 +192,41 @@ class Structure:
                 'args': [
                     lambda: self.dependencies.pymongo_wrapper().get_collection(
                         self.dependencies.mongo(), 'user_applications'),
-                    'user_application_mongo_translator',
-                    lambda: []
+                    'user_application_mongo_translator'
+                ]
+            },
+            'sessions_repository': {
+                'class': SessionsRepository,
+                'args': [
+                    lambda: self.dependencies.pymongo_wrapper().get_collection(
+                        self.dependencies.mongo(), 'sessions'),
+                    'tokens_pair_mongo_translator'
                 ]
             },
+            'password_resets_repository': {
+                'class': PasswordResetsRepository,
+                'args': [
+                    lambda: self.dependencies.pymongo_wrapper().get_collection(
+                        self.dependencies.mongo(), 'password_resets'),
+                    'password_reset_request_mongo_translator'
+                ]
+            },
+            'principal_invalidations_repository': {
+                'class': PrincipalInvalidationsRepository,
+                'args': [
+                    lambda: self.dependencies.pymongo_wrapper().get_collection(
+                        self.dependencies.mongo(), 'principal_invalidations'),
+                    'principal_invalidation_mongo_translator'
+                ]
+            },
+            'principal_invalidation_mongo_translator': {
+                'class': PrincipalInvalidationMongoTranslator,
+                'args': []
+            },
+            'principal_mongo_translator': {
+                'class': PrincipalMongoTranslator,
+                'args': []
+            },
             'profile_mongo_translator': {
                 'class': ProfileMongoTranslator,
                 'args': [
@@ -142,8 +236,6 @@ class Structure:
             'user_mongo_translator': {
                 'class': UserMongoTranslator,
                 'args': [
-                    'tokens_pair_mongo_translator',
-                    'password_reset_request_mongo_translator',
                     'profile_mongo_translator'
                 ]
             },
@@ -192,8 +284,25 @@ class Structure:
             'password_service': {
                 'class': PasswordService,
                 'args': [
-                    'bcrypt_wrapper',
-                    'password_generator'
+                    [
+                        'bcrypt_wrapper',
+                        'scrypt_wrapper'
+                    ],
+                    lambda: deps.environment_wrapper().get_var('PASSWORD_HASHER', 'bcrypt'),
+                    'password_generator',
+                    'password_hashing_pool_wrapper'
+                ]
+            },
+            'password_hashing_pool_wrapper': {
+                'class': ProcessPoolWrapper,
+                'args': [
+                    lambda: int(deps.environment_wrapper().get_var(
+                        'PASSWORD_HASHING_WORKERS', str(max((os.cpu_count() or 1) // int(
+                            deps.environment_wrapper().get_var('WEB_CONCURRENCY', '4')), 1)))),
+                    lambda: int(deps.environment_wrapper().get_var(
+                        'PASSWORD_HASHING_QUEUE_LIMIT', '8')),
+                    lambda: int(deps.environment_wrapper().get_var('GUNICORN_THREADS', '8')) - int(
+                        deps.environment_wrapper().get_var('PASSWORD_HASHING_THREAD_RESERVE', '2'))
                 ]
             },
             'email_presence_validator': {
@@ -293,7 +402,9 @@ class Structure:
                     lambda: int(deps.environment_wrapper().get_var(
                         'JWT_ACCESS_TTL_MINUTES')),
                     lambda: int(deps.environment_wrapper().get_var(
-                        'JWT_REFRESH_TTL_HOURS'))
+                        'JWT_REFRESH_TTL_HOURS')),
+                    lambda: int(deps.environment_wrapper().get_var(
+                        'JWT_DECODE_CACHE_SIZE', '10000'))
                 ]
             },
             'users_service': {
@@ -308,18 +419,87 @@ class Structure:
                     'page_service',
                     'email_list_service_mocking',
                     'user_email_service',
-                    'user_file_migration_service'
+                    'user_file_migration_service',
+                    'principal_cache_service',
+                    'users_loader'
+                ]
+            },
+            'identity_map': {
+                'class': IdentityMap,
+                'args': []
+            },
+            'users_loader': {
+                'class': RepositoryLoader,
+                'args': [
+                    'users_repository',
+                    'identity_map',
+                    lambda: 'users'
                 ]
             },
             'auth_service': {
                 'class': AuthService,
                 'args': [
                     'users_repository',
+                    'sessions_repository',
+                    'password_resets_repository',
                     'password_service',
                     'tokens_service',
                     'user_email_service',
                     'password_reset_validation_service',
-                    'password_change_validation_service'
+                    'password_change_validation_service',
+                    'session_epoch_service',
+                    'principal_cache_service',
+                    'login_throttle_service',
+                    'users_loader',
+                    lambda: deps.environment_wrapper().get_var(
+                        'JWT_STATELESS_AUTH', 'false').lower() == 'true',
+                    lambda: int(deps.environment_wrapper().get_var('MAX_SESSIONS_PER_USER', '10'))
+                ]
+            },
+            'login_throttle_service': {
+                'class': LoginThrottleService,
+                'args': [
+                    'login_throttle_store_wrapper',
+                    lambda: int(deps.environment_wrapper().get_var(
+                        'LOGIN_THROTTLE_MAX_FAILURES', '5')),
+                    lambda: int(deps.environment_wrapper().get_var(
+                        'LOGIN_THROTTLE_MAX_IP_FAILURES', '100')),
+                    lambda: int(deps.environment_wrapper().get_var(
+                        'LOGIN_THROTTLE_WINDOW_SECONDS', '900'))
+                ]
+            },
+            'login_throttle_store_wrapper': {
+                'class': MemoryThrottleStoreWrapper,
+                'args': [
+                    lambda: int(deps.environment_wrapper().get_var(
+                        'LOGIN_THROTTLE_MAX_KEYS', '100000')),
+                    lambda: max(
+                        int(deps.environment_wrapper().get_var('LOGIN_THROTTLE_MAX_FAILURES', '5')),
+                        int(deps.environment_wrapper().get_var('LOGIN_THROTTLE_MAX_IP_FAILURES', '100')))
+                ]
+            },
+            'session_epoch_service': {
+                'class': SessionEpochService,
+                'args': [
+                    'users_repository',
+                    lambda: int(deps.environment_wrapper().get_var(
+                        'JWT_EPOCH_CACHE_TTL_SECONDS', '30')),
+                    lambda: int(deps.environment_wrapper().get_var(
+                        'JWT_EPOCH_CACHE_SIZE', '10000'))
+                ]
+            },
+            'principal_cache_service': {
+                'class': PrincipalCacheService,
+                'args': [
+                    'principal_invalidations_repository',
+                    lambda: int(deps.environment_wrapper().get_var(
+                        'PRINCIPAL_CACHE_TTL_SECONDS', '60')),
+                    lambda: int(deps.environment_wrapper().get_var(
+                        'PRINCIPAL_CACHE_SIZE', '10000')),
+                    lambda: int(deps.environment_wrapper().get_var(
+                        'PRINCIPAL_CACHE_SYNC_SECONDS', '1')),
+                    lambda: int(deps.environment_wrapper().get_var(
+                        'PRINCIPAL_INVALIDATION_RETENTION_SECONDS', '3600'))
                 ]
             },
             'reset_password_handler': {
@@ -405,9 +585,27 @@ class Structure:
                     'tokens_presenter'
                 ]
             },
+            'count_cache_service': {
+                'class': CountCacheService,
+                'args': [
+                    lambda: int(deps.environment_wrapper().get_var('PAGE_COUNT_CACHE_TTL_SECONDS', '30')),
+                    lambda: int(deps.environment_wrapper().get_var('PAGE_COUNT_CACHE_MAX_SIZE', '1000'))
+                ]
+            },
+            'page_query_pool_wrapper': {
+                'class': ThreadPoolWrapper,
+                'args': [
+                    lambda: int(deps.environment_wrapper().get_var('PAGE_QUERY_WORKERS', '4'))
+                ]
+            },
             'page_service': {
                 'class': PageService,
-                'args': []
+                'args': [
+                    'count_cache_service',
+                    'page_query_pool_wrapper',
+                    lambda: int(deps.environment_wrapper().get_var('PAGE_MAX_SIZE', '100')),
+                    lambda: int(deps.environment_wrapper().get_var('PAGE_MAX_OFFSET', '10000'))
+                ]
             },
             'create_user_handler': {
                 'class': CreateUserHandler,
@@ -662,6 +860,30 @@ class Structure:
                     'send_enquiry_handler',
                     auth_factory.liberal()
                 ),
+            'stats_service': {
+                'class': StatsService,
+                'args': [
+                    'password_service',
+                    lambda: deps.pymongo_wrapper()
+                ]
+            },
+            'stats_presenter': {
+                'class': StatsPresenter,
+                'args': []
+            },
+            'get_stats_handler': {
+                'class': GetStatsHandler,
+                'args': [
+                    'stats_service',
+                    'response_builder',
+                    'stats_presenter'
+                ]
+            },
+            'get_stats_auth_handler':
+                lambda: self.decorate_auth_handler(
+                    'get_stats_handler',
+                    auth_factory.strict(['admin'])
+                ),
             'enquiry_email_service': {
                 'class': EnquiryEmailService,
                 'args': [
@@ -677,25 +899,35 @@ class Structure:
         handler = self.instantiate(handler_key)
         return factory.decorate(handler, policy)
 
+    def reset(self):
+        self.lock = RLock()
+        for key in self.structure:
+            if key in self.__dict__:
+                delattr(self, key)
+
     def instantiate(self, key):
         if hasattr(self, key):
             return getattr(self, key)
 
-        element = self.structure[key]
-        result = None
+        with self.lock:
+            if hasattr(self, key):
+                return getattr(self, key)
+
+            element = self.structure[key]
+            result = None
 
-        if isinstance(element, dict):
-            args = [self.__instantiate_arg(arg) for arg in element.get('args', [])]
-            kwargs = {}
-            for key in element.get('kwargs', {}):
-                kwargs[key] = self.__instantiate_arg(element['kwargs'][key])
-            result = element['class'](*args, **kwargs)
-        elif isinstance(element, LambdaType):
-            result = element()
+            if isinstance(element, dict):
+                args = [self.__instantiate_arg(arg) for arg in element.get('args', [])]
+                kwargs = {}
+                for key in element.get('kwargs', {}):
+                    kwargs[key] = self.__instantiate_arg(element['kwargs'][key])
+                result = element['class'](*args, **kwargs)
+            elif isinstance(element, LambdaType):
+                result = element()
 
-        setattr(self, key, result)
+            setattr(self, key, result)
 
-        return getattr(self, key)
+            return getattr(self, key)
 
     def __instantiate_arg(self, arg):
         if isinstance(arg, str):
@@ -714,3 +946,4 @@ class Structure:
 
 deps = Dependencies()
 structure = Structure(deps)
+os.register_at_fork(after_in_child=structure.reset)
@@ -0,0 +1,16 @@
+import sys
+from structure import structure
+
+
+prune = '--prune' in sys.argv
+dry_run = '--dry-run' in sys.argv
+index_sync_service = structure.instantiate('index_sync_service')
+
+actions = index_sync_service.plan(prune)
+for action, collection_name, name, _ in actions:
+    print(f'{action} - {collection_name}.{name}')
+if not actions:
+    print('Indexes are up to date')
+
+if not dry_run:
+    index_sync_service.apply(actions)
@@ -5,7 +5,7 @@ from app import app
 from tests.factories import UserFactory
 from models import TokenPair, PasswordResetRequest
 from mock import Mock, patch
-from datetime import timedelta
+from datetime import datetime, timedelta
 
 
 class TestAuthBlueprint:
@@ -16,21 +16,24 @@ class TestAuthBlueprint:
         self.factory = UserFactory()
         self.tokens_service = structure.instantiate('tokens_service')
         self.users_repository = structure.instantiate('users_repository')
+        self.sessions_repository = structure.instantiate('sessions_repository')
+        self.password_resets_repository = structure.instantiate('password_resets_repository')
         self.user_email_service = structure.instantiate('user_email_service')
         self.user_email_service.celery = Mock()
         self.celery_mock = self.user_email_service.celery
 
     def teardown(self):
         self.context.pop()
+        self.users_repository.delete_all()
+        self.sessions_repository.delete_all()
+        self.password_resets_repository.delete_all()
 
     def auth_headers(self):
         auth_service = structure.instantiate('auth_service')
         self.principal.id = self.users_repository.create(self.principal)
-        self.principal.token_pairs.append(
-            auth_service.login(self.principal.email, 'Qq12345!')
-        )
+        token_pair = auth_service.login(self.principal.email, 'Qq12345!')
         return {
-            'Authorization': 'token ' + self.principal.token_pairs[0].access
+            'Authorization': 'token ' + token_pair.access
         }
 
     def test_matching_credentials_login(self):
@@ -42,10 +45,15 @@ class TestAuthBlueprint:
             '/v1/auth/login', json=json_body, content_type='application/json')
         assert response.status_code == 200
         response_body = response.json
-        updated_user = self.users_repository.find_by_id(user.id)
-        assert len(updated_user.token_pairs) == 1
-        assert updated_user.token_pairs[0].access == response_body['access']
-        assert updated_user.token_pairs[0].refresh == response_body['refresh']
+        sessions = self.sessions_repository.collection.find({'user_id': user.id})
+        sessions = [self.sessions_repository.model_translator.from_document(d) for d in sessions]
+        assert len(sessions) == 1
+        assert sessions[0].access_digest == TokenPair.digest(response_body['access'])
+        assert sessions[0].refresh_digest == TokenPair.digest(response_body['refresh'])
+        document = self.sessions_repository.collection.find_one({'user_id': user.id})
+        assert 'access_token' not in document
+        assert 'refresh_token' not in document
+        assert sessions[0].expires_at is not None
         for key in ['access', 'refresh']:
             payload = self.tokens_service.decode(response_body[key])
             assert 'id' in payload
@@ -61,23 +69,17 @@ class TestAuthBlueprint:
     def test_successful_refresh(self):
         user = self.factory.generic('student', password='123456')
         user.id = self.users_repository.create(user)
-        claims = {'id': str(ObjectId()), 'user_id': str(user.id)}
-        access = self.tokens_service.encode('access', claims)
-        refresh = self.tokens_service.encode('refresh', claims)
-        user.token_pairs.append(TokenPair(claims['id'], access, refresh))
-        self.users_repository.update(user)
-        json_body = {'refresh_token': user.token_pairs[0].refresh}
+        pair = self.generate_token_pair(user)
+        json_body = {'refresh_token': pair.refresh}
         response = self.client.post(
             '/v1/auth/refresh', json=json_body, content_type='application/json')
         assert response.status_code == 200
         response_body = response.json
-        updated_user = self.users_repository.find_by_id(user.id)
-        assert len(updated_user.token_pairs) == 1
-        assert updated_user.token_pairs[0].access == response_body['access']
-        assert updated_user.token_pairs[0].refresh == response_body['refresh']
-        assert updated_user.token_pairs[0].refresh == user.token_pairs[0].refresh
-        # returns the same pair if access is valid
-        assert access == response_body['access']
+        session = self.sessions_repository.find_for_user(pair.id, user.id)
+        assert session.access_digest == TokenPair.digest(response_body['access'])
+        assert session.refresh_digest == TokenPair.digest(response_body['refresh'])
+        assert response_body['refresh'] == pair.refresh
+        assert session.refreshed_at is not None
 
     def test_refresh_with_invalid_token(self):
         json_body = {'refresh_token': 'token'}
@@ -99,25 +101,32 @@ class TestAuthBlueprint:
         user = self.factory.generic('student', password='123456')
         user.id = self.users_repository.create(user)
 
-        self.generate_token_pairs(user)
-        self.generate_token_pairs(user)
+        first_pair = self.generate_token_pair(user)
+        second_pair = self.generate_token_pair(user)
 
-        headers = {"authorization": f"Token {user.token_pairs[1].access}"}
+        headers = {"authorization": f"Token {second_pair.access}"}
 
         response = self.client.post(
             '/v1/auth/logout', headers=headers, content_type='application/json')
         assert response.status_code == 200
 
-        updated_user = self.users_repository.find_by_id(user.id)
-        assert len(updated_user.token_pairs) == 1
-        assert updated_user.token_pairs[0].access == user.token_pairs[0].access
+        assert self.sessions_repository.find_for_user(second_pair.id, user.id) is None
+        assert self.sessions_repository.find_for_user(first_pair.id, user.id) is not None
 
-    def generate_token_pairs(self, user):
-        claims = {'id': str(ObjectId()), 'user_id': str(user.id)}
+    def create_password_reset(self, user, created_at=None):
+        reset_request = PasswordResetRequest(user.id)
+        if created_at:
+            reset_request.created_at = created_at
+        self.password_resets_repository.replace_for_user(reset_request)
+        return reset_request
+
+    def generate_token_pair(self, user):
+        claims = {'id': str(ObjectId()), 'user_id': str(user.id), 'epoch': 0}
         access = self.tokens_service.encode('access', claims)
         refresh = self.tokens_service.encode('refresh', claims)
-        user.token_pairs.append(TokenPair(claims['id'], access, refresh))
-        self.users_repository.update(user)
+        pair = TokenPair(ObjectId(claims['id']), access, refresh, user.id, datetime.utcnow() + timedelta(days=1))
+        self.sessions_repository.create(pair)
+        return pair
 
     def test_request_forgot_password(self):
         user = self.factory.generic('student', password='123456')
@@ -130,8 +139,8 @@ class TestAuthBlueprint:
         response = self.client.post('/v1/auth/forgot_password', json=json_body, content_type='application/json')
         assert response.status_code == 200
         assert response.json == {}
-        updated_user = self.users_repository.find_by_id(user.id)
-        assert len(updated_user.password_reset_requests) > 0
+        reset_documents = list(self.password_resets_repository.collection.find({'user_id': user.id}))
+        assert len(reset_documents) == 1
         self.celery_mock.send_task.assert_called_once()
 
     def test_request_forgot_password_missing_user(self):
@@ -147,13 +156,13 @@ class TestAuthBlueprint:
 
     def test_reset_password_valid(self):
         user = self.factory.generic('student', password='123456')
-        user.password_reset_requests = [PasswordResetRequest()]
         user.id = self.users_repository.create(user)
+        reset_request = self.create_password_reset(user)
 
         json_body = {
             'new_password': 'qweQWE123',
             'password_confirmation': 'qweQWE123',
-            'code': user.password_reset_requests[0].code,
+            'code': reset_request.code,
             'email': user.email
         }
         response = self.client.post('/v1/auth/reset_password', json=json_body, content_type='application/json')
@@ -161,16 +170,17 @@ class TestAuthBlueprint:
         password_service = structure.instantiate('password_service')
         updated_user = self.users_repository.find_by_id(user.id)
         assert password_service.check('qweQWE123', updated_user.password_hash)
+        assert self.password_resets_repository.find_by_code(reset_request.code) is None
 
     def test_reset_password_wrong_email(self):
         user = self.factory.generic('student', password='123456')
-        user.password_reset_requests = [PasswordResetRequest()]
         user.id = self.users_repository.create(user)
+        reset_request = self.create_password_reset(user)
 
         json_body = {
             'new_password': 'qweQWE123',
             'password_confirmation': 'qweQWE123',
-            'code': user.password_reset_requests[0].code,
+            'code': reset_request.code,
             'email': "email@test.com"
         }
         response = self.client.post('/v1/auth/reset_password', json=json_body, content_type='application/json')
@@ -181,14 +191,13 @@ class TestAuthBlueprint:
 
     def test_reset_password_expired(self):
         user = self.factory.generic('student', password='123456')
-        user.password_reset_requests = [PasswordResetRequest()]
-        user.password_reset_requests[0].created_at = user.password_reset_requests[0].created_at + timedelta(days=-3)
         user.id = self.users_repository.create(user)
+        reset_request = self.create_password_reset(user, datetime.utcnow() + timedelta(days=-3))
 
         json_body = {
             'new_password': 'qweQWE123',
             'password_confirmation': 'qweQWE123',
-            'code': user.password_reset_requests[0].code,
+            'code': reset_request.code,
             'old_password': '123456'
         }
         response = self.client.post('/v1/auth/reset_password', json=json_body, content_type='application/json')
@@ -201,13 +210,13 @@ class TestAuthBlueprint:
 
     def test_reset_password_mismatch(self):
         user = self.factory.generic('student', password='123456')
-        user.password_reset_requests = [PasswordResetRequest()]
         user.id = self.users_repository.create(user)
+        reset_request = self.create_password_reset(user)
 
         json_body = {
             'new_password': 'qweQWE123',
             'password_confirmation': 'qweQWE1234',
-            'code': user.password_reset_requests[0].code,
+            'code': reset_request.code,
             'old_password': '123456'
         }
         response = self.client.post('/v1/auth/reset_password', json=json_body, content_type='application/json')
@@ -0,0 +1,41 @@
+from app import app
+from structure import structure
+from tests.factories import UserFactory
+
+
+class TestStatsBlueprint:
+    def setup(self):
+        self.client = app.test_client()
+        self.context = app.app_context()
+        self.context.push()
+        self.user_factory = UserFactory()
+        self.users_repository = structure.instantiate('users_repository')
+
+    def teardown(self):
+        self.users_repository.delete_all()
+        self.context.pop()
+
+    def auth_headers(self, role):
+        principal = self.user_factory.generic(role)
+        principal.id = self.users_repository.create(principal)
+        token_pair = structure.instantiate('auth_service').login(principal.email, 'Qq12345!')
+        return {
+            'Authorization': 'token ' + token_pair.access
+        }
+
+    def test_get_stats(self):
+        response = self.client.get('/v1/stats', headers=self.auth_headers('admin'))
+
+        assert response.status_code == 200
+        assert response.json['password_hashing']['rejected'] >= 0
+        assert response.json['mongo_pool']['checked_out'] >= 0
+
+    def test_get_stats_anonymous(self):
+        response = self.client.get('/v1/stats')
+
+        assert response.status_code == 401
+
+    def test_get_stats_by_user(self):
+        response = self.client.get('/v1/stats', headers=self.auth_headers('user'))
+
+        assert response.status_code == 403
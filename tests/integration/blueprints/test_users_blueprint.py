@@ -18,6 +18,7 @@ class TestUsersBlueprint:
         self.faker = Faker()
         self.user_factory = UserFactory()
         self.users_repository = structure.instantiate('users_repository')
+        self.sessions_repository = structure.instantiate('sessions_repository')
         self.user_applications_repository = structure.instantiate('user_applications_repository')
         self.principal = self.user_factory.generic('admin')
         # self.email_list_service = structure.instantiate('email_list_service')
@@ -39,27 +40,22 @@ class TestUsersBlueprint:
 
         self.context.pop()
         self.users_repository.delete_all()
+        self.sessions_repository.delete_all()
         self.user_applications_repository.delete_all()
 
     def auth_headers(self):
         auth_service = structure.instantiate('auth_service')
         self.principal.id = self.users_repository.create(self.principal)
-        self.principal.token_pairs.append(
-            auth_service.login(self.principal.email, 'Qq12345!')
-        )
-        self.users_repository.update(self.principal)
+        token_pair = auth_service.login(self.principal.email, 'Qq12345!')
         return {
-            'Authorization': 'token ' + self.principal.token_pairs[0].access
+            'Authorization': 'token ' + token_pair.access
         }
 
     def auth_headers_user(self, user):
         auth_service = structure.instantiate('auth_service')
-        user.token_pairs.append(
-            auth_service.login(user.email, 'Qq12345!')
-        )
-        self.users_repository.update(user)
+        token_pair = auth_service.login(user.email, 'Qq12345!')
         return {
-            'Authorization': 'token ' + user.token_pairs[0].access
+            'Authorization': 'token ' + token_pair.access
         }
 
     def test_create_user_valid(self):
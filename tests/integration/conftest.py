@@ -0,0 +1,9 @@
+import pytest
+
+from structure import structure
+
+
+@pytest.fixture(scope='session', autouse=True)
+def sync_indexes():
+    index_sync_service = structure.instantiate('index_sync_service')
+    index_sync_service.apply(index_sync_service.plan())
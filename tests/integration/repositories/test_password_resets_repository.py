@@ -0,0 +1,62 @@
+import os
+
+import pymongo
+from bson import ObjectId
+
+from models import PasswordResetRequest
+from structure import structure
+password_resets_repository = structure.instantiate('password_resets_repository')
+
+
+class TestPasswordResetsRepository:
+    def setup(self):
+        scheme = os.environ['MONGO_SCHEME']
+        username = os.environ['MONGO_USERNAME']
+        password = os.environ['MONGO_PASSWORD']
+        host = os.environ['MONGO_HOST']
+        port = os.environ['MONGO_PORT']
+        name = os.environ['MONGO_NAME']
+        url = f'{scheme}://{username}:{password}@{host}:{port}'
+        self.client = pymongo.MongoClient(url)
+        self.collection = self.client[name]['password_resets']
+
+        self.repository = password_resets_repository
+
+    def teardown(self):
+        self.collection.delete_many({})
+        self.client.close()
+
+    def test_replace_for_user(self):
+        user_id = ObjectId()
+        first = PasswordResetRequest(user_id)
+        second = PasswordResetRequest(user_id)
+
+        self.repository.replace_for_user(first)
+        self.repository.replace_for_user(second)
+
+        documents = list(self.collection.find({'user_id': user_id}))
+        assert len(documents) == 1
+        assert documents[0]['code'] == second.code
+
+    def test_replace_for_user_regenerates_duplicate_code(self):
+        first = PasswordResetRequest(ObjectId())
+        self.repository.replace_for_user(first)
+        second = PasswordResetRequest(ObjectId())
+        second.code = first.code
+
+        self.repository.replace_for_user(second)
+
+        assert second.code != first.code
+        assert self.collection.count_documents({}) == 2
+
+    def test_find_by_code_and_consume(self):
+        reset_request = PasswordResetRequest(ObjectId())
+        self.repository.replace_for_user(reset_request)
+
+        result = self.repository.find_by_code(reset_request.code)
+
+        assert result.id == reset_request.id
+        assert result.user_id == reset_request.user_id
+        assert self.repository.consume(result) is True
+        assert self.repository.consume(result) is False
+        assert self.repository.find_by_code(reset_request.code) is None
@@ -3,7 +3,7 @@ import os
 import pymongo
 from bson import ObjectId
 
-from models import User, Profile
+from models import User, Profile, Principal
 from tests.factories import UserFactory
 from structure import structure
 users_repository = structure.instantiate('users_repository')
@@ -35,8 +35,6 @@ class TestUsersRepository:
         user.phone_number = '+1234567890'
         user.role = 'user'
         user.password_hash = b'my top secret'
-        user.token_pairs = []
-        user.password_reset_requests = []
         user_profile = Profile()
         user_profile.first_name = 'John'
         user_profile.last_name = 'Doe'
@@ -51,7 +49,6 @@ class TestUsersRepository:
         assert user_from_db['email'] == user.email
         assert user_from_db['role'] == user.role
         assert user_from_db['password_hash'] == user.password_hash
-        assert user_from_db['token_pairs'] == user.token_pairs
         assert user_from_db['profile']['first_name'] == user.profile.first_name
         assert user_from_db['profile']['last_name'] == user.profile.last_name
 
@@ -62,11 +59,28 @@ class TestUsersRepository:
 
         assert result is None
 
-    def test_find_password_reset(self):
-        code = 'test_code'
-        result = self.repository.find_password_reset(code)
+    def test_find_principal_by_email(self):
+        user = self.factory.generic('admin')
+        user_id = self.repository.create(user)
 
-        assert result is None
+        result = self.repository.find_principal_by_email(user.email.upper(), with_password_hash=True)
+
+        assert isinstance(result, Principal) is True
+        assert result.id == user_id
+        assert result.role == 'admin'
+        assert result.email == user.email
+        assert result.session_epoch == 0
+        assert result.password_hash == user.password_hash
+
+    def test_find_principal_by_id_without_password_hash(self):
+        user = self.factory.generic('user')
+        user_id = self.repository.create(user)
+
+        result = self.repository.find_principal_by_id(str(user_id))
+
+        assert result.id == user_id
+        assert result.password_hash is None
+        assert self.repository.find_principal_by_id(str(ObjectId())) is None
 
     def test_find_by_email(self):
         user = User()
@@ -75,8 +89,6 @@ class TestUsersRepository:
         user.phone_number = '+1234567890'
         user.role = 'user'
         user.password_hash = b'my top secret'
-        user.token_pairs = []
-        user.password_reset_requests = []
         user_profile = Profile()
         user_profile.first_name = 'John'
         user_profile.last_name = 'Doe'
@@ -91,9 +103,9 @@ class TestUsersRepository:
         assert isinstance(result, User) is True
         assert result.id == user_id
         assert result.email == user.email
+        assert self.repository.find_by_email(' MY@Example.com ').id == user_id
         assert result.role == user.role
         assert result.password_hash == user.password_hash
-        assert result.token_pairs == user.token_pairs
         assert result.profile.first_name == user.profile.first_name
         assert result.profile.last_name == user.profile.last_name
 
@@ -139,8 +151,6 @@ class TestUsersRepository:
         user1.email = 'my1@example.com'
         user1.role = 'user'
         user1.password_hash = b'my top secret'
-        user1.token_pairs = []
-        user1.password_reset_requests = []
         user_profile = Profile()
         user_profile.first_name = 'John'
         user_profile.last_name = 'Doe'
@@ -154,8 +164,6 @@ class TestUsersRepository:
         user2.email = 'my1@example.com'
         user2.role = 'user'
         user2.password_hash = b'my top secret'
-        user2.token_pairs = []
-        user2.password_reset_requests = []
         user_profile = Profile()
         user_profile.first_name = 'Jane'
         user_profile.last_name = 'Miller'
@@ -169,7 +177,7 @@ class TestUsersRepository:
         query = user1.profile.first_name
         role = user1.role
 
-        result = self.repository.search(skip, limit, query, role)
+        result, _ = self.repository.search_page(skip, limit, None, query, role)
 
         assert isinstance(result, list) is True
         assert len(result) == 1
@@ -182,8 +190,6 @@ class TestUsersRepository:
         user1.email = 'my1@example.com'
         user1.role = 'user'
         user1.password_hash = b'my top secret'
-        user1.token_pairs = []
-        user1.password_reset_requests = []
         user_profile = Profile()
         user_profile.first_name = 'John'
         user_profile.last_name = 'Doe'
@@ -197,8 +203,6 @@ class TestUsersRepository:
         user2.email = 'my1@example.com'
         user2.role = 'user'
         user2.password_hash = b'my top secret'
-        user2.token_pairs = []
-        user2.password_reset_requests = []
         user_profile = Profile()
         user_profile.first_name = 'Jane'
         user_profile.last_name = 'Miller'
@@ -212,7 +216,7 @@ class TestUsersRepository:
         query = 'ane mil'
         role = user1.role
 
-        result = self.repository.search(skip, limit, query, role)
+        result, _ = self.repository.search_page(skip, limit, None, query, role)
 
         assert isinstance(result, list) is True
         assert len(result) == 1
@@ -225,7 +229,33 @@ class TestUsersRepository:
         query = 'ane mil'
         role = 'user'
 
-        result = self.repository.search(skip, limit, query, role)
+        result, _ = self.repository.search_page(skip, limit, None, query, role)
 
         assert isinstance(result, list) is True
         assert len(result) == 0
+
+    def test_search_page(self):
+        user_ids = []
+        for index in range(3):
+            user = User()
+            user.id = ObjectId()
+            user.email = f'doe{index}@example.com'
+            user.role = 'user'
+            user.password_hash = b'my top secret'
+            user_profile = Profile()
+            user_profile.first_name = 'John'
+            user_profile.last_name = 'Doe'
+            user.profile = user_profile
+            user_ids.append(self.collection.insert_one(
+                self.repository.model_translator.to_document(user)
+            ).inserted_id)
+
+        result, total = self.repository.search_page(0, 2, None, 'john', 'user')
+
+        assert total == 3
+        assert [user.id for user in result] == [user_ids[2], user_ids[1]]
+
+        result, total = self.repository.search_page(0, 2, user_ids[1], 'john', 'user')
+
+        assert total == 3
+        assert [user.id for user in result] == [user_ids[0]]
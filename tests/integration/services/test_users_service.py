@@ -45,7 +45,6 @@ class TestUsersService:
         assert result.items[0].email == third_user.email
         assert result.items[0].role == third_user.role
         assert result.items[0].password_hash == third_user.password_hash
-        assert result.items[0].token_pairs == third_user.token_pairs
         assert result.items[0].profile.first_name == third_user.profile.first_name
         assert result.items[0].profile.last_name == third_user.profile.last_name
 
@@ -54,10 +53,31 @@ class TestUsersService:
         assert result.items[1].email == second_user.email
         assert result.items[1].role == second_user.role
         assert result.items[1].password_hash == second_user.password_hash
-        assert result.items[1].token_pairs == second_user.token_pairs
         assert result.items[1].profile.first_name == second_user.profile.first_name
         assert result.items[1].profile.last_name == second_user.profile.last_name
 
+    def test_get_page_by_cursor(self):
+        users = []
+        for _ in range(3):
+            user = self.factory.generic('user')
+            user.id = self.repository.create(user)
+            users.append(user)
+
+        paging = Paging()
+        paging.page = 1
+        paging.page_size = 2
+
+        first_page = self.service.get_page(paging, 'user')
+
+        assert [item.id for item in first_page.items] == [users[2].id, users[1].id]
+        assert first_page.next_cursor is not None
+
+        paging.cursor = first_page.next_cursor
+        second_page = self.service.get_page(paging, 'user')
+
+        assert [item.id for item in second_page.items] == [users[0].id]
+        assert second_page.next_cursor is None
+
     def test_search_by_query_email(self):
         first_user = self.factory.generic('user')
         first_user.id = self.repository.create(first_user)
@@ -86,7 +106,6 @@ class TestUsersService:
         assert result.items[0].email == first_user.email
         assert result.items[0].role == first_user.role
         assert result.items[0].password_hash == first_user.password_hash
-        assert result.items[0].token_pairs == first_user.token_pairs
         assert result.items[0].profile.first_name == first_user.profile.first_name
         assert result.items[0].profile.last_name == first_user.profile.last_name
 
@@ -118,7 +137,6 @@ class TestUsersService:
         assert result.items[0].email == third_user.email
         assert result.items[0].role == third_user.role
         assert result.items[0].password_hash == third_user.password_hash
-        assert result.items[0].token_pairs == third_user.token_pairs
         assert result.items[0].profile.first_name == third_user.profile.first_name
         assert result.items[0].profile.last_name == third_user.profile.last_name
 
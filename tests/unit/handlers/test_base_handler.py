@@ -0,0 +1,41 @@
+from flask import Flask, request
+from mock import Mock
+from werkzeug.middleware.proxy_fix import ProxyFix
+
+from handlers.base_handler import BaseHandler
+
+
+class TestBaseHandler:
+    def setup(self):
+        self.handler = BaseHandler(Mock(), None)
+        self.app = Flask(__name__)
+        self.app.wsgi_app = ProxyFix(self.app.wsgi_app, x_for=1)
+
+        @self.app.route('/ip')
+        def ip():
+            return self.handler.client_ip(request) or ''
+
+        self.client = self.app.test_client()
+
+    def test_client_ip_uses_proxy_hop(self):
+        response = self.client.get(
+            '/ip',
+            headers={'X-Forwarded-For': '203.0.113.7'},
+            environ_base={'REMOTE_ADDR': '127.0.0.1'}
+        )
+
+        assert response.data == b'203.0.113.7'
+
+    def test_client_ip_ignores_spoofed_forwarded_for(self):
+        response = self.client.get(
+            '/ip',
+            headers={'X-Forwarded-For': '198.51.100.1, 203.0.113.7'},
+            environ_base={'REMOTE_ADDR': '127.0.0.1'}
+        )
+
+        assert response.data == b'203.0.113.7'
+
+    def test_client_ip_without_proxy(self):
+        response = self.client.get('/ip', environ_base={'REMOTE_ADDR': '203.0.113.9'})
+
+        assert response.data == b'203.0.113.9'
@@ -27,6 +27,37 @@ class TestIndexFactory:
         assert 'mock_name' in index_document.get('key').items()[0]
         assert 1 in index_document.get('key').items()[0]
 
+    def test_create_unique(self):
+        self.column_mock.name = 'code'
+        self.column_mock.sorting_order = 1
+
+        result = self.factory.create_unique([self.column_mock])
+
+        index_document = result[0].document
+        assert index_document['name'] == 'code'
+        assert index_document['unique'] is True
+        assert 'partialFilterExpression' not in index_document
+
+    def test_create_unique_partial(self):
+        self.column_mock.name = 'normalized_email'
+        self.column_mock.sorting_order = 1
+        partial_filter = {'normalized_email': {'$type': 'string'}}
+
+        result = self.factory.create_unique([self.column_mock], partial_filter)
+
+        assert result[0].document['partialFilterExpression'] == partial_filter
+
+    def test_create_compound(self):
+        columns = [MongoColumn('role', 1), MongoColumn('_id', -1)]
+
+        result = self.factory.create_compound(columns, unique=True)
+
+        assert len(result) == 1
+        index_document = result[0].document
+        assert index_document['name'] == 'role_1__id_-1'
+        assert list(index_document['key'].items()) == [('role', 1), ('_id', -1)]
+        assert index_document['unique'] is True
+
 
 class TestMongoColumnFactory:
     def setup(self):
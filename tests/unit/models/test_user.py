@@ -0,0 +1,10 @@
+from models import normalize_email
+
+
+class TestNormalizeEmail:
+    def test_normalize_email(self):
+        assert normalize_email(' John.Doe@Example.COM ') == 'john.doe@example.com'
+
+    def test_normalize_empty_email(self):
+        assert normalize_email(None) is None
+        assert normalize_email('') is None
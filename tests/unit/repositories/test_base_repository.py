@@ -0,0 +1,129 @@
+from bson import ObjectId
+from mock import Mock
+
+from models.translators import (
+    UserMongoTranslator,
+    ProfileMongoTranslator,
+    UploadedFileMongoTranslator
+)
+from repositories.base_repository import BaseRepository
+
+
+class TestBaseRepository:
+    def setup(self):
+        self.collection = Mock()
+        self.translator = Mock()
+        self.translator.from_document.side_effect = lambda document: document
+        self.repository = BaseRepository(self.collection, self.translator, [])
+
+    def test_find_by_id_uses_find_one(self):
+        object_id = ObjectId()
+        self.collection.find_one.return_value = {'_id': object_id}
+
+        result = self.repository.find_by_id(str(object_id))
+
+        assert result == {'_id': object_id}
+        self.collection.find_one.assert_called_once_with(
+            {'_id': object_id}, None, sort=None, skip=0)
+        self.collection.aggregate.assert_not_called()
+
+    def test_find_by_id_not_found(self):
+        self.collection.find_one.return_value = None
+
+        assert self.repository.find_by_id(str(ObjectId())) is None
+
+    def test_get_page_uses_find(self):
+        self.collection.find.return_value = [{'_id': 1}]
+
+        result = self.repository.get_page(10, 5)
+
+        assert result == [{'_id': 1}]
+        self.collection.find.assert_called_once_with({}, None, sort=None, skip=10, limit=5)
+
+    def test_complex_pipeline_uses_aggregate(self):
+        self.repository.default_scope = [{'$addFields': {'name': '$email'}}]
+        self.collection.aggregate.return_value = [{'_id': 1}]
+
+        result = self.repository.find_by_id(str(ObjectId()))
+
+        assert result == {'_id': 1}
+        pipeline = self.collection.aggregate.call_args[0][0]
+        assert pipeline[-1] == {'$limit': 1}
+        self.collection.find_one.assert_not_called()
+
+    def test_find_page_by_facet(self):
+        self.collection.aggregate.return_value = iter([
+            {'items': [{'_id': 1}, {'_id': 2}], 'total': [{'count': 7}]}
+        ])
+
+        items, total = self.repository._find_page_by_facet(
+            [{'$match': {'role': 'user'}}], [{'$skip': 0}, {'$limit': 2}])
+
+        assert items == [{'_id': 1}, {'_id': 2}]
+        assert total == 7
+        pipeline = self.collection.aggregate.call_args[0][0]
+        assert pipeline == [
+            {'$match': {'role': 'user'}},
+            {'$facet': {
+                'items': [{'$skip': 0}, {'$limit': 2}],
+                'total': [{'$count': 'count'}]
+            }}
+        ]
+
+    def test_find_page_by_facet_empty(self):
+        self.collection.aggregate.return_value = iter([{'items': [], 'total': []}])
+
+        items, total = self.repository._find_page_by_facet([], [{'$limit': 2}])
+
+        assert items == []
+        assert total == 0
+
+    def test_update_sends_changed_fields(self):
+        translator = UserMongoTranslator(ProfileMongoTranslator(UploadedFileMongoTranslator()))
+        repository = BaseRepository(self.collection, translator, [])
+        user = self.__user_document()
+        self.collection.find_one.return_value = user
+
+        model = repository.find_by_id(str(user['_id']))
+        model.profile.first_name = 'Jane'
+        repository.update(model)
+        repository.update(model)
+
+        self.collection.update_one.assert_called_once_with(
+            {'_id': user['_id']}, {'$set': {'profile.first_name': 'Jane'}})
+
+    def test_find_defers_snapshot_until_update(self):
+        translator = UserMongoTranslator(ProfileMongoTranslator(UploadedFileMongoTranslator()))
+        repository = BaseRepository(self.collection, translator, [])
+        user = self.__user_document()
+        self.collection.find_one.return_value = user
+
+        model = repository.find_by_id(str(user['_id']))
+
+        assert model.is_persisted()
+        assert model.persisted_document is None
+        assert model.loaded_document is user
+
+    def test_update_without_snapshot_sets_document(self):
+        translator = UserMongoTranslator(ProfileMongoTranslator(UploadedFileMongoTranslator()))
+        repository = BaseRepository(self.collection, translator, [])
+        model = translator.from_document(self.__user_document())
+
+        repository.update(model)
+
+        update = self.collection.update_one.call_args[0][1]
+        assert set(update) == {'$set'}
+        assert update['$set']['email'] == 'john@example.com'
+        assert model.is_persisted()
+
+    def __user_document(self) -> dict:
+        return {
+            '_id': ObjectId(),
+            'email': 'john@example.com',
+            'normalized_email': 'john@example.com',
+            'role': 'user',
+            'password_hash': b'hash',
+            'profile': {'first_name': 'John', 'last_name': 'Doe', 'avatar': None},
+            'created_at': None,
+            'last_visit_at': None
+        }
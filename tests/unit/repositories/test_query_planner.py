@@ -0,0 +1,53 @@
+from repositories.query_planner import QueryPlanner
+
+
+class TestQueryPlanner:
+    def setup(self):
+        self.planner = QueryPlanner()
+
+    def test_plan_match(self):
+        plan = self.planner.plan([{'$match': {'role': 'user'}}])
+
+        assert plan == {
+            'filter': {'role': 'user'},
+            'sort': None,
+            'skip': 0,
+            'limit': 0,
+            'projection': None
+        }
+
+    def test_plan_page(self):
+        plan = self.planner.plan([
+            {'$sort': {'_id': -1}},
+            {'$match': {}},
+            {'$match': {'role': 'user'}},
+            {'$skip': 20},
+            {'$limit': 10},
+            {'$project': {'email': 1}}
+        ])
+
+        assert plan == {
+            'filter': {'role': 'user'},
+            'sort': [('_id', -1)],
+            'skip': 20,
+            'limit': 10,
+            'projection': {'email': 1}
+        }
+
+    def test_plan_merges_matches(self):
+        plan = self.planner.plan([{'$match': {'a': 1}}, {'$match': {'b': 2}}])
+
+        assert plan['filter'] == {'$and': [{'a': 1}, {'b': 2}]}
+
+    def test_plan_empty(self):
+        plan = self.planner.plan([])
+
+        assert plan['filter'] == {}
+
+    def test_plan_requires_aggregation(self):
+        assert self.planner.plan([{'$addFields': {'name': '$email'}}]) is None
+        assert self.planner.plan([{'$limit': 10}, {'$match': {'a': 1}}]) is None
+        assert self.planner.plan([{'$limit': 10}, {'$skip': 5}]) is None
+        assert self.planner.plan([{'$sort': {'a': 1}}, {'$sort': {'b': 1}}]) is None
+        assert self.planner.plan([{'$project': {'name': '$email'}}]) is None
+        assert self.planner.plan([{'$project': {'a': 1}}, {'$match': {'a': 1}}]) is None
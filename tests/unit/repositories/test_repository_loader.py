@@ -0,0 +1,55 @@
+from bson import ObjectId
+from mock import Mock
+
+from repositories import IdentityMap, RepositoryLoader
+
+
+class TestRepositoryLoader:
+    def setup(self):
+        self.repository = Mock()
+        self.identity_map = IdentityMap()
+        self.loader = RepositoryLoader(self.repository, self.identity_map, 'users')
+
+    def test_load_outside_request_scope(self):
+        model_id = str(ObjectId())
+
+        self.loader.load(model_id)
+        self.loader.load(model_id)
+
+        assert self.repository.find_by_id.call_count == 2
+
+    def test_load_uses_identity_map(self):
+        model = Mock(id=ObjectId())
+        self.repository.find_by_id.return_value = model
+        self.identity_map.begin()
+
+        assert self.loader.load(str(model.id)) is model
+        assert self.loader.load(model.id) is model
+
+        self.repository.find_by_id.assert_called_once_with(str(model.id))
+
+    def test_load_missing_model(self):
+        self.repository.find_by_id.return_value = None
+        self.identity_map.begin()
+
+        assert self.loader.load(str(ObjectId())) is None
+        assert self.identity_map.scope.get() == {}
+
+    def test_load_invalid_id(self):
+        self.identity_map.begin()
+
+        assert self.loader.load('invalid') is None
+        self.repository.find_by_id.assert_not_called()
+
+    def test_evict_and_clear(self):
+        model = Mock(id=ObjectId())
+        self.repository.find_by_id.return_value = model
+        self.identity_map.begin()
+
+        assert self.loader.load(model.id) is model
+        self.loader.evict(model.id)
+        self.loader.load(model.id)
+        self.identity_map.clear()
+
+        assert self.repository.find_by_id.call_count == 2
+        assert self.identity_map.get('users', model.id) is None
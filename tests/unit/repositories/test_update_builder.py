@@ -0,0 +1,59 @@
+from repositories.update_builder import UpdateBuilder
+
+
+class TestUpdateBuilder:
+    def setup(self):
+        self.builder = UpdateBuilder()
+        self.document = {
+            '_id': 1,
+            'email': 'john@example.com',
+            'password_hash': b'hash',
+            'profile': {
+                'first_name': 'John',
+                'last_name': 'Doe',
+                'avatar': None
+            },
+            'tags': ['a', 'b']
+        }
+
+    def test_build_without_changes(self):
+        assert self.builder.build(self.document, dict(self.document)) == {}
+
+    def test_build_nested_set(self):
+        document = dict(self.document)
+        document['profile'] = dict(self.document['profile'], first_name='Jane')
+
+        assert self.builder.build(self.document, document) == {'$set': {'profile.first_name': 'Jane'}}
+
+    def test_build_replaces_changed_subdocument_type(self):
+        document = dict(self.document)
+        document['profile'] = dict(self.document['profile'], avatar={'key': 'a.png', 'filename': 'a.png'})
+
+        update = self.builder.build(self.document, document)
+
+        assert update == {'$set': {'profile.avatar': {'key': 'a.png', 'filename': 'a.png'}}}
+
+    def test_build_unset_and_new_fields(self):
+        document = dict(self.document)
+        document.pop('password_hash')
+        document['role'] = 'admin'
+
+        assert self.builder.build(self.document, document) == {
+            '$set': {'role': 'admin'},
+            '$unset': {'password_hash': ''}
+        }
+
+    def test_build_push(self):
+        document = dict(self.document, tags=['a', 'b', 'c'])
+
+        assert self.builder.build(self.document, document) == {'$push': {'tags': {'$each': ['c']}}}
+
+    def test_build_pull(self):
+        document = dict(self.document, tags=['b'])
+
+        assert self.builder.build(self.document, document) == {'$pull': {'tags': {'$in': ['a']}}}
+
+    def test_build_reordered_list(self):
+        document = dict(self.document, tags=['b', 'a'])
+
+        assert self.builder.build(self.document, document) == {'$set': {'tags': ['b', 'a']}}
@@ -0,0 +1,38 @@
+from bson import ObjectId
+from mock import Mock
+from pymongo.errors import OperationFailure
+
+from repositories import UsersRepository
+
+
+class TestUsersRepository:
+    def setup(self):
+        self.collection = Mock()
+        self.repository = UsersRepository(self.collection, Mock(), Mock())
+
+    def test_count_without_role(self):
+        self.collection.estimated_document_count.return_value = 42
+
+        assert self.repository.count(None) == 42
+        self.collection.count_documents.assert_not_called()
+
+    def test_count_with_role(self):
+        self.collection.count_documents.return_value = 3
+
+        assert self.repository.count('admin') == 3
+        self.collection.count_documents.assert_called_once_with({'role': 'admin'}, hint='role_1__id_-1')
+
+    def test_count_with_role_without_index(self):
+        self.collection.count_documents.side_effect = [OperationFailure('bad hint'), 3]
+
+        assert self.repository.count('admin') == 3
+        self.collection.count_documents.assert_called_with({'role': 'admin'})
+
+    def test_pull_token_pairs(self):
+        user_ids = [ObjectId()]
+        pair_ids = [ObjectId(), ObjectId()]
+        self.collection.update_many.return_value = Mock(modified_count=1)
+
+        assert self.repository.pull_token_pairs(user_ids, pair_ids) == 1
+        self.collection.update_many.assert_called_once_with(
+            {'_id': {'$in': user_ids}}, {'$pull': {'token_pairs': {'id': {'$in': pair_ids}}}})
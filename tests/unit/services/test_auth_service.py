@@ -0,0 +1,460 @@
+import pytest
+
+from mock import Mock
+from bson import ObjectId
+from datetime import datetime, timedelta
+
+from models import Principal, PasswordResetRequest, TokenPair
+from repositories import IdentityMap, RepositoryLoader
+from services import AuthService, TokensService
+from infrastructure.exceptions import (
+    UnauthenticatedException,
+    InvalidRequestException,
+    TooManyRequestsException
+)
+
+
+class TestAuthService:
+    def setup(self):
+        self.users_repository = Mock()
+        self.sessions_repository = Mock()
+        self.password_resets_repository = Mock()
+        self.password_service = Mock()
+        self.tokens_service = Mock()
+        self.tokens_service.encode.return_value = 'token'
+        self.user_email_service = Mock()
+        self.password_reset_validation_service = Mock()
+        self.password_change_validation_service = Mock()
+        self.session_epoch_service = Mock()
+        self.principal_cache_service = Mock()
+        self.login_throttle_service = Mock()
+        self.users_loader = RepositoryLoader(self.users_repository, IdentityMap(), 'users')
+        self.service = AuthService(
+            self.users_repository,
+            self.sessions_repository,
+            self.password_resets_repository,
+            self.password_service,
+            self.tokens_service,
+            self.user_email_service,
+            self.password_reset_validation_service,
+            self.password_change_validation_service,
+            self.session_epoch_service,
+            self.principal_cache_service,
+            self.login_throttle_service,
+            self.users_loader,
+            True
+        )
+
+        assert self.service.session_epoch_service == self.session_epoch_service
+        assert self.service.stateless_authentication is True
+
+    def test_stateless_authenticate(self):
+        user_id = ObjectId()
+        pair_id = str(ObjectId())
+        self.tokens_service.decode.return_value = {
+            'id': pair_id,
+            'user_id': str(user_id),
+            'role': 'admin',
+            'purpose': 'access',
+            'epoch': 2
+        }
+        self.session_epoch_service.get.return_value = 2
+
+        result = self.service.authenticate('Token jwt', False)
+
+        assert isinstance(result, Principal) is True
+        assert result.id == user_id
+        assert result.role == 'admin'
+        assert result.token_pair_id == pair_id
+        self.session_epoch_service.get.assert_called_once_with(str(user_id))
+        self.users_repository.find_principal_by_id.assert_not_called()
+
+    def test_stateless_authenticate_revoked_epoch(self):
+        self.tokens_service.decode.return_value = {
+            'id': str(ObjectId()),
+            'user_id': str(ObjectId()),
+            'role': 'user',
+            'purpose': 'access',
+            'epoch': 1
+        }
+        self.session_epoch_service.get.return_value = 2
+
+        with pytest.raises(UnauthenticatedException):
+            self.service.authenticate('Token jwt', False)
+
+        assert self.service.authenticate('Token jwt', True) is None
+
+    def test_stateless_authenticate_missing_user(self):
+        self.tokens_service.decode.return_value = {
+            'id': str(ObjectId()),
+            'user_id': str(ObjectId()),
+            'role': 'user',
+            'purpose': 'access',
+            'epoch': 0
+        }
+        self.session_epoch_service.get.return_value = None
+
+        with pytest.raises(UnauthenticatedException):
+            self.service.authenticate('Token jwt', False)
+
+    def test_stateless_authenticate_rejects_refresh_token(self):
+        tokens_service = TokensService('secret', 15, 24)
+        self.service.tokens_service = tokens_service
+        user_id = str(ObjectId())
+        refresh = tokens_service.encode('refresh', {
+            'id': str(ObjectId()),
+            'user_id': user_id,
+            'role': 'admin',
+            'epoch': 0
+        })
+        self.session_epoch_service.get.return_value = 0
+
+        with pytest.raises(UnauthenticatedException):
+            self.service.authenticate(f'Token {refresh}', False)
+
+        assert self.service.authenticate(f'Token {refresh}', True) is None
+        self.session_epoch_service.get.assert_not_called()
+
+    def test_authenticate_uses_principal_cache(self):
+        self.service.stateless_authentication = False
+        principal = Mock()
+        pair_id = str(ObjectId())
+        self.tokens_service.decode.return_value = {
+            'id': pair_id,
+            'user_id': str(ObjectId()),
+            'role': 'user',
+            'epoch': 0
+        }
+        self.principal_cache_service.get.return_value = principal
+
+        result = self.service.authenticate('Token jwt', False)
+
+        assert result == principal
+        self.principal_cache_service.get.assert_called_once_with(pair_id, 'jwt')
+        self.users_repository.find_principal_by_id.assert_not_called()
+
+    def test_authenticate_caches_resolved_principal(self):
+        self.service.stateless_authentication = False
+        pair_id = str(ObjectId())
+        user = Mock(id=ObjectId(), role='user', email='user@example.com', session_epoch=0)
+        self.sessions_repository.find_for_user.return_value = TokenPair(pair_id, 'jwt', 'refresh')
+        self.tokens_service.decode.return_value = {
+            'id': pair_id,
+            'user_id': str(user.id),
+            'role': 'user',
+            'epoch': 0,
+            'exp': 100
+        }
+        self.principal_cache_service.get.return_value = None
+        self.users_repository.find_by_id.return_value = user
+
+        result = self.service.authenticate('Token jwt', False)
+
+        assert isinstance(result, Principal)
+        assert result.id == user.id
+        assert result.role == 'user'
+        assert result.token_pair_id == pair_id
+        self.principal_cache_service.put.assert_called_once_with(pair_id, 'jwt', result, 100)
+
+    def test_authenticate_shares_user_read_within_request(self):
+        self.service.stateless_authentication = False
+        pair_id = str(ObjectId())
+        user = Mock(id=ObjectId(), role='user', email='user@example.com', session_epoch=0)
+        self.sessions_repository.find_for_user.return_value = TokenPair(pair_id, 'jwt', 'refresh')
+        self.tokens_service.decode.return_value = {'id': pair_id, 'user_id': str(user.id), 'exp': 100}
+        self.principal_cache_service.get.return_value = None
+        self.users_repository.find_by_id.return_value = user
+        self.users_loader.identity_map.begin()
+
+        principal = self.service.authenticate('Token jwt', False)
+
+        assert self.users_loader.load(principal.id) is user
+        self.users_repository.find_by_id.assert_called_once_with(str(user.id))
+        self.users_repository.find_principal_by_id.assert_not_called()
+
+    def test_authenticate_rejects_unknown_access_digest(self):
+        self.service.stateless_authentication = False
+        pair_id = str(ObjectId())
+        self.sessions_repository.find_for_user.return_value = TokenPair(pair_id, 'other', 'refresh')
+        self.tokens_service.decode.return_value = {'id': pair_id, 'user_id': str(ObjectId())}
+        self.principal_cache_service.get.return_value = None
+
+        with pytest.raises(UnauthenticatedException):
+            self.service.authenticate('Token jwt', False)
+
+        self.principal_cache_service.put.assert_not_called()
+
+    def test_login_creates_session(self):
+        user = Mock()
+        user.id = ObjectId()
+        user.session_epoch = 0
+        self.users_repository.find_principal_by_email.return_value = user
+        self.password_service.check.return_value = True
+        self.password_service.needs_rehash.return_value = False
+        self.tokens_service.refresh_token_ttl = 24
+
+        result = self.service.login('user@example.com', 'password')
+
+        assert result.user_id == user.id
+        assert result.expires_at is not None
+        self.sessions_repository.create.assert_called_once_with(result)
+        self.users_repository.update.assert_not_called()
+        self.users_repository.update_password_hash.assert_not_called()
+
+    def test_login_rehashes_outdated_password_hash(self):
+        user = Mock()
+        user.id = ObjectId()
+        user.session_epoch = 0
+        user.password_hash = b'old_hash'
+        self.users_repository.find_principal_by_email.return_value = user
+        self.password_service.check.return_value = True
+        self.password_service.needs_rehash.return_value = True
+        self.password_service.create_hash.return_value = b'new_hash'
+        self.tokens_service.refresh_token_ttl = 24
+
+        self.service.login('user@example.com', 'password')
+
+        self.password_service.create_hash.assert_called_once_with('password')
+        self.users_repository.update_password_hash.assert_called_once_with(
+            user.id, b'old_hash', b'new_hash'
+        )
+        assert user.password_hash == b'new_hash'
+
+    def test_logout_deletes_session(self):
+        user_id = str(ObjectId())
+        pair_id = str(ObjectId())
+        self.tokens_service.decode.return_value = {'id': pair_id, 'user_id': user_id}
+
+        self.service.logout('Token jwt')
+
+        self.sessions_repository.delete_for_user.assert_called_once_with(pair_id, user_id)
+        self.session_epoch_service.bump.assert_called_once_with(user_id)
+        self.principal_cache_service.invalidate_token_pair.assert_called_once_with(pair_id)
+        self.users_repository.update.assert_not_called()
+
+    def test_change_password_single_pass(self):
+        principal = Principal()
+        principal.id = ObjectId()
+        principal.role = 'user'
+        principal.password_hash = b'old_hash'
+        self.users_repository.find_principal_by_id.return_value = principal
+        self.password_service.check.return_value = True
+        self.password_service.create_hash.return_value = b'new_hash'
+        self.users_repository.replace_password_hash.return_value = 3
+        self.tokens_service.refresh_token_ttl = 24
+        params = {'old_password': 'old', 'new_password': 'new'}
+
+        result = self.service.change_password(str(principal.id), params, principal=principal)
+
+        self.users_repository.find_principal_by_id.assert_called_once_with(
+            principal.id, with_password_hash=True
+        )
+        self.users_repository.find_principal_by_email.assert_not_called()
+        self.password_service.check.assert_called_once_with('old', b'old_hash')
+        self.users_repository.replace_password_hash.assert_called_once_with(
+            principal.id, b'new_hash', old_password_hash=b'old_hash'
+        )
+        self.sessions_repository.delete_all_for_user.assert_called_once_with(principal.id)
+        self.session_epoch_service.store.assert_called_once_with(principal.id, 3)
+        self.session_epoch_service.bump.assert_not_called()
+        self.principal_cache_service.invalidate_user.assert_called_once_with(principal.id)
+        self.sessions_repository.create.assert_called_once_with(result)
+        assert self.tokens_service.encode.call_args[0][1]['epoch'] == 3
+
+    def test_change_password_concurrent_update(self):
+        principal = Principal()
+        principal.id = ObjectId()
+        principal.role = 'user'
+        principal.password_hash = b'old_hash'
+        self.users_repository.find_principal_by_id.return_value = principal
+        self.password_service.check.return_value = True
+        self.users_repository.replace_password_hash.return_value = None
+        params = {'old_password': 'old', 'new_password': 'new'}
+
+        with pytest.raises(InvalidRequestException):
+            self.service.change_password(str(principal.id), params, principal=principal)
+
+        self.sessions_repository.delete_all_for_user.assert_not_called()
+        self.sessions_repository.create.assert_not_called()
+
+    def test_reset_password_single_update(self):
+        user = Principal()
+        user.id = ObjectId()
+        user.email = 'user@example.com'
+        reset_request = PasswordResetRequest(user.id)
+        self.password_resets_repository.find_by_code.return_value = reset_request
+        self.password_resets_repository.consume.return_value = True
+        self.users_repository.find_principal_by_id.return_value = user
+        self.password_service.create_hash.return_value = b'new_hash'
+        self.users_repository.replace_password_hash.return_value = 1
+        params = {'code': reset_request.code, 'email': 'user@example.com', 'new_password': 'new'}
+
+        self.service.reset_password(params)
+
+        self.password_resets_repository.find_by_code.assert_called_once_with(reset_request.code)
+        self.password_resets_repository.consume.assert_called_once_with(reset_request)
+        self.users_repository.update.assert_not_called()
+        self.users_repository.replace_password_hash.assert_called_once_with(user.id, b'new_hash')
+        self.sessions_repository.delete_all_for_user.assert_called_once_with(user.id)
+        self.password_resets_repository.delete_for_user.assert_called_once_with(user.id)
+        self.session_epoch_service.store.assert_called_once_with(user.id, 1)
+        self.principal_cache_service.invalidate_user.assert_called_once_with(user.id)
+
+    def test_reset_password_expired_code(self):
+        reset_request = PasswordResetRequest(ObjectId())
+        reset_request.created_at = datetime.utcnow() - timedelta(hours=25)
+        self.password_resets_repository.find_by_code.return_value = reset_request
+        params = {'code': reset_request.code, 'email': 'user@example.com', 'new_password': 'new'}
+
+        with pytest.raises(InvalidRequestException):
+            self.service.reset_password(params)
+
+        self.password_service.create_hash.assert_not_called()
+        self.password_resets_repository.consume.assert_not_called()
+
+    def test_reset_password_code_already_used(self):
+        user = Principal()
+        user.id = ObjectId()
+        user.email = 'user@example.com'
+        reset_request = PasswordResetRequest(user.id)
+        self.password_resets_repository.find_by_code.return_value = reset_request
+        self.password_resets_repository.consume.return_value = False
+        self.users_repository.find_principal_by_id.return_value = user
+        params = {'code': reset_request.code, 'email': 'user@example.com', 'new_password': 'new'}
+
+        with pytest.raises(InvalidRequestException):
+            self.service.reset_password(params)
+
+        self.users_repository.replace_password_hash.assert_not_called()
+
+    def test_request_password_reset_replaces_code(self):
+        user = Mock()
+        user.id = ObjectId()
+        self.users_repository.find_by_email.return_value = user
+
+        self.service.request_password_reset('user@example.com', '10.0.0.1')
+
+        reset_request = self.password_resets_repository.replace_for_user.call_args[0][0]
+        assert reset_request.user_id == user.id
+        self.users_repository.update.assert_not_called()
+        self.user_email_service.recover_password.assert_called_once_with(user, reset_request.code)
+        self.login_throttle_service.register_failure.assert_not_called()
+
+    def test_request_password_reset_for_unknown_email_is_registered(self):
+        self.login_throttle_service.keys.return_value = ['key']
+        self.users_repository.find_by_email.return_value = None
+
+        self.service.request_password_reset('unknown@example.com', '10.0.0.1')
+
+        self.login_throttle_service.register_failure.assert_called_once_with(['key'])
+        self.user_email_service.recover_password.assert_not_called()
+
+    def test_refresh_rotates_access_with_single_write(self):
+        user = Principal()
+        user.id = ObjectId()
+        user.role = 'user'
+        user.session_epoch = 2
+        pair_id = str(ObjectId())
+        pair = Mock()
+        self.tokens_service.decode.return_value = {'id': pair_id, 'user_id': str(user.id)}
+        self.tokens_service.encode.return_value = 'new_access'
+        self.users_repository.find_principal_by_id.return_value = user
+        self.sessions_repository.rotate_access.return_value = pair
+
+        result = self.service.refresh('refresh')
+
+        assert result == pair
+        assert self.tokens_service.encode.call_args[0][1]['epoch'] == 2
+        self.sessions_repository.rotate_access.assert_called_once_with(
+            pair_id, user.id, 'refresh', 'new_access'
+        )
+        self.sessions_repository.find_for_user.assert_not_called()
+        self.users_repository.find_by_id.assert_not_called()
+        self.principal_cache_service.invalidate_token_pair.assert_called_once_with(pair_id)
+
+    def test_refresh_unknown_session(self):
+        user = Principal()
+        user.id = ObjectId()
+        self.tokens_service.decode.return_value = {'id': str(ObjectId()), 'user_id': str(user.id)}
+        self.users_repository.find_principal_by_id.return_value = user
+        self.sessions_repository.rotate_access.return_value = None
+
+        with pytest.raises(UnauthenticatedException):
+            self.service.refresh('refresh')
+
+        self.principal_cache_service.invalidate_token_pair.assert_not_called()
+
+    def test_login_evicts_sessions_over_cap(self):
+        service = AuthService(
+            self.users_repository,
+            self.sessions_repository,
+            self.password_resets_repository,
+            self.password_service,
+            self.tokens_service,
+            self.user_email_service,
+            self.password_reset_validation_service,
+            self.password_change_validation_service,
+            self.session_epoch_service,
+            self.principal_cache_service,
+            self.login_throttle_service,
+            self.users_loader,
+            False,
+            2
+        )
+        user = Mock()
+        user.id = ObjectId()
+        user.session_epoch = 0
+        evicted_id = ObjectId()
+        self.users_repository.find_principal_by_email.return_value = user
+        self.password_service.check.return_value = True
+        self.password_service.needs_rehash.return_value = False
+        self.sessions_repository.evict_oldest_for_user.return_value = [evicted_id]
+        self.tokens_service.refresh_token_ttl = 24
+
+        service.login('user@example.com', 'password')
+
+        self.sessions_repository.evict_oldest_for_user.assert_called_once_with(user.id, 2)
+        self.principal_cache_service.invalidate_token_pair.assert_called_once_with(str(evicted_id))
+
+    def test_login_without_session_cap(self):
+        user = Mock()
+        user.id = ObjectId()
+        user.session_epoch = 0
+        self.users_repository.find_principal_by_email.return_value = user
+        self.password_service.check.return_value = True
+        self.password_service.needs_rehash.return_value = False
+        self.tokens_service.refresh_token_ttl = 24
+
+        self.service.login('user@example.com', 'password')
+
+        self.sessions_repository.evict_oldest_for_user.assert_not_called()
+
+    def test_login_throttled_before_hashing(self):
+        self.login_throttle_service.check.side_effect = TooManyRequestsException()
+
+        with pytest.raises(TooManyRequestsException):
+            self.service.login('user@example.com', 'password', '10.0.0.1')
+
+        self.login_throttle_service.keys.assert_called_once_with('login', 'user@example.com', '10.0.0.1')
+        self.users_repository.find_principal_by_email.assert_not_called()
+        self.password_service.check.assert_not_called()
+
+    def test_login_failure_is_registered(self):
+        self.login_throttle_service.keys.return_value = ['key']
+        self.users_repository.find_principal_by_email.return_value = Mock()
+        self.password_service.check.return_value = False
+
+        with pytest.raises(UnauthenticatedException):
+            self.service.login('user@example.com', 'password', '10.0.0.1')
+
+        self.login_throttle_service.register_failure.assert_called_once_with(['key'])
+        self.login_throttle_service.reset.assert_not_called()
+
+    def test_request_password_reset_throttled(self):
+        self.login_throttle_service.check.side_effect = TooManyRequestsException()
+
+        with pytest.raises(TooManyRequestsException):
+            self.service.request_password_reset('user@example.com', '10.0.0.1')
+
+        self.users_repository.find_by_email.assert_not_called()
+        self.user_email_service.recover_password.assert_not_called()
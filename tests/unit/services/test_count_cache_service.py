@@ -0,0 +1,62 @@
+import threading
+import time
+
+from mock import Mock, patch
+from services import CountCacheService
+
+
+class TestCountCacheService:
+    def setup(self):
+        self.service = CountCacheService(30, 2)
+        self.count_func = Mock(return_value=7)
+
+    def test_get_or_count_caches(self):
+        assert self.service.get_or_count('users', self.count_func, 'user') == 7
+        assert self.service.get_or_count('users', self.count_func, 'user') == 7
+
+        self.count_func.assert_called_once_with('user')
+
+    @patch('services.count_cache_service.time.monotonic')
+    def test_get_or_count_expires(self, monotonic):
+        monotonic.return_value = 100
+        self.service.get_or_count('users', self.count_func)
+        monotonic.return_value = 131
+        self.service.get_or_count('users', self.count_func)
+
+        assert self.count_func.call_count == 2
+
+    def test_get_or_count_evicts_oldest(self):
+        self.service.get_or_count('a', self.count_func)
+        self.service.get_or_count('b', self.count_func)
+        self.service.get_or_count('c', self.count_func)
+        self.service.get_or_count('a', self.count_func)
+
+        assert self.count_func.call_count == 4
+        assert list(self.service.entries) == ['c', 'a']
+
+    def test_get_or_count_disabled(self):
+        service = CountCacheService(0, 2)
+
+        service.get_or_count('users', self.count_func)
+        service.get_or_count('users', self.count_func)
+
+        assert self.count_func.call_count == 2
+
+    def test_get_or_count_single_flight(self):
+        def slow_count():
+            time.sleep(0.05)
+            return 7
+        count_func = Mock(side_effect=slow_count)
+        results = []
+
+        threads = [
+            threading.Thread(target=lambda: results.append(self.service.get_or_count('users', count_func)))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == [7] * 5
+        count_func.assert_called_once()
@@ -0,0 +1,65 @@
+from mock import Mock, MagicMock
+
+from services import IndexSyncService
+from models import MongoIndexFactory, MongoColumnFactory
+
+
+class TestIndexSyncService:
+    def setup(self):
+        self.index_factory = MongoIndexFactory()
+        self.column_factory = MongoColumnFactory()
+        self.collection = Mock()
+        self.database = MagicMock()
+        self.database.__getitem__.return_value = self.collection
+        self.email_index = self.index_factory.create_unique([self.column_factory.ascending('email')])[0]
+        self.ttl_index = self.index_factory.create_ttl([self.column_factory.ascending('created_at')], 60)[0]
+        self.service = IndexSyncService(self.database, {'users': [self.email_index, self.ttl_index]})
+
+    def test_plan_creates_missing_indexes(self):
+        self.collection.index_information.return_value = {'_id_': {'key': [('_id', 1)]}}
+
+        actions = self.service.plan()
+
+        assert actions == [
+            ('create', 'users', 'email', self.email_index),
+            ('create', 'users', 'created_at', self.ttl_index)
+        ]
+
+    def test_plan_up_to_date(self):
+        self.collection.index_information.return_value = {
+            '_id_': {'key': [('_id', 1)]},
+            'email': {'key': [('email', 1)], 'unique': True, 'v': 2},
+            'created_at': {'key': [('created_at', 1.0)], 'expireAfterSeconds': 60, 'v': 2}
+        }
+
+        assert self.service.plan() == []
+
+    def test_plan_changed_indexes(self):
+        self.collection.index_information.return_value = {
+            'email': {'key': [('email', 1)], 'v': 2},
+            'created_at': {'key': [('created_at', 1)], 'expireAfterSeconds': 30, 'v': 2},
+            'legacy': {'key': [('legacy', 1)], 'v': 2}
+        }
+
+        actions = self.service.plan()
+
+        assert actions == [
+            ('recreate', 'users', 'email', self.email_index),
+            ('update_ttl', 'users', 'created_at', self.ttl_index),
+            ('unmanaged', 'users', 'legacy', None)
+        ]
+        assert self.service.plan(prune=True)[-1] == ('drop', 'users', 'legacy', None)
+
+    def test_apply(self):
+        self.service.apply([
+            ('create', 'users', 'email', self.email_index),
+            ('update_ttl', 'users', 'created_at', self.ttl_index),
+            ('unmanaged', 'users', 'legacy', None),
+            ('drop', 'users', 'old', None)
+        ])
+
+        self.collection.create_indexes.assert_called_once_with([self.email_index])
+        self.database.command.assert_called_once_with(
+            'collMod', 'users', index={'name': 'created_at', 'expireAfterSeconds': 60}
+        )
+        self.collection.drop_index.assert_called_once_with('old')
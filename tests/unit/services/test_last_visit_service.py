@@ -0,0 +1,65 @@
+from mock import Mock
+from bson import ObjectId
+from datetime import datetime, timedelta
+
+from services import LastVisitService
+
+
+class TestLastVisitService:
+    def setup(self):
+        self.celery_mock = Mock()
+        self.service = LastVisitService(self.celery_mock, 5, 60, 3)
+
+        assert self.service.celery == self.celery_mock
+        assert self.service.resolution_seconds == 300
+
+    def test_track_buffers_visits(self):
+        self.service.track(ObjectId(), datetime.utcnow())
+
+        assert len(self.service.buffer) == 1
+        self.celery_mock.send_task.assert_not_called()
+
+    def test_track_deduplicates_within_resolution(self):
+        user_id = ObjectId()
+        visited_at = datetime.utcnow()
+
+        self.service.track(user_id, visited_at)
+        self.service.flush()
+        self.service.track(user_id, visited_at + timedelta(minutes=1))
+
+        assert len(self.service.buffer) == 0
+
+    def test_track_after_resolution(self):
+        user_id = ObjectId()
+        visited_at = datetime.utcnow()
+
+        self.service.track(user_id, visited_at)
+        self.service.flush()
+        self.service.track(user_id, visited_at + timedelta(minutes=6))
+
+        assert self.service.buffer == {str(user_id): (visited_at + timedelta(minutes=6)).timestamp()}
+
+    def test_flush_when_buffer_is_full(self):
+        visited_at = datetime.utcnow()
+        user_ids = [ObjectId(), ObjectId(), ObjectId()]
+
+        for user_id in user_ids:
+            self.service.track(user_id, visited_at)
+
+        self.celery_mock.send_task.assert_called_once_with(
+            'background_jobs.update_last_visits',
+            [[[str(user_id), visited_at.timestamp()] for user_id in user_ids], 300]
+        )
+        assert len(self.service.buffer) == 0
+
+    def test_flush_when_interval_passed(self):
+        self.service.flush_interval_seconds = 0
+
+        self.service.track(ObjectId(), datetime.utcnow())
+
+        self.celery_mock.send_task.assert_called_once()
+
+    def test_flush_empty_buffer(self):
+        self.service.flush()
+
+        self.celery_mock.send_task.assert_not_called()
@@ -0,0 +1,75 @@
+import pytest
+
+from services import LoginThrottleService
+from wrappers import MemoryThrottleStoreWrapper
+from infrastructure.exceptions import TooManyRequestsException
+
+
+class TestLoginThrottleService:
+    def setup(self):
+        self.store = MemoryThrottleStoreWrapper(100, 3)
+        self.service = LoginThrottleService(self.store, 2, 3, 60)
+
+    def test_keys(self):
+        keys = self.service.keys('login', ' User@Example.com', '10.0.0.1')
+
+        assert keys == ['login:subject:user@example.com', 'login:ip:10.0.0.1']
+        assert self.service.keys('login', None, None) == []
+
+    def test_rejects_after_max_failures(self):
+        keys = self.service.keys('login', 'user@example.com', '10.0.0.1')
+        self.service.check(keys)
+        self.service.register_failure(keys)
+        self.service.check(keys)
+        self.service.register_failure(keys)
+
+        with pytest.raises(TooManyRequestsException):
+            self.service.check(keys)
+        self.service.check(self.service.keys('login', 'other@example.com', '10.0.0.1'))
+
+    def test_rejects_after_max_ip_failures(self):
+        for email in ['first@example.com', 'second@example.com', 'third@example.com']:
+            self.service.register_failure(self.service.keys('login', email, '10.0.0.1'))
+
+        with pytest.raises(TooManyRequestsException):
+            self.service.check(self.service.keys('login', 'other@example.com', '10.0.0.1'))
+        self.service.check(self.service.keys('login', 'other@example.com', '10.0.0.2'))
+
+    def test_reset_clears_ip_failures(self):
+        for email in ['first@example.com', 'second@example.com']:
+            self.service.register_failure(self.service.keys('login', email, '10.0.0.1'))
+        keys = self.service.keys('login', 'user@example.com', '10.0.0.1')
+        self.service.register_failure(keys)
+
+        self.service.reset(keys)
+
+        self.service.check(self.service.keys('login', 'other@example.com', '10.0.0.1'))
+
+    def test_failures_expire_after_window(self):
+        self.service.window_seconds = 0
+        keys = self.service.keys('login', 'user@example.com', None)
+        self.service.register_failure(keys)
+        self.service.register_failure(keys)
+
+        self.service.check(keys)
+        assert len(self.store.events) == 0
+
+    def test_disabled(self):
+        self.service.max_failures = 0
+        keys = self.service.keys('login', 'user@example.com', None)
+        self.service.register_failure(keys)
+
+        self.service.check(keys)
+        assert len(self.store.events) == 0
+
+
+class TestMemoryThrottleStoreWrapper:
+    def test_bounded_memory(self):
+        store = MemoryThrottleStoreWrapper(2, 3)
+        for key in ['a', 'b', 'c']:
+            for timestamp in range(5):
+                store.add(key, timestamp)
+
+        assert list(store.events.keys()) == ['b', 'c']
+        assert store.count('c', 0) == 3
+        assert store.count('c', 4) == 1
@@ -1,7 +1,11 @@
+import threading
+
 import pytest
 
+from bson import ObjectId
 from mock import Mock
 from services import PageService
+from wrappers import ThreadPoolWrapper
 from handlers.base_handler import Paging
 from infrastructure.exceptions import InvalidRequestException
 
@@ -57,3 +61,230 @@ class TestPageService:
         assert page.page_count == 1
         self.repository_mock.count.assert_called_once()
         self.repository_mock.get_page.assert_called_once_with(0, 10)
+
+    def test_get_page_with_next_cursor(self):
+        paging = Paging()
+        paging.page = 1
+        paging.page_size = 2
+
+        last_id = ObjectId()
+        self.repository_mock.get_page.return_value = [Mock(id=str(ObjectId())), Mock(id=str(last_id))]
+        self.repository_mock.count.return_value = 3
+
+        page = self.service.get_page(
+            paging, self.repository_mock.get_page, self.repository_mock.count,
+            after_func=self.repository_mock.get_page_after)
+
+        assert page.page_count == 2
+        assert page.next_cursor == self.service.encode_cursor(last_id)
+
+    def test_get_page_last_page_without_next_cursor(self):
+        paging = Paging()
+        paging.page = 2
+        paging.page_size = 2
+
+        self.repository_mock.get_page.return_value = [Mock(id=str(ObjectId()))]
+        self.repository_mock.count.return_value = 3
+
+        page = self.service.get_page(
+            paging, self.repository_mock.get_page, self.repository_mock.count,
+            after_func=self.repository_mock.get_page_after)
+
+        assert page.next_cursor is None
+
+    def test_get_page_by_cursor(self):
+        after_id = ObjectId()
+        paging = Paging()
+        paging.page = 1
+        paging.page_size = 2
+        paging.cursor = self.service.encode_cursor(after_id)
+
+        items = [Mock(id=str(ObjectId())) for _ in range(3)]
+        self.repository_mock.get_page_after.return_value = items
+        self.repository_mock.count.return_value = 10
+
+        page = self.service.get_page(
+            paging, self.repository_mock.get_page, self.repository_mock.count, 'user',
+            after_func=self.repository_mock.get_page_after)
+
+        assert page.items == items[:2]
+        assert page.page is None
+        assert page.next_cursor == self.service.encode_cursor(items[1].id)
+        self.repository_mock.get_page_after.assert_called_once_with(after_id, 3, 'user')
+        self.repository_mock.get_page.assert_not_called()
+
+    def test_get_page_by_invalid_cursor(self):
+        paging = Paging()
+        paging.page = 1
+        paging.page_size = 2
+        paging.cursor = 'invalid'
+
+        with pytest.raises(InvalidRequestException) as ex:
+            self.service.get_page(
+                paging, self.repository_mock.get_page, self.repository_mock.count,
+                after_func=self.repository_mock.get_page_after)
+
+        assert ex.value.errors == {'cursor': ['is invalid']}
+
+    def test_get_page_by_invalid_cursor_does_not_count(self):
+        thread_pool_wrapper = Mock()
+        service = PageService(thread_pool_wrapper=thread_pool_wrapper)
+        paging = Paging()
+        paging.page = 1
+        paging.page_size = 2
+        paging.cursor = 'invalid'
+
+        with pytest.raises(InvalidRequestException):
+            service.get_page(
+                paging, self.repository_mock.get_page, self.repository_mock.count,
+                after_func=self.repository_mock.get_page_after)
+
+        thread_pool_wrapper.submit.assert_not_called()
+        self.repository_mock.count.assert_not_called()
+
+    def test_get_page_cursor_not_supported(self):
+        paging = Paging()
+        paging.page = 1
+        paging.page_size = 2
+        paging.cursor = self.service.encode_cursor(ObjectId())
+
+        with pytest.raises(InvalidRequestException) as ex:
+            self.service.get_page(
+                paging, self.repository_mock.get_page, self.repository_mock.count)
+
+        assert ex.value.errors == {'cursor': ['is not supported']}
+
+    def test_get_page_limits(self):
+        service = PageService(max_page_size=50, max_offset=100)
+        paging = Paging()
+        paging.page = 1
+        paging.page_size = 51
+
+        with pytest.raises(InvalidRequestException) as ex:
+            service.get_page(paging, self.repository_mock.get_page, self.repository_mock.count)
+
+        assert ex.value.errors == {'page_size': ['should not be greater than 50']}
+
+        paging.page = 12
+        paging.page_size = 10
+
+        with pytest.raises(InvalidRequestException) as ex:
+            service.get_page(paging, self.repository_mock.get_page, self.repository_mock.count)
+
+        assert ex.value.errors == {'page': ['is too deep, use cursor']}
+
+    def test_get_counted_page(self):
+        paging = Paging()
+        paging.page = 2
+        paging.page_size = 2
+
+        last_id = ObjectId()
+        items = [Mock(id=str(ObjectId())), Mock(id=str(last_id))]
+        self.repository_mock.search_page.return_value = (items, 5)
+
+        page = self.service.get_counted_page(paging, self.repository_mock.search_page, 'query', 'user')
+
+        assert page.items == items
+        assert page.page == 2
+        assert page.page_count == 3
+        assert page.next_cursor == self.service.encode_cursor(last_id)
+        self.repository_mock.search_page.assert_called_once_with(2, 2, None, 'query', 'user', with_count=True)
+
+    def test_get_counted_page_by_cursor(self):
+        after_id = ObjectId()
+        paging = Paging()
+        paging.page = 1
+        paging.page_size = 2
+        paging.cursor = self.service.encode_cursor(after_id)
+
+        items = [Mock(id=str(ObjectId())), Mock(id=str(ObjectId()))]
+        self.repository_mock.search_page.return_value = (items, 5)
+
+        page = self.service.get_counted_page(paging, self.repository_mock.search_page, 'query', 'user')
+
+        assert page.items == items
+        assert page.next_cursor is None
+        self.repository_mock.search_page.assert_called_once_with(0, 3, after_id, 'query', 'user', with_count=True)
+
+    def test_get_page_without_count(self):
+        paging = Paging()
+        paging.page = 1
+        paging.page_size = 2
+        paging.with_count = False
+
+        last_id = ObjectId()
+        self.repository_mock.get_page.return_value = [Mock(id=str(ObjectId())), Mock(id=str(last_id))]
+
+        page = self.service.get_page(
+            paging, self.repository_mock.get_page, self.repository_mock.count,
+            after_func=self.repository_mock.get_page_after)
+
+        assert page.page_count is None
+        assert page.next_cursor == self.service.encode_cursor(last_id)
+        self.repository_mock.count.assert_not_called()
+
+    def test_get_page_with_count_cache(self):
+        count_cache_service = Mock()
+        count_cache_service.get_or_count.return_value = 12
+        service = PageService(count_cache_service)
+        paging = Paging()
+        paging.page = 1
+        paging.page_size = 10
+
+        self.repository_mock.get_page.return_value = []
+        self.repository_mock.count.__qualname__ = 'UsersRepository.count'
+
+        page = service.get_page(paging, self.repository_mock.get_page, self.repository_mock.count, 'user')
+
+        assert page.page_count == 2
+        key, count_func, role = count_cache_service.get_or_count.call_args[0]
+        assert key == "UsersRepository.count:('user',):[]"
+        assert count_func == self.repository_mock.count
+        assert role == 'user'
+
+    def test_get_counted_page_without_count(self):
+        paging = Paging()
+        paging.page = 1
+        paging.page_size = 2
+        paging.with_count = False
+
+        self.repository_mock.search_page.return_value = ([Mock(id=str(ObjectId()))], None)
+
+        page = self.service.get_counted_page(paging, self.repository_mock.search_page, 'query', 'user')
+
+        assert page.page_count is None
+        assert page.next_cursor is None
+        self.repository_mock.search_page.assert_called_once_with(0, 2, None, 'query', 'user', with_count=False)
+
+    def test_get_page_runs_count_concurrently(self):
+        service = PageService(thread_pool_wrapper=ThreadPoolWrapper(1))
+        paging = Paging()
+        paging.page = 1
+        paging.page_size = 10
+        count_threads = []
+
+        def count():
+            count_threads.append(threading.get_ident())
+            return 25
+
+        self.repository_mock.get_page.return_value = []
+
+        page = service.get_page(paging, self.repository_mock.get_page, count)
+
+        assert page.page_count == 3
+        assert count_threads[0] != threading.get_ident()
+        assert set(page.timings) == {'page_ms', 'count_ms', 'total_ms'}
+        assert page.timings['total_ms'] >= page.timings['page_ms']
+
+    def test_get_page_timings_without_count(self):
+        paging = Paging()
+        paging.page = 1
+        paging.page_size = 10
+        paging.with_count = False
+
+        self.repository_mock.get_page.return_value = []
+
+        page = self.service.get_page(paging, self.repository_mock.get_page, self.repository_mock.count)
+
+        assert page.timings['count_ms'] is None
+        assert page.timings['page_ms'] >= 0
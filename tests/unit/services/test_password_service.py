@@ -0,0 +1,44 @@
+from mock import Mock
+
+from services import PasswordService
+from wrappers import BcryptWrapper, ScryptWrapper, ProcessPoolWrapper
+
+
+class TestPasswordService:
+    def setup(self):
+        self.bcrypt_wrapper = BcryptWrapper(4)
+        self.scrypt_wrapper = ScryptWrapper(4)
+        self.password_generator = Mock()
+        self.service = PasswordService(
+            [self.bcrypt_wrapper, self.scrypt_wrapper],
+            'bcrypt',
+            self.password_generator,
+            ProcessPoolWrapper(0, 0)
+        )
+
+        assert self.service.hasher == self.bcrypt_wrapper
+
+    def test_create_hash_uses_current_hasher(self):
+        password_hash = self.service.create_hash('password')
+
+        assert self.bcrypt_wrapper.identifies(password_hash) is True
+        assert self.service.check('password', password_hash) is True
+        assert self.service.check('wrong', password_hash) is False
+        assert self.service.needs_rehash(password_hash) is False
+
+    def test_check_routes_by_hash_prefix(self):
+        password_hash = self.scrypt_wrapper.gen_hash('password')
+
+        assert self.service.check('password', password_hash) is True
+        assert self.service.check('wrong', password_hash) is False
+        assert self.service.needs_rehash(password_hash) is True
+
+    def test_needs_rehash_for_outdated_cost(self):
+        password_hash = BcryptWrapper(5).gen_hash('password')
+
+        assert self.service.check('password', password_hash) is True
+        assert self.service.needs_rehash(password_hash) is True
+
+    def test_check_unknown_hash(self):
+        assert self.service.check('password', b'$unknown$hash') is False
+        assert self.service.check('password', None) is False
@@ -0,0 +1,109 @@
+import threading
+from mock import Mock
+from bson import ObjectId
+from datetime import datetime
+
+from models import PrincipalInvalidation
+from services import PrincipalCacheService
+
+
+class TestPrincipalCacheService:
+    def setup(self):
+        self.repository = Mock()
+        self.repository.find_created_since.return_value = []
+        self.service = PrincipalCacheService(self.repository, 60, 2, 1, 3600)
+
+        assert self.service.principal_invalidations_repository == self.repository
+
+    def principal(self):
+        principal = Mock()
+        principal.id = ObjectId()
+        return principal
+
+    def test_get_cached_principal(self):
+        principal = self.principal()
+        self.service.put('pair', 'token', principal)
+
+        assert self.service.get('pair', 'token') == principal
+
+    def test_get_with_other_token(self):
+        self.service.put('pair', 'token', self.principal())
+
+        assert self.service.get('pair', 'rotated token') is None
+        assert len(self.service.entries) == 0
+
+    def test_get_expired_token(self):
+        self.service.put('pair', 'token', self.principal(), 1)
+
+        assert self.service.get('pair', 'token') is None
+
+    def test_size_is_bounded(self):
+        self.service.put('first', 'token', self.principal())
+        self.service.put('second', 'token', self.principal())
+        self.service.put('third', 'token', self.principal())
+
+        assert list(self.service.entries.keys()) == ['second', 'third']
+
+    def test_invalidate_user(self):
+        principal = self.principal()
+        self.service.put('first', 'token', principal)
+        self.service.put('second', 'token', principal)
+
+        self.service.invalidate_user(principal.id)
+
+        assert len(self.service.entries) == 0
+        assert len(self.service.user_pairs) == 0
+        invalidation = self.repository.create.call_args[0][0]
+        assert invalidation.user_id == str(principal.id)
+
+    def test_invalidate_token_pair(self):
+        self.service.put('pair', 'token', self.principal())
+
+        self.service.invalidate_token_pair('pair')
+
+        assert self.service.get('pair', 'token') is None
+        invalidation = self.repository.create.call_args[0][0]
+        assert invalidation.token_pair_id == 'pair'
+
+    def test_applies_invalidations_from_other_workers(self):
+        principal = self.principal()
+        self.service.get('pair', 'token')
+        self.service.put('pair', 'token', principal)
+        invalidation = PrincipalInvalidation.for_user(principal.id)
+        invalidation.id = ObjectId()
+        self.repository.find_created_since.return_value = [invalidation]
+        self.service.synced_at = datetime(2000, 1, 1)
+        self.service.invalidation_retention_seconds = 10 ** 10
+
+        assert self.service.get('pair', 'token') is None
+        assert invalidation.id in self.service.applied_invalidations
+
+    def test_concurrent_sync(self):
+        principal = self.principal()
+
+        def find_created_since(since):
+            for _ in range(20):
+                invalidation = PrincipalInvalidation.for_user(principal.id)
+                invalidation.id = ObjectId()
+                yield invalidation
+
+        self.repository.find_created_since.side_effect = find_created_since
+        self.service.sync_interval_seconds = 0
+        self.service.invalidation_retention_seconds = 10 ** 10
+        errors = []
+
+        def authenticate():
+            try:
+                for _ in range(300):
+                    self.service.put('pair', 'token', principal)
+                    self.service.get('pair', 'token')
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=authenticate) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
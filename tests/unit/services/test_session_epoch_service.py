@@ -0,0 +1,62 @@
+from mock import Mock
+from bson import ObjectId
+
+from services import SessionEpochService
+
+
+class TestSessionEpochService:
+    def setup(self):
+        self.users_repository = Mock()
+        self.service = SessionEpochService(self.users_repository, 30, 2)
+
+        assert self.service.users_repository == self.users_repository
+        assert self.service.ttl_seconds == 30
+        assert self.service.max_size == 2
+
+    def test_get_caches_epoch(self):
+        user_id = ObjectId()
+        self.users_repository.find_session_epoch.return_value = 3
+
+        assert self.service.get(user_id) == 3
+        assert self.service.get(user_id) == 3
+
+        self.users_repository.find_session_epoch.assert_called_once_with(str(user_id))
+
+    def test_get_missing_user(self):
+        self.users_repository.find_session_epoch.return_value = None
+
+        assert self.service.get(ObjectId()) is None
+        assert len(self.service.epochs) == 0
+
+    def test_get_expired_entry(self):
+        self.service.ttl_seconds = 0
+        user_id = ObjectId()
+        self.users_repository.find_session_epoch.return_value = 1
+
+        self.service.get(user_id)
+        self.service.get(user_id)
+
+        assert self.users_repository.find_session_epoch.call_count == 2
+
+    def test_bump_refreshes_cache(self):
+        user_id = ObjectId()
+        self.users_repository.find_session_epoch.return_value = 1
+        self.users_repository.increment_session_epoch.return_value = 2
+
+        self.service.get(user_id)
+        result = self.service.bump(user_id)
+
+        assert result == 2
+        assert self.service.get(user_id) == 2
+        self.users_repository.increment_session_epoch.assert_called_once_with(str(user_id))
+        self.users_repository.find_session_epoch.assert_called_once()
+
+    def test_size_is_bounded(self):
+        self.users_repository.find_session_epoch.return_value = 0
+        first_id, second_id, third_id = ObjectId(), ObjectId(), ObjectId()
+
+        self.service.get(first_id)
+        self.service.get(second_id)
+        self.service.get(third_id)
+
+        assert list(self.service.epochs.keys()) == [str(second_id), str(third_id)]
@@ -0,0 +1,18 @@
+from mock import Mock
+from services import StatsService
+
+
+class TestStatsService:
+    def setup(self):
+        self.password_service = Mock()
+        self.pymongo_wrapper = Mock()
+        self.service = StatsService(self.password_service, self.pymongo_wrapper)
+
+    def test_get(self):
+        self.password_service.stats.return_value = {'pending': 1}
+        self.pymongo_wrapper.pool_stats.return_value = {'checked_out': 2}
+
+        assert self.service.get() == {
+            'password_hashing': {'pending': 1},
+            'mongo_pool': {'checked_out': 2}
+        }
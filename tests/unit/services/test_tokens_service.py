@@ -0,0 +1,54 @@
+import time
+
+from mock import patch
+from jwt.exceptions import ExpiredSignatureError
+
+from services import TokensService
+
+
+class TestTokensService:
+    def setup(self):
+        self.service = TokensService('secret', 15, 24, 2)
+
+    def test_decode_valid_token(self):
+        token = self.service.encode('access', {'user_id': '1'})
+
+        payload = self.service.decode(token)
+
+        assert payload['user_id'] == '1'
+        assert payload['purpose'] == 'access'
+
+    def test_decode_memoizes_verified_payload(self):
+        token = self.service.encode('access', {'user_id': '1'})
+        first = self.service.decode(token)
+
+        with patch('services.tokens_service.jwt.decode') as decode:
+            second = self.service.decode(token)
+
+        decode.assert_not_called()
+        assert second == first
+        second['user_id'] = '2'
+        assert self.service.decode(token)['user_id'] == '1'
+
+    def test_decode_never_returns_expired_payload(self):
+        token = self.service.encode('access', {'user_id': '1'})
+        self.service.decode(token)
+
+        with patch('services.tokens_service.time.time', return_value=time.time() + 3600), \
+                patch('services.tokens_service.jwt.decode', side_effect=ExpiredSignatureError) as decode:
+            assert self.service.decode(token) is None
+
+        decode.assert_called_once()
+        assert len(self.service.verified) == 0
+
+    def test_decode_evicts_least_recently_used(self):
+        tokens = [self.service.encode('access', {'user_id': str(i)}) for i in range(3)]
+        for token in tokens:
+            self.service.decode(token)
+
+        assert len(self.service.verified) == 2
+
+    def test_decode_invalid_token_is_not_cached(self):
+        assert self.service.decode('invalid') is None
+        assert self.service.decode(None) is None
+        assert len(self.service.verified) == 0
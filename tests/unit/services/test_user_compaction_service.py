@@ -0,0 +1,53 @@
+from mock import Mock
+from bson import ObjectId
+
+from services import UserCompactionService
+
+
+class TestUserCompactionService:
+    def setup(self):
+        self.users_repository = Mock()
+        self.tokens_service = Mock()
+        self.tokens_service.decode.side_effect = lambda token: None if token == 'expired' else {'exp': 1}
+        self.service = UserCompactionService(self.users_repository, self.tokens_service, 2, 0)
+
+    def pair(self, refresh_token) -> dict:
+        return {'id': ObjectId(), 'access_token': 'access', 'refresh_token': refresh_token}
+
+    def test_compact_in_batches(self):
+        first_ids = [ObjectId(), ObjectId()]
+        last_id = ObjectId()
+        expired_pairs = [self.pair('expired'), self.pair('expired'), self.pair('expired')]
+        self.users_repository.find_compaction_batch.side_effect = [
+            [(first_ids[0], [expired_pairs[0], self.pair('valid')]), (first_ids[1], [self.pair('valid')])],
+            [(last_id, expired_pairs[1:])]
+        ]
+        self.users_repository.pull_token_pairs.side_effect = [1, 1]
+
+        report = self.service.compact()
+
+        assert report['documents'] == 2
+        assert report['bytes'] > 0
+        assert self.users_repository.find_compaction_batch.call_count == 2
+        self.users_repository.find_compaction_batch.assert_called_with(first_ids[1], 2)
+        self.users_repository.pull_token_pairs.assert_any_call([first_ids[0]], [expired_pairs[0]['id']])
+        self.users_repository.pull_token_pairs.assert_called_with(
+            [last_id], [expired_pairs[1]['id'], expired_pairs[2]['id']])
+
+    def test_compact_keeps_valid_pairs(self):
+        user_id = ObjectId()
+        self.users_repository.find_compaction_batch.return_value = [(user_id, [self.pair('valid')])]
+        self.users_repository.pull_token_pairs.return_value = 0
+
+        report = self.service.compact()
+
+        assert report == {'documents': 0, 'bytes': 0}
+        self.users_repository.pull_token_pairs.assert_called_once_with([], [])
+
+    def test_compact_nothing(self):
+        self.users_repository.find_compaction_batch.return_value = []
+
+        report = self.service.compact()
+
+        assert report == {'documents': 0, 'bytes': 0}
+        self.users_repository.pull_token_pairs.assert_not_called()
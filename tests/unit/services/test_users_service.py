@@ -1,13 +1,14 @@
 import pytest
 
 from services import UsersService
+from repositories import IdentityMap, RepositoryLoader
 from mock import Mock
 from faker import Faker
 from bson import ObjectId
 
 from ...factories import UserFactory
 from models import Page, User, UserApplication
-from infrastructure.exceptions import NotFoundException
+from infrastructure.exceptions import NotFoundException, InvalidRequestException
 
 
 class TestUsersService:
@@ -23,6 +24,8 @@ class TestUsersService:
         self.email_list_service = Mock()
         self.user_email_service = Mock()
         self.user_files_migration_service = Mock()
+        self.principal_cache_service = Mock()
+        self.users_loader = RepositoryLoader(self.users_repository, IdentityMap(), 'users')
         self.service = UsersService(
             self.users_repository,
             self.user_applications_repository,
@@ -33,7 +36,9 @@ class TestUsersService:
             self.page_service,
             self.email_list_service,
             self.user_email_service,
-            self.user_files_migration_service
+            self.user_files_migration_service,
+            self.principal_cache_service,
+            self.users_loader
         )
         self.faker = Faker()
         self.factory = UserFactory()
@@ -187,6 +192,42 @@ class TestUsersService:
 
         self.users_repository.find_by_id.assert_called_once_with(user.id)
 
+    def test_find_own_and_find_in_request_scope(self):
+        user = self.factory.generic('user')
+        user.id = ObjectId()
+        self.users_loader.identity_map.begin()
+        self.users_repository.find_by_id.return_value = user
+
+        assert self.service.find_own(user) is user
+        assert self.service.find(str(user.id)) is user
+
+        self.users_repository.find_by_id.assert_called_once_with(user.id)
+
+    def test_update_with_same_email(self):
+        user = self.factory.generic('user')
+        user.id = ObjectId()
+        self.users_repository.find_by_id.return_value = user
+        principal = Mock(id=user.id, role='user')
+
+        self.service.update(str(user.id), {'email': user.email.upper()}, principal)
+
+        self.users_repository.find_by_email.assert_not_called()
+        self.users_repository.update.assert_called_once_with(user)
+
+    def test_update_with_taken_email(self):
+        user = self.factory.generic('user')
+        user.id = ObjectId()
+        other_user = self.factory.generic('user')
+        other_user.id = ObjectId()
+        self.users_repository.find_by_id.return_value = user
+        self.users_repository.find_by_email.return_value = other_user
+        principal = Mock(id=user.id, role='admin')
+
+        with pytest.raises(InvalidRequestException):
+            self.service.update(str(user.id), {'email': other_user.email}, principal)
+
+        self.users_repository.update.assert_not_called()
+
     def test_search_by_query(self):
         query = 'test@email.com'
         role = 'user'
@@ -194,7 +235,7 @@ class TestUsersService:
         items = [self.factory.generic(role)]
         items[0].email = query
 
-        self.page_service.get_page.return_value = Page(items, 1, 1)
+        self.page_service.get_counted_page.return_value = Page(items, 1, 1)
 
         result = self.service.search(1, 10, query, role)
 
@@ -204,4 +245,4 @@ class TestUsersService:
         assert len(result.items) == 1
         assert isinstance(result.items[0], User) is True
 
-        self.page_service.get_page.assert_called_once()
+        self.page_service.get_counted_page.assert_called_once()
@@ -0,0 +1,85 @@
+import os
+import threading
+import time
+
+import pytest
+from concurrent.futures.process import BrokenProcessPool
+
+from dependencies import Dependencies
+from structure import Structure
+from wrappers import ProcessPoolWrapper
+from infrastructure.exceptions import ServiceUnavailableException
+
+
+class TestProcessPoolWrapper:
+    def setup(self):
+        self.wrapper = ProcessPoolWrapper(1, 1)
+
+        assert self.wrapper.max_workers == 1
+        assert self.wrapper.queue_limit == 1
+
+    def test_run_in_pool(self):
+        result = self.wrapper.run(pow, 2, 10)
+
+        assert result == 1024
+        stats = self.wrapper.stats()
+        assert stats['completed'] == 1
+        assert stats['pending'] == 0
+        assert stats['rejected'] == 0
+
+    def test_run_inline(self):
+        wrapper = ProcessPoolWrapper(0, 1)
+
+        result = wrapper.run(pow, 3, 2)
+
+        assert result == 9
+        assert wrapper.executor is None
+
+    def test_run_when_saturated(self):
+        self.wrapper.slots.acquire()
+        self.wrapper.slots.acquire()
+
+        with pytest.raises(ServiceUnavailableException):
+            self.wrapper.run(pow, 2, 10)
+
+        assert self.wrapper.stats()['rejected'] == 1
+        assert self.wrapper.stats()['completed'] == 0
+
+    def test_admissions_are_capped(self):
+        wrapper = ProcessPoolWrapper(4, 8, 6)
+
+        assert wrapper.stats()['max_admissions'] == 6
+
+    def test_rejects_before_request_threads_are_exhausted_by_default(self):
+        wrapper = Structure(Dependencies()).instantiate('password_hashing_pool_wrapper')
+        request_threads = int(os.environ.get('GUNICORN_THREADS', '8'))
+        rejections = []
+
+        def login():
+            try:
+                wrapper.run(time.sleep, 0.5)
+            except ServiceUnavailableException:
+                rejections.append(True)
+
+        threads = [threading.Thread(target=login) for _ in range(request_threads)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert wrapper.max_admissions < request_threads
+        assert len(rejections) == request_threads - wrapper.max_admissions
+
+    def test_slot_released_on_error(self):
+        with pytest.raises(ZeroDivisionError):
+            self.wrapper.run(divmod, 1, 0)
+
+        assert self.wrapper.run(pow, 2, 2) == 4
+        assert self.wrapper.stats()['pending'] == 0
+
+    def test_recovers_from_broken_pool(self):
+        with pytest.raises(BrokenProcessPool):
+            self.wrapper.run(os._exit, 1)
+
+        assert self.wrapper.run(pow, 2, 3) == 8
+        assert self.wrapper.stats()['restarts'] == 2
@@ -0,0 +1,74 @@
+from mock import Mock, patch
+
+from wrappers import PymongoWrapper
+from wrappers.pymongo_wrapper import ConnectionPoolStatsListener
+
+
+class TestPymongoWrapper:
+    def setup(self):
+        environment_wrapper = Mock()
+        environment_wrapper.get_var.side_effect = lambda name, default=None: {
+            'MONGO_SCHEME': 'mongodb',
+            'MONGO_HOST': 'localhost',
+            'MONGO_PORT': '27017',
+            'MONGO_NAME': 'boilerplate',
+            'MONGO_MAX_POOL_SIZE': '20',
+            'MONGO_COMPRESSORS': 'zlib'
+        }.get(name, default)
+        self.environment_wrapper = environment_wrapper
+        PymongoWrapper.clients = {}
+        PymongoWrapper.listeners = {}
+
+    @patch('wrappers.pymongo_wrapper.pymongo.MongoClient')
+    def test_get_client_is_shared_per_process(self, mongo_client):
+        first = PymongoWrapper(self.environment_wrapper).get_client()
+        second = PymongoWrapper(self.environment_wrapper).get_client()
+
+        assert first is second
+        mongo_client.assert_called_once()
+        args, kwargs = mongo_client.call_args
+        assert args == ('mongodb://localhost:27017',)
+        assert kwargs['maxPoolSize'] == 20
+        assert kwargs['waitQueueTimeoutMS'] == 2000
+        assert kwargs['compressors'] == 'zlib'
+        assert kwargs['connect'] is False
+        assert isinstance(kwargs['event_listeners'][0], ConnectionPoolStatsListener)
+
+    @patch('wrappers.pymongo_wrapper.os.getpid')
+    @patch('wrappers.pymongo_wrapper.pymongo.MongoClient')
+    def test_get_client_after_fork(self, mongo_client, getpid):
+        wrapper = PymongoWrapper(self.environment_wrapper)
+        getpid.return_value = 1
+        wrapper.get_client()
+        getpid.return_value = 2
+        wrapper.get_client()
+
+        assert mongo_client.call_count == 2
+
+    def test_pool_stats_without_client(self):
+        stats = PymongoWrapper(self.environment_wrapper).pool_stats()
+
+        assert stats['checked_out'] == 0
+        assert stats['max_pool_size'] == 20
+
+
+class TestConnectionPoolStatsListener:
+    def setup(self):
+        self.listener = ConnectionPoolStatsListener()
+
+    def test_checkout_and_checkin(self):
+        self.listener.connection_created(Mock())
+        self.listener.connection_check_out_started(Mock())
+        self.listener.connection_checked_out(Mock())
+        self.listener.connection_check_out_started(Mock())
+        self.listener.connection_check_out_failed(Mock())
+
+        stats = self.listener.stats()
+        assert stats['connections'] == 1
+        assert stats['checked_out'] == 1
+        assert stats['checkouts'] == 1
+        assert stats['failed_checkouts'] == 1
+        assert stats['max_wait_ms'] >= stats['average_wait_ms'] >= 0
+
+        self.listener.connection_checked_in(Mock())
+        assert self.listener.stats()['checked_out'] == 0
@@ -0,0 +1,25 @@
+from wrappers import ScryptWrapper
+
+
+class TestScryptWrapper:
+    def setup(self):
+        self.wrapper = ScryptWrapper(4)
+
+    def test_gen_hash(self):
+        password_hash = self.wrapper.gen_hash('password')
+
+        assert password_hash.startswith(b'$scrypt$ln=4,r=8,p=1$') is True
+        assert self.wrapper.gen_hash('password') != password_hash
+        assert self.wrapper.check('password', password_hash) is True
+        assert self.wrapper.check('wrong', password_hash) is False
+
+    def test_needs_rehash(self):
+        password_hash = self.wrapper.gen_hash('password')
+
+        assert self.wrapper.needs_rehash(password_hash) is False
+        assert ScryptWrapper(5).needs_rehash(password_hash) is True
+        assert ScryptWrapper(5).check('password', password_hash) is True
+
+    def test_identifies(self):
+        assert self.wrapper.identifies(self.wrapper.gen_hash('password')) is True
+        assert self.wrapper.identifies(b'$2b$14$hash') is False
@@ -0,0 +1,30 @@
+import threading
+
+import pytest
+
+from wrappers import ThreadPoolWrapper
+
+
+class TestThreadPoolWrapper:
+    def test_submit(self):
+        wrapper = ThreadPoolWrapper(1)
+
+        future = wrapper.submit(threading.get_ident)
+
+        assert future.result() != threading.get_ident()
+        assert wrapper.executor is not None
+
+    def test_submit_inline(self):
+        wrapper = ThreadPoolWrapper(0)
+
+        assert wrapper.submit(pow, 2, 3).result() == 8
+        assert wrapper.submit(threading.get_ident).result() == threading.get_ident()
+        assert wrapper.executor is None
+
+    def test_submit_inline_error(self):
+        wrapper = ThreadPoolWrapper(0)
+
+        future = wrapper.submit(int, 'invalid')
+
+        with pytest.raises(ValueError):
+            future.result()
@@ -1,4 +1,8 @@
 from .bcrypt_wrapper import BcryptWrapper
+from .scrypt_wrapper import ScryptWrapper
 from .environment_wrapper import EnvironmentWrapper
 from .pymongo_wrapper import PymongoWrapper
 from .s3_wrapper import S3Wrapper
+from .process_pool_wrapper import ProcessPoolWrapper
+from .thread_pool_wrapper import ThreadPoolWrapper
+from .throttle_store_wrapper import ThrottleStoreWrapper, MemoryThrottleStoreWrapper
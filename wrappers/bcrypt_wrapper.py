@@ -2,8 +2,19 @@ import bcrypt
 
 
 class BcryptWrapper:
+    name = 'bcrypt'
+
+    def __init__(self, rounds: int = 14) -> None:
+        self.rounds = rounds
+
     def gen_hash(self, password: str) -> bytes:
-        return bcrypt.hashpw(password.encode(), bcrypt.gensalt(14))
+        return bcrypt.hashpw(password.encode(), bcrypt.gensalt(self.rounds))
 
     def check(self, password: str, password_hash: bytes) -> bool:
         return bcrypt.checkpw(password.encode(), password_hash)
+
+    def identifies(self, password_hash: bytes) -> bool:
+        return password_hash.startswith((b'$2a$', b'$2b$', b'$2y$'))
+
+    def needs_rehash(self, password_hash: bytes) -> bool:
+        return int(password_hash[4:6]) != self.rounds
@@ -3,10 +3,12 @@ from infrastructure.exceptions import VariableNotFoundException
 
 
 class EnvironmentWrapper:
-    def get_var(self, key: str) -> str:
+    def get_var(self, key: str, default: str = None) -> str:
         try:
             return os.environ[key]
         except KeyError:
+            if default is not None:
+                return default
             raise VariableNotFoundException(f'{key} variable not found')
 
     def read_file(self, file_path: str) -> str:
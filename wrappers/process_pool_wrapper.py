@@ -0,0 +1,101 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from threading import BoundedSemaphore, Lock
+from infrastructure.exceptions import ServiceUnavailableException
+
+
+def _call_with_start_time(function, *args):
+    return time.time(), function(*args)
+
+
+class ProcessPoolWrapper:
+    def __init__(self, max_workers: int, queue_limit: int, max_admissions=None, start_method='forkserver') -> None:
+        self.max_workers = max_workers
+        self.queue_limit = queue_limit
+        self.max_admissions = max(max_workers, 1) + queue_limit
+        if max_admissions is not None:
+            self.max_admissions = max(min(self.max_admissions, max_admissions), 1)
+        self.start_method = start_method
+        self.slots = BoundedSemaphore(self.max_admissions)
+        self.executor = None
+        self.executor_pid = None
+        self.lock = Lock()
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.restarts = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def run(self, function, *args):
+        if not self.slots.acquire(blocking=False):
+            with self.lock:
+                self.rejected += 1
+            raise ServiceUnavailableException()
+
+        with self.lock:
+            self.pending += 1
+        submitted_at = time.time()
+        try:
+            if self.max_workers > 0:
+                started_at, result = self.__submit(function, *args)
+            else:
+                started_at, result = _call_with_start_time(function, *args)
+        finally:
+            with self.lock:
+                self.pending -= 1
+            self.slots.release()
+
+        wait_seconds = max(started_at - submitted_at, 0.0)
+        with self.lock:
+            self.completed += 1
+            self.total_wait_seconds += wait_seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+        return result
+
+    def stats(self) -> dict:
+        with self.lock:
+            average_wait_seconds = 0.0
+            if self.completed:
+                average_wait_seconds = self.total_wait_seconds / self.completed
+            return {
+                'workers': self.max_workers,
+                'queue_limit': self.queue_limit,
+                'max_admissions': self.max_admissions,
+                'pending': self.pending,
+                'queue_depth': max(self.pending - max(self.max_workers, 1), 0),
+                'completed': self.completed,
+                'rejected': self.rejected,
+                'restarts': self.restarts,
+                'average_wait_ms': round(average_wait_seconds * 1000, 3),
+                'max_wait_ms': round(self.max_wait_seconds * 1000, 3)
+            }
+
+    def __submit(self, function, *args) -> tuple:
+        executor = self.__get_executor()
+        try:
+            return executor.submit(_call_with_start_time, function, *args).result()
+        except BrokenProcessPool:
+            self.__discard_executor(executor)
+            return self.__get_executor().submit(_call_with_start_time, function, *args).result()
+
+    def __get_executor(self) -> ProcessPoolExecutor:
+        with self.lock:
+            if self.executor is None or self.executor_pid != os.getpid():
+                self.executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context(self.start_method)
+                )
+                self.executor_pid = os.getpid()
+            return self.executor
+
+    def __discard_executor(self, executor) -> None:
+        with self.lock:
+            if self.executor is not executor:
+                return
+            self.executor = None
+            self.restarts += 1
+        executor.shutdown(wait=False)
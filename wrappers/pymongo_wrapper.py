@@ -1,7 +1,91 @@
+import os
+import threading
+import time
+
 import pymongo
+from pymongo import monitoring
+
+
+class ConnectionPoolStatsListener(monitoring.ConnectionPoolListener):
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.pools = 0
+        self.connections = 0
+        self.checked_out = 0
+        self.checkouts = 0
+        self.failed_checkouts = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def pool_created(self, event):
+        with self.lock:
+            self.pools += 1
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        with self.lock:
+            self.pools = max(self.pools - 1, 0)
+
+    def connection_created(self, event):
+        with self.lock:
+            self.connections += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        with self.lock:
+            self.connections = max(self.connections - 1, 0)
+
+    def connection_check_out_started(self, event):
+        self.local.started_at = time.monotonic()
+
+    def connection_check_out_failed(self, event):
+        with self.lock:
+            self.failed_checkouts += 1
+            self.__record_wait()
+
+    def connection_checked_out(self, event):
+        with self.lock:
+            self.checked_out += 1
+            self.checkouts += 1
+            self.__record_wait()
+
+    def connection_checked_in(self, event):
+        with self.lock:
+            self.checked_out = max(self.checked_out - 1, 0)
+
+    def stats(self) -> dict:
+        with self.lock:
+            waits = self.checkouts + self.failed_checkouts
+            return {
+                'pools': self.pools,
+                'connections': self.connections,
+                'checked_out': self.checked_out,
+                'checkouts': self.checkouts,
+                'failed_checkouts': self.failed_checkouts,
+                'average_wait_ms': round(self.total_wait_seconds / waits * 1000, 3) if waits else 0.0,
+                'max_wait_ms': round(self.max_wait_seconds * 1000, 3)
+            }
+
+    def __record_wait(self):
+        started_at = getattr(self.local, 'started_at', None)
+        if started_at is None:
+            return
+        self.local.started_at = None
+        waited = time.monotonic() - started_at
+        self.total_wait_seconds += waited
+        self.max_wait_seconds = max(self.max_wait_seconds, waited)
 
 
 class PymongoWrapper:
+    clients = {}
+    listeners = {}
+    lock = threading.Lock()
+
     def __init__(self, environment_wrapper) -> None:
         self.scheme = environment_wrapper.get_var('MONGO_SCHEME')
         self.username = environment_wrapper.get_var('MONGO_USERNAME')
@@ -9,13 +93,58 @@ class PymongoWrapper:
         self.host = environment_wrapper.get_var('MONGO_HOST')
         self.port = environment_wrapper.get_var('MONGO_PORT')
         self.name = environment_wrapper.get_var('MONGO_NAME')
+        self.max_pool_size = int(environment_wrapper.get_var('MONGO_MAX_POOL_SIZE', '50'))
+        self.min_pool_size = int(environment_wrapper.get_var('MONGO_MIN_POOL_SIZE', '0'))
+        self.wait_queue_timeout_ms = int(environment_wrapper.get_var('MONGO_WAIT_QUEUE_TIMEOUT_MS', '2000'))
+        self.connect_timeout_ms = int(environment_wrapper.get_var('MONGO_CONNECT_TIMEOUT_MS', '5000'))
+        self.server_selection_timeout_ms = int(
+            environment_wrapper.get_var('MONGO_SERVER_SELECTION_TIMEOUT_MS', '5000'))
+        self.socket_timeout_ms = int(environment_wrapper.get_var('MONGO_SOCKET_TIMEOUT_MS', '30000'))
+        self.compressors = environment_wrapper.get_var('MONGO_COMPRESSORS', '')
 
     def get_client(self):
-        credentials = ''
-        if self.username:
-            credentials = f'{self.username}:{self.password}@'
-        url = f'{self.scheme}://{credentials}{self.host}:{self.port}'
-        return pymongo.MongoClient(url)
+        key = (os.getpid(), self.__url())
+        client = self.clients.get(key)
+        if client is not None:
+            return client
+
+        with self.lock:
+            client = self.clients.get(key)
+            if client is None:
+                listener = ConnectionPoolStatsListener()
+                client = pymongo.MongoClient(self.__url(), event_listeners=[listener], **self.client_options())
+                self.clients[key] = client
+                self.listeners[key] = listener
+            return client
+
+    def client_options(self) -> dict:
+        options = {
+            'maxPoolSize': self.max_pool_size,
+            'minPoolSize': self.min_pool_size,
+            'waitQueueTimeoutMS': self.wait_queue_timeout_ms,
+            'connectTimeoutMS': self.connect_timeout_ms,
+            'serverSelectionTimeoutMS': self.server_selection_timeout_ms,
+            'socketTimeoutMS': self.socket_timeout_ms,
+            'connect': False
+        }
+        if self.compressors:
+            options['compressors'] = self.compressors
+        return options
+
+    def pool_stats(self) -> dict:
+        listener = self.listeners.get((os.getpid(), self.__url()))
+        stats = listener.stats() if listener is not None else ConnectionPoolStatsListener().stats()
+        stats['max_pool_size'] = self.max_pool_size
+        return stats
+
+    def get_database(self, client):
+        return client[self.name]
 
     def get_collection(self, client, collection_name: str):
         return client[self.name][collection_name]
+
+    def __url(self) -> str:
+        credentials = ''
+        if self.username:
+            credentials = f'{self.username}:{self.password}@'
+        return f'{self.scheme}://{credentials}{self.host}:{self.port}'
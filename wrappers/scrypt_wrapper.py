@@ -0,0 +1,59 @@
+import base64
+import hashlib
+import hmac
+import os
+
+
+class ScryptWrapper:
+    name = 'scrypt'
+    prefix = b'$scrypt$'
+
+    def __init__(self, log_n: int = 15, block_size: int = 8, parallelism: int = 1) -> None:
+        self.log_n = log_n
+        self.block_size = block_size
+        self.parallelism = parallelism
+
+    def gen_hash(self, password: str) -> bytes:
+        salt = os.urandom(16)
+        digest = self.__derive(password, salt, self.log_n, self.block_size, self.parallelism)
+        params = f'ln={self.log_n},r={self.block_size},p={self.parallelism}'.encode()
+        return b'$'.join([
+            self.prefix + params,
+            base64.b64encode(salt),
+            base64.b64encode(digest)
+        ])
+
+    def check(self, password: str, password_hash: bytes) -> bool:
+        log_n, block_size, parallelism, salt, digest = self.__parse(password_hash)
+        candidate = self.__derive(password, salt, log_n, block_size, parallelism)
+        return hmac.compare_digest(candidate, digest)
+
+    def identifies(self, password_hash: bytes) -> bool:
+        return password_hash.startswith(self.prefix)
+
+    def needs_rehash(self, password_hash: bytes) -> bool:
+        log_n, block_size, parallelism, _, _ = self.__parse(password_hash)
+        return (log_n, block_size, parallelism) != (self.log_n, self.block_size, self.parallelism)
+
+    def __derive(self, password, salt, log_n, block_size, parallelism) -> bytes:
+        cost = 2 ** log_n
+        return hashlib.scrypt(
+            password.encode(),
+            salt=salt,
+            n=cost,
+            r=block_size,
+            p=parallelism,
+            maxmem=256 * block_size * cost * parallelism,
+            dklen=32
+        )
+
+    def __parse(self, password_hash: bytes) -> tuple:
+        params, salt, digest = password_hash[len(self.prefix):].split(b'$')
+        values = dict(item.split(b'=') for item in params.split(b','))
+        return (
+            int(values[b'ln']),
+            int(values[b'r']),
+            int(values[b'p']),
+            base64.b64decode(salt),
+            base64.b64decode(digest)
+        )
@@ -0,0 +1,29 @@
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Lock
+
+
+class ThreadPoolWrapper:
+    def __init__(self, max_workers: int) -> None:
+        self.max_workers = max_workers
+        self.executor = None
+        self.executor_pid = None
+        self.lock = Lock()
+
+    def submit(self, function, *args, **kwargs) -> Future:
+        if self.max_workers > 0:
+            return self.__get_executor().submit(function, *args, **kwargs)
+
+        future = Future()
+        try:
+            future.set_result(function(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def __get_executor(self) -> ThreadPoolExecutor:
+        with self.lock:
+            if self.executor is None or self.executor_pid != os.getpid():
+                self.executor = ThreadPoolExecutor(max_workers=self.max_workers)
+                self.executor_pid = os.getpid()
+            return self.executor
@@ -0,0 +1,52 @@
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from threading import Lock
+
+
+class ThrottleStoreWrapper(ABC):
+    @abstractmethod
+    def count(self, key, since) -> int:
+        pass
+
+    @abstractmethod
+    def add(self, key, timestamp) -> None:
+        pass
+
+    @abstractmethod
+    def clear(self, key) -> None:
+        pass
+
+
+class MemoryThrottleStoreWrapper(ThrottleStoreWrapper):
+    def __init__(self, max_keys, max_events_per_key) -> None:
+        self.max_keys = max_keys
+        self.max_events_per_key = max_events_per_key
+        self.events = OrderedDict()
+        self.lock = Lock()
+
+    def count(self, key, since) -> int:
+        with self.lock:
+            events = self.events.get(key)
+            if not events:
+                return 0
+            while events and events[0] < since:
+                events.popleft()
+            if not events:
+                del self.events[key]
+                return 0
+            return len(events)
+
+    def add(self, key, timestamp) -> None:
+        with self.lock:
+            events = self.events.get(key)
+            if events is None:
+                events = deque(maxlen=self.max_events_per_key)
+                self.events[key] = events
+            events.append(timestamp)
+            self.events.move_to_end(key)
+            while len(self.events) > self.max_keys:
+                self.events.popitem(last=False)
+
+    def clear(self, key) -> None:
+        with self.lock:
+            self.events.pop(key, None)